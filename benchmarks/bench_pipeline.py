@@ -0,0 +1,171 @@
+"""Offline end-to-end and per-stage pipeline benchmarks
+
+Runs the fetch, statistics, combine, annotate, report and plot stages
+against local SteamSpy and Reddit stand-ins, scaling over days, games and
+posts per day. Results are written as JSON, one record per configuration:
+
+    python benchmarks/bench_pipeline.py --days 30,365 --games 1,10 --posts-per-day 10,200 \\
+        --output bench_results.json
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+from typing import Dict, Any, List
+
+## @brief Repository root (parent of the benchmarks directory)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from fakes import FakeSteamSpyServer, FakeReddit
+from data_sources.http_client import HttpClient
+from data_sources.steam_source import SteamDataSource
+from data_sources.reddit_source import RedditDataSource
+from core.data_processor import DataProcessor
+from core.reporter import Reporter
+from core.exporters import create_exporters
+
+## @brief Stages timed by the benchmark, in pipeline order
+STAGES = ["fetch", "statistics", "combine", "annotate", "report", "plot"]
+
+def _parse_list(value: str) -> List[int]:
+    """@brief Parse a comma separated list of integers
+    @param value Text such as "30,365"
+    @return List of integers
+    @retval List[int] Parsed values
+    """
+    return [int(item) for item in value.split(",") if item]
+
+def environment_info() -> Dict[str, Any]:
+    """@brief Describe the benchmarked version and interpreter
+    @return Dictionary with git revision, Python and library versions
+    @retval Dict[str, Any] Environment description
+    """
+    try:
+        revision = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    import numpy
+    import pandas
+    return {
+        "git_revision": revision,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "platform": platform.platform()
+    }
+
+def run_configuration(server: FakeSteamSpyServer, days: int, games: int, posts_per_day: int,
+                      page_latency: float, plot: bool, work_dir: str) -> Dict[str, Any]:
+    """@brief Run the pipeline for a number of games and time every stage
+    @param server Running SteamSpy stand-in
+    @param days Analysis window in days
+    @param games Number of games
+    @param posts_per_day Synthetic Reddit posts per day
+    @param page_latency Simulated Reddit latency per result page in seconds
+    @param plot Include the plot stage
+    @param work_dir Directory for report and plot files
+    @return Benchmark record with per-stage and total times
+    @retval Dict[str, Any] Result of one configuration
+    """
+    stage_times = {stage: 0.0 for stage in STAGES}
+    reddit = FakeReddit(posts_per_day=posts_per_day, history_days=days + 5, page_latency=page_latency)
+    processor = DataProcessor()
+    requests_before = server.request_count
+    rows = 0
+    
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        # The local stand-in has no rate limits
+        http_client = HttpClient(retries=0)
+        for game in range(games):
+            game_name = f"Game {game}"
+            processor.clear_data_sources()
+            steam_source = SteamDataSource(days=days, app_id=str(game), client=http_client, api_url=server.api_url)
+            reddit_source = RedditDataSource(days=days, game_name=game_name, reddit_client=reddit)
+            reddit_source.set_credentials("benchmark", "benchmark", "benchmark")
+            processor.add_data_source(steam_source)
+            processor.add_data_source(reddit_source)
+            
+            t0 = time.perf_counter()
+            processor.fetch_all_data()
+            t1 = time.perf_counter()
+            processor.get_all_statistics()
+            t2 = time.perf_counter()
+            combined_df = processor.combine_data()
+            t3 = time.perf_counter()
+            combined_df = processor.add_comments(combined_df)
+            t4 = time.perf_counter()
+            Reporter.print_console_table(combined_df, days, game_name)
+            outputs = {"report": os.path.join(work_dir, "output.csv"), "data": os.path.join(work_dir, "data.csv")}
+            for exporter in create_exporters(["text", "csv"], outputs):
+                exporter.export(combined_df, game_name, days)
+            t5 = time.perf_counter()
+            if plot:
+                from core.visualizer import Visualizer
+                Visualizer.create_plot(combined_df, game_name, os.path.join(work_dir, "plot.png"), fast=True)
+            t6 = time.perf_counter()
+            
+            for stage, elapsed in zip(STAGES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t5 - t4, t6 - t5)):
+                stage_times[stage] += elapsed
+            rows += len(combined_df)
+        http_client.close()
+    total = time.perf_counter() - started
+    
+    return {
+        "days": days,
+        "games": games,
+        "posts_per_day": posts_per_day,
+        "page_latency_s": page_latency,
+        "rows": rows,
+        "total_s": total,
+        "games_per_s": games / total if total else None,
+        "stages_s": stage_times,
+        "steam_requests": server.request_count - requests_before,
+        "reddit_pages": reddit.pages
+    }
+
+def main(argv=None) -> int:
+    """@brief Command line entry point
+    @param argv Argument list (defaults to sys.argv)
+    @return Process exit status
+    @retval int 0 on success
+    """
+    parser = argparse.ArgumentParser(description="Offline pipeline benchmarks")
+    parser.add_argument("--days", default="30,365", help="comma separated analysis windows")
+    parser.add_argument("--games", default="1,10", help="comma separated game counts")
+    parser.add_argument("--posts-per-day", default="50", help="comma separated Reddit volumes")
+    parser.add_argument("--steam-latency", type=float, default=0.0, help="SteamSpy latency per request (s)")
+    parser.add_argument("--page-latency", type=float, default=0.0, help="Reddit latency per result page (s)")
+    parser.add_argument("--no-plot", action="store_true", help="skip the plot stage")
+    parser.add_argument("--output", help="write results to this JSON file instead of stdout")
+    args = parser.parse_args(argv)
+    
+    results = []
+    with FakeSteamSpyServer(latency=args.steam_latency) as server, tempfile.TemporaryDirectory() as work_dir:
+        for days in _parse_list(args.days):
+            for games in _parse_list(args.games):
+                for posts_per_day in _parse_list(args.posts_per_day):
+                    record = run_configuration(server, days, games, posts_per_day,
+                                               args.page_latency, not args.no_plot, work_dir)
+                    results.append(record)
+                    print(f"days={days} games={games} posts/day={posts_per_day}: "
+                          f"{record['total_s']:.3f}s", file=sys.stderr)
+    
+    report = {"benchmark": "pipeline", "environment": environment_info(), "results": results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,213 @@
+"""Offline stand-ins for the SteamSpy and Reddit APIs
+
+FakeSteamSpyServer serves the `api.php?request=appdetails` endpoint from a
+local HTTP server; FakeReddit mimics the part of the PRAW client used by
+RedditDataSource and generates synthetic submissions.
+"""
+import json
+import time
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional
+from urllib.parse import urlparse, parse_qs
+
+class _SteamSpyHandler(BaseHTTPRequestHandler):
+    """@brief Request handler answering SteamSpy appdetails queries"""
+    
+    def do_GET(self):
+        """@brief Handle a GET request"""
+        server = self.server
+        server.request_count += 1
+        if server.latency:
+            time.sleep(server.latency)
+        
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path != "/api.php" or query.get("request", [""])[0] != "appdetails":
+            self.send_error(404)
+            return
+        
+        app_id = query.get("appid", ["0"])[0]
+        owners = server.owners.get(app_id, 1000000 + int(app_id) * 1000 if app_id.isdigit() else 0)
+        body = json.dumps({
+            "appid": int(app_id) if app_id.isdigit() else 0,
+            "name": f"Game {app_id}",
+            "owners": f"{owners:,} .. {owners * 2:,}",
+            "ccu": owners // 1000
+        }).encode("utf-8")
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        """@brief Silence per-request logging"""
+        pass
+
+class FakeSteamSpyServer:
+    """@brief Local HTTP stand-in for steamspy.com/api.php
+    @details Runs a threading HTTP server on 127.0.0.1 in a background thread.
+             Use as a context manager and point SteamDataSource.api_url at api_url.
+    """
+    
+    def __init__(self, latency: float = 0.0, owners: Optional[Dict[str, int]] = None):
+        """@brief Initialize the server
+        @param latency Artificial delay per request in seconds
+        @param owners Lower owner bound per app id (synthetic value otherwise)
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _SteamSpyHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.owners = dict(owners or {})
+        self._server.request_count = 0
+        self._thread = None
+    
+    @property
+    def api_url(self) -> str:
+        """@brief URL of the api.php endpoint
+        @return Endpoint URL
+        @retval str URL on 127.0.0.1
+        """
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/api.php"
+    
+    @property
+    def request_count(self) -> int:
+        """@brief Number of requests served
+        @return Request counter
+        @retval int Number of requests
+        """
+        return self._server.request_count
+    
+    def start(self):
+        """@brief Start serving in a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """@brief Stop the server"""
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def __enter__(self):
+        """@brief Start the server when entering a with block"""
+        self.start()
+        return self
+    
+    def __exit__(self, *exc):
+        """@brief Stop the server when leaving a with block"""
+        self.stop()
+
+class FakeSubmission:
+    """@brief Minimal submission object"""
+    
+    __slots__ = ("id", "created_utc", "title", "subreddit", "score", "num_comments")
+    
+    def __init__(self, post_id: str, created_utc: float, title: str, subreddit: str = "gaming",
+                 score: int = 1, num_comments: int = 0):
+        """@brief Initialize the submission
+        @param post_id Base36 post id
+        @param created_utc Creation time as Unix timestamp
+        @param title Post title
+        @param subreddit Subreddit name
+        @param score Post score
+        @param num_comments Number of comments
+        """
+        self.id = post_id
+        self.created_utc = created_utc
+        self.title = title
+        self.subreddit = subreddit
+        self.score = score
+        self.num_comments = num_comments
+
+class FakeSubreddit:
+    """@brief Subreddit stand-in generating synthetic search results"""
+    
+    def __init__(self, client: "FakeReddit", name: str):
+        """@brief Initialize the subreddit
+        @param client Owning fake client
+        @param name Subreddit name
+        """
+        self.client = client
+        self.display_name = name
+    
+    def search(self, query: str, sort: str = "new", limit: Optional[int] = 1000, **kwargs) -> Iterator[FakeSubmission]:
+        """@brief Generate submissions newest first
+        @param query Search query (used in titles)
+        @param sort Sort order (only "new" is supported)
+        @param limit Maximum number of results
+        @param kwargs Ignored search options
+        @return Generator of submissions, pausing for the page latency every page_size results
+        @retval Iterator[FakeSubmission] Synthetic results
+        """
+        return self.client.generate(query, limit, self.display_name)
+    
+    def new(self, limit: Optional[int] = 1000, **kwargs) -> Iterator[FakeSubmission]:
+        """@brief Generate the newest submissions of the subreddit
+        @param limit Maximum number of results
+        @param kwargs Ignored listing options
+        @return Generator of submissions newest first
+        @retval Iterator[FakeSubmission] Synthetic results
+        """
+        return self.client.generate(None, limit, self.display_name)
+
+class FakeReddit:
+    """@brief PRAW client stand-in
+    @details Generates posts_per_day submissions per day going back
+             history_days days, newest first, in pages of page_size results
+             with page_latency seconds per page. Page counts are recorded.
+    """
+    
+    def __init__(self, posts_per_day: int = 50, history_days: int = 400, page_latency: float = 0.0,
+                 page_size: int = 100, seed: int = 0, titles=None):
+        """@brief Initialize the client
+        @param posts_per_day Average number of posts per day
+        @param history_days Number of days of generated history
+        @param page_latency Delay per result page in seconds
+        @param page_size Results per page
+        @param seed Random seed
+        @param titles Titles used by new() listings (defaults to the search query)
+        """
+        self.posts_per_day = posts_per_day
+        self.history_days = history_days
+        self.page_latency = page_latency
+        self.page_size = page_size
+        self.seed = seed
+        self.titles = list(titles or ["Synthetic post"])
+        self.pages = 0
+        self.now = time.time()
+    
+    def subreddit(self, name: str) -> FakeSubreddit:
+        """@brief Get a subreddit
+        @param name Subreddit name
+        @return Fake subreddit
+        @retval FakeSubreddit Subreddit stand-in
+        """
+        return FakeSubreddit(self, name)
+    
+    def generate(self, query: Optional[str], limit: Optional[int], subreddit: str) -> Iterator[FakeSubmission]:
+        """@brief Generate submissions newest first
+        @param query Search query placed into titles (random titles when None)
+        @param limit Maximum number of results (None for unlimited)
+        @param subreddit Subreddit name of the generated posts
+        @return Generator of submissions
+        @retval Iterator[FakeSubmission] Synthetic results
+        """
+        rng = random.Random(self.seed)
+        interval = 86400 / max(self.posts_per_day, 1)
+        total = self.posts_per_day * self.history_days
+        if limit is not None:
+            total = min(total, limit)
+        created_utc = self.now
+        for i in range(total):
+            if i % self.page_size == 0:
+                self.pages += 1
+                if self.page_latency:
+                    time.sleep(self.page_latency)
+            created_utc -= rng.expovariate(1 / interval)
+            title = f"Post about {query}" if query else rng.choice(self.titles)
+            yield FakeSubmission(f"t{i:x}", created_utc, title, subreddit,
+                                 rng.randint(0, 500), rng.randint(0, 50))
\ No newline at end of file
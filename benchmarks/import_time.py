@@ -0,0 +1,89 @@
+"""Import-time benchmark for the application entry point
+
+Measures how long `import main` takes in a fresh interpreter and checks that
+heavy dependencies are not loaded at startup. Prints the result as JSON and
+exits with status 1 when the startup budget is exceeded, so it can run in CI:
+
+    python benchmarks/import_time.py --max-ms 300
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from typing import Dict, Any, List
+
+## @brief Repository root (parent of the benchmarks directory)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+## @brief Modules that must not be imported by `import main`
+LAZY_MODULES = ["pandas", "matplotlib", "praw", "requests", "pyarrow"]
+
+def measure_import(module: str = "main") -> Dict[str, Any]:
+    """@brief Import a module in a fresh interpreter and time it
+    @param module Module to import
+    @return Dictionary with cumulative import time and eagerly loaded heavy modules
+    @retval Dict[str, Any] Single measurement
+    """
+    probe = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True
+    )
+    
+    # Lines look like: "import time:   self [us] | cumulative | imported package"
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative_us = int(parts[1].strip())
+    
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return {"import_ms": (cumulative_us or 0) / 1000, "eager_modules": loaded}
+
+def run(repeat: int = 5, module: str = "main") -> Dict[str, Any]:
+    """@brief Repeat the measurement and summarize it
+    @param repeat Number of fresh interpreters to start
+    @param module Module to import
+    @return Benchmark result
+    @retval Dict[str, Any] Median, minimum and maximum import time plus eager modules
+    """
+    samples: List[Dict[str, Any]] = [measure_import(module) for _ in range(repeat)]
+    times = [sample["import_ms"] for sample in samples]
+    return {
+        "benchmark": "import_time",
+        "module": module,
+        "repeat": repeat,
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "max_ms": max(times),
+        "eager_modules": samples[-1]["eager_modules"]
+    }
+
+def main(argv=None) -> int:
+    """@brief Command line entry point
+    @param argv Argument list (defaults to sys.argv)
+    @return Process exit status
+    @retval int 0 on success, 1 if the budget is exceeded or heavy modules load eagerly
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="number of measurements")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median exceeds this budget")
+    parser.add_argument("--module", default="main", help="module to import")
+    args = parser.parse_args(argv)
+    
+    result = run(args.repeat, args.module)
+    failed = bool(result["eager_modules"])
+    if args.max_ms is not None:
+        result["budget_ms"] = args.max_ms
+        failed = failed or result["median_ms"] > args.max_ms
+    result["passed"] = not failed
+    print(json.dumps(result, indent=2))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -7,6 +7,24 @@ GAME_NAME = "Counter-Strike 2"
 ## @brief Steam App ID for the game
 STEAM_APP_ID = "730"
 
+## @brief SteamSpy API endpoint
+STEAMSPY_API_URL = "https://steamspy.com/api.php"
+
+## @brief SteamSpy rate limits in requests per second, keyed by request type
+STEAMSPY_RATE_LIMITS = {
+    "appdetails": 1.0,
+    "all": 1 / 60
+}
+
+## @brief Retries of failed HTTP requests (connection errors, timeouts, 429, 5xx)
+HTTP_RETRIES = 3
+
+## @brief Base delay of the first HTTP retry in seconds, doubled on every further retry
+HTTP_BACKOFF = 0.5
+
+## @brief Number of kept-alive HTTP connections per host
+HTTP_POOL_SIZE = 10
+
 ## @brief Number of days to analyze
 DAYS = 30
 
@@ -16,4 +34,161 @@ REDDIT_CONFIG = {
     "client_id": "",
     "client_secret": "",
     "user_agent": "SteamAnalyticsBot by User"
-}
\ No newline at end of file
+}
+
+## @brief Fetch all data sources in parallel
+CONCURRENT_FETCH = True
+
+## @brief Per-source fetch deadlines in seconds
+## @details Sources that miss their deadline are reported as late and left
+##          out of the combined results
+FETCH_TIMEOUTS = {
+    "Steam": 15,
+    "Reddit": 60
+}
+
+## @brief Games tracked in batch mode as (game name, Steam App ID) pairs
+GAMES = [
+    (GAME_NAME, STEAM_APP_ID)
+]
+
+## @brief Root directory for per-game outputs in batch mode
+OUTPUT_DIR = "output"
+
+## @brief Cache API responses on disk between runs
+CACHE_ENABLED = True
+
+## @brief Path to the response cache database
+CACHE_PATH = os.path.join(".cache", "responses.sqlite")
+
+## @brief Cache time-to-live in seconds per source
+## @details SteamSpy owner counts change at most daily, Reddit entries only
+##          hold the counts of closed days
+CACHE_TTLS = {
+    "Steam": 24 * 3600,
+    "Reddit": 24 * 3600
+}
+
+## @brief Maximum number of cached responses
+CACHE_MAX_ENTRIES = 10000
+
+## @brief Fetch only Reddit posts newer than the previous run
+REDDIT_INCREMENTAL = True
+
+## @brief Directory for incremental ingestion state
+STATE_DIR = os.path.join(".cache", "state")
+
+## @brief Subreddits searched for mentions ("all" covers every subreddit)
+## @details Each subreddit is a separate listing with its own 1000-result cap
+REDDIT_SUBREDDITS = ["all"]
+
+## @brief Maximum number of Reddit listings read concurrently
+REDDIT_SEARCH_WORKERS = 4
+
+## @brief Reddit result pages per second over all search workers (100 requests per minute per client id)
+REDDIT_RATE_LIMIT = 100 / 60
+
+## @brief Count mentions from one shared feed of new submissions instead of one search per game
+## @details API calls do not grow with the number of games, but only posts
+##          in REDDIT_FEED_SUBREDDITS are seen and history starts with the
+##          first poll; suited to daemon mode
+REDDIT_FEED = False
+
+## @brief Subreddits read by the shared feed
+REDDIT_FEED_SUBREDDITS = ["gaming", "pcgaming", "Games", "Steam"]
+
+## @brief Minimum seconds between two polls of the shared feed
+REDDIT_FEED_INTERVAL = 60
+
+## @brief Other names matched for a game, keyed by game name
+REDDIT_ALIASES = {
+    "Counter-Strike 2": ["CS2", "CS 2", "Counter Strike 2"]
+}
+
+## @brief Keep the raw fields of fetched Reddit posts for re-analysis (--from-archive)
+REDDIT_ARCHIVE = True
+
+## @brief Directory of the raw post archive
+ARCHIVE_DIR = os.path.join(".cache", "posts")
+
+## @brief Count Reddit mentions from the post archive instead of fetching them
+REDDIT_FROM_ARCHIVE = False
+
+## @brief Report spikes and drops found by the streaming anomaly detectors
+ANOMALY_DETECTION = True
+
+## @brief Columns fed into the anomaly detectors
+ANOMALY_COLUMNS = ["Reddit Mentions"]
+
+## @brief Record Steam owner snapshots and build the Steam series from their history
+STEAM_HISTORY = True
+
+## @brief Directory of the Steam owner snapshot store
+SNAPSHOT_DIR = os.path.join(".cache", "snapshots")
+
+## @brief SQLite file of the local Steam app catalog (name to app id index)
+CATALOG_PATH = os.path.join(".cache", "steam_catalog.sqlite")
+
+## @brief Seconds before a complete catalog refresh is repeated
+CATALOG_MAX_AGE = 7 * 24 * 3600
+
+## @brief Minimum name similarity (0..1) for resolving a game by a fuzzy catalog match
+CATALOG_FUZZY_CUTOFF = 0.8
+
+## @brief Export formats written for each game
+## @details "text" (output.csv), "csv" (data.csv), "parquet" (partitioned
+##          dataset, requires pyarrow), "arrow" (Feather file, requires pyarrow)
+EXPORT_FORMATS = ["text", "csv"]
+
+## @brief Compression codec for Parquet/Arrow exports
+EXPORT_COMPRESSION = "zstd"
+
+## @brief Root directory of the Parquet dataset shared by all games
+PARQUET_DIR = os.path.join(OUTPUT_DIR, "parquet")
+
+## @brief Create plots (matplotlib is only imported when enabled)
+CREATE_PLOTS = True
+
+## @brief Use the fast rendering mode for plots
+## @details Lower resolution, one reused figure, batched labels and
+##          decimation of long histories
+FAST_PLOTS = False
+
+## @brief Maximum number of plotted days in fast mode
+PLOT_MAX_POINTS = 1000
+
+## @brief Record per-stage timings and API counters
+METRICS_ENABLED = False
+
+## @brief Structured JSON metrics written after each run
+METRICS_JSON_PATH = os.path.join(OUTPUT_DIR, "metrics.json")
+
+## @brief Prometheus text-file export (point the node_exporter textfile collector here)
+METRICS_PROMETHEUS_PATH = os.path.join(OUTPUT_DIR, "game_tracker.prom")
+
+## @brief Directory for backfill unit results and the resume manifest
+BACKFILL_DIR = os.path.join(".cache", "backfill")
+
+## @brief Maximum number of days per backfill work unit
+BACKFILL_CHUNK_DAYS = 90
+
+## @brief Number of backfill worker processes (all cores if None)
+BACKFILL_WORKERS = None
+
+## @brief Seconds between two updates of the same game in daemon mode
+DAEMON_INTERVAL = 3600
+
+## @brief Maximum random shift of every daemon update in seconds
+DAEMON_JITTER = 60
+
+## @brief Seconds a daemon update waits for a late fetch of the previous cycle before skipping the source
+DAEMON_PENDING_WAIT = 30
+
+## @brief Interface of the local JSON API (--serve)
+API_HOST = "127.0.0.1"
+
+## @brief TCP port of the local JSON API
+API_PORT = 8080
+
+## @brief Maximum number of rendered API responses kept in memory
+API_CACHE_SIZE = 256
\ No newline at end of file
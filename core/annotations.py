@@ -0,0 +1,182 @@
+"""Rule-based annotation of combined data"""
+from __future__ import annotations
+import numpy as np
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+## @brief Column annotated by default
+DEFAULT_COLUMN = "Reddit Mentions"
+
+class AnnotationRule:
+    """@brief Single annotation rule
+    @details A rule labels the rows for which its condition holds. The
+             condition receives the column values as a numpy array and the
+             column statistics (max, min, mean, total) and returns a boolean
+             mask, so every rule is evaluated over the whole column at once.
+    """
+    
+    def __init__(self, label: str, condition: Callable[[np.ndarray, Dict[str, float]], np.ndarray],
+                 column: Optional[str] = None):
+        """@brief Initialize the rule
+        @param label Comment written for matching rows
+        @param condition Function (values, stats) -> boolean mask
+        @param column Column the rule looks at (defaults to the engine column)
+        """
+        ## @brief Comment written for matching rows
+        self.label = label
+        
+        ## @brief Vectorized condition
+        self.condition = condition
+        
+        ## @brief Column the rule looks at
+        self.column = column
+    
+    def __repr__(self):
+        """@brief String representation of the rule
+        @return Rule label and column
+        @retval str String representation
+        """
+        return f"AnnotationRule(label='{self.label}', column={self.column!r})"
+
+def threshold_rule(label: str, threshold: float, column: Optional[str] = None) -> AnnotationRule:
+    """@brief Create a rule matching values at or above a fixed threshold
+    @param label Comment written for matching rows
+    @param threshold Minimum value
+    @param column Column the rule looks at (optional)
+    @return Annotation rule
+    @retval AnnotationRule Threshold rule
+    """
+    return AnnotationRule(label, lambda values, stats: values >= threshold, column)
+
+def default_rules() -> List[AnnotationRule]:
+    """@brief Get the standard peak rules
+    @details Maximum, high activity (1.5x the average), minimum and no mentions, in priority order
+    @return List of rules
+    @retval List[AnnotationRule] Default rules
+    """
+    return [
+        AnnotationRule("Maximum", lambda v, s: (v == s["max"]) & (s["max"] > 0)),
+        AnnotationRule("High activity", lambda v, s: (v >= s["mean"] * 1.5) & (v > 0)),
+        AnnotationRule("Minimum", lambda v, s: v == s["min"]),
+        AnnotationRule("No mentions", lambda v, s: v == 0),
+    ]
+
+class AnnotationEngine:
+    """@brief Evaluates annotation rules over a DataFrame
+    @details Rules are checked in order and the first matching rule wins. All
+             rules are evaluated as column-wise numpy conditions, statistics
+             are computed once per column.
+    """
+    
+    def __init__(self, rules: Optional[List[AnnotationRule]] = None, column: str = DEFAULT_COLUMN,
+                 output_column: str = "Comment"):
+        """@brief Initialize the engine
+        @param rules Rules in priority order (defaults to default_rules())
+        @param column Column annotated by rules without their own column
+        @param output_column Name of the column holding the comments
+        """
+        ## @brief Rules in priority order
+        self.rules = list(rules) if rules is not None else default_rules()
+        
+        ## @brief Default column for rules
+        self.column = column
+        
+        ## @brief Name of the comment column
+        self.output_column = output_column
+    
+    def add_rule(self, rule: AnnotationRule, position: Optional[int] = None):
+        """@brief Register an additional rule
+        @param rule Rule to add
+        @param position Priority position (appended with lowest priority by default)
+        """
+        if position is None:
+            self.rules.append(rule)
+        else:
+            self.rules.insert(position, rule)
+    
+    @staticmethod
+    def compute_stats(values: np.ndarray) -> Dict[str, float]:
+        """@brief Compute the statistics passed to rule conditions
+        @param values Column values
+        @return Dictionary with max, min, mean and total
+        @retval Dict[str, float] Column statistics
+        """
+        if values.size == 0:
+            return {"max": 0, "min": 0, "mean": 0.0, "total": 0}
+        return {
+            "max": values.max(),
+            "min": values.min(),
+            "mean": values.mean(),
+            "total": values.sum()
+        }
+    
+    @property
+    def labels(self) -> List[str]:
+        """@brief Get the rule labels in code order
+        @details Code i of evaluate_codes() refers to labels[i - 1], code 0 is no comment
+        @return Labels of all rules in priority order
+        @retval List[str] Rule labels
+        """
+        return [rule.label for rule in self.rules]
+    
+    def evaluate_codes(self, columns: Mapping[str, np.ndarray], length: int) -> np.ndarray:
+        """@brief Evaluate all rules into compact comment codes
+        @param columns Values per column name
+        @param length Number of rows
+        @return Code of the first matching rule for every row (0 where no rule matches)
+        @retval np.ndarray int8 codes, see labels
+        """
+        stats_cache = {}
+        conditions, codes = [], []
+        for code, rule in enumerate(self.rules, start=1):
+            column = rule.column or self.column
+            if column not in columns:
+                continue
+            if column not in stats_cache:
+                values = np.asarray(columns[column])
+                stats_cache[column] = (values, self.compute_stats(values))
+            values, stats = stats_cache[column]
+            conditions.append(np.asarray(rule.condition(values, stats), dtype=bool))
+            codes.append(code)
+        
+        if not conditions:
+            return np.zeros(length, dtype=np.int8)
+        return np.select(conditions, codes, default=0).astype(np.int8)
+    
+    def encode(self, comments: Sequence[str]) -> np.ndarray:
+        """@brief Convert comment strings back into codes
+        @details One np.unique pass over the comments; labels are looked up
+                 once per distinct comment. The first rule wins for repeated
+                 labels, unknown comments get code 0.
+        @param comments Comment per row, as produced by evaluate()
+        @return Code per row
+        @retval np.ndarray int8 codes, see labels
+        """
+        distinct, inverse = np.unique(np.asarray(comments, dtype=object).astype(str), return_inverse=True)
+        lookup = {}
+        for code, label in enumerate(self.labels, start=1):
+            lookup.setdefault(label, code)
+        return np.array([lookup.get(text, 0) for text in distinct.tolist()], dtype=np.int8)[inverse.reshape(-1)]
+    
+    def evaluate(self, df: pd.DataFrame) -> np.ndarray:
+        """@brief Evaluate all rules
+        @param df DataFrame to annotate
+        @return Comment for every row ("" where no rule matches)
+        @retval np.ndarray Array of comment strings
+        """
+        needed = {rule.column or self.column for rule in self.rules}
+        columns = {column: df[column].to_numpy() for column in needed if column in df.columns}
+        codes = self.evaluate_codes(columns, len(df))
+        return np.array([""] + self.labels, dtype=object)[codes]
+    
+    def annotate(self, df: pd.DataFrame) -> pd.DataFrame:
+        """@brief Add the comment column to a copy of the DataFrame
+        @param df Input DataFrame
+        @return DataFrame with comments
+        @retval pd.DataFrame Annotated copy
+        """
+        df_with_comments = df.copy()
+        df_with_comments[self.output_column] = self.evaluate(df)
+        return df_with_comments
\ No newline at end of file
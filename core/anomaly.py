@@ -0,0 +1,471 @@
+"""Streaming spike detection over daily mention counts"""
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from models.data_models import AnomalyEvent
+from models.time_series import DailySeries, SECONDS_PER_DAY, day_to_date
+
+class StreamingDetector(ABC):
+    """@brief Base class of vectorized streaming detectors
+    @details A detector tracks many series at once: every series is a row
+             of fixed-size state arrays, so memory per series is constant and
+             one day of thousands of series is scored with a few numpy
+             operations. update() scores values against the state learned
+             from earlier days and then learns from them.
+    """
+    
+    ## @brief Detector name used in events
+    name = "base"
+    
+    def __init__(self, threshold: float = 3.0, warmup: int = 7):
+        """@brief Initialize the detector
+        @param threshold Absolute score at which a value is reported
+        @param warmup Number of observations before a series is scored
+        """
+        ## @brief Absolute score at which a value is reported
+        self.threshold = threshold
+        
+        ## @brief Number of observations before a series is scored
+        self.warmup = warmup
+        
+        ## @brief Number of allocated rows
+        self.capacity = 0
+        self._allocate(16)
+    
+    def resize(self, size: int):
+        """@brief Make room for at least size series
+        @param size Required number of rows
+        """
+        if size > self.capacity:
+            self._allocate(max(size, 2 * self.capacity))
+    
+    @abstractmethod
+    def update(self, rows: np.ndarray, days: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """@brief Score one new day of several series, then learn from it
+        @param rows Row of every series
+        @param days Day ordinal of every value
+        @param values Value of every series
+        @return Baselines and scores (NaN while a series warms up)
+        @retval Tuple[np.ndarray, np.ndarray] float64 arrays
+        """
+        pass
+    
+    @abstractmethod
+    def _allocate(self, capacity: int):
+        """@brief Grow the state arrays, keeping existing rows
+        @param capacity New number of rows
+        """
+        pass
+    
+    @staticmethod
+    def _grow(array: np.ndarray, capacity: int, fill=0) -> np.ndarray:
+        """@brief Copy a state array into a larger one
+        @param array Existing state (rows along the first axis)
+        @param capacity New number of rows
+        @param fill Value of the new rows
+        @return Grown state array
+        @retval np.ndarray State with capacity rows
+        """
+        grown = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+    
+    @staticmethod
+    def _score(values: np.ndarray, mean: np.ndarray, var: np.ndarray) -> np.ndarray:
+        """@brief Standardize values against a mean and variance
+        @details The standard deviation is at least sqrt(mean) (Poisson noise
+                 of counts) and at least 1, so quiet series do not score
+                 huge values for a single extra mention
+        @param values Observed values
+        @param mean Baselines
+        @param var Variances
+        @return Scores
+        @retval np.ndarray float64 scores
+        """
+        std = np.sqrt(np.maximum(np.maximum(var, mean), 1.0))
+        return (values - mean) / std
+
+class EwmaDetector(StreamingDetector):
+    """@brief Exponentially weighted mean and variance
+    @details Reacts to level changes within a few days; state is two floats
+             and a counter per series
+    """
+    
+    name = "ewma"
+    
+    def __init__(self, alpha: float = 0.2, threshold: float = 3.0, warmup: int = 7):
+        """@brief Initialize the detector
+        @param alpha Weight of the newest value (0..1)
+        @param threshold Absolute score at which a value is reported
+        @param warmup Number of observations before a series is scored
+        """
+        ## @brief Weight of the newest value
+        self.alpha = alpha
+        super().__init__(threshold, warmup)
+    
+    def _allocate(self, capacity: int):
+        """@brief Grow the mean, variance and counter arrays, keeping existing rows
+        @param capacity New number of rows
+        """
+        if self.capacity == 0:
+            self._mean = np.zeros(0)
+            self._var = np.zeros(0)
+            self._count = np.zeros(0, dtype=np.int64)
+        self._mean = self._grow(self._mean, capacity)
+        self._var = self._grow(self._var, capacity)
+        self._count = self._grow(self._count, capacity)
+        self.capacity = capacity
+    
+    def update(self, rows: np.ndarray, days: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """@brief Score against the exponentially weighted baseline, then update it
+        @param rows Row of every series
+        @param days Day ordinal of every value
+        @param values Value of every series
+        @return Baselines and scores (NaN while a series warms up)
+        @retval Tuple[np.ndarray, np.ndarray] float64 arrays
+        """
+        mean = self._mean[rows]
+        var = self._var[rows]
+        count = self._count[rows]
+        baseline = mean.copy()
+        scores = np.where(count >= self.warmup, self._score(values, mean, var), np.nan)
+        
+        diff = values - mean
+        increment = self.alpha * diff
+        first = count == 0
+        self._mean[rows] = np.where(first, values, mean + increment)
+        self._var[rows] = np.where(first, 0.0, (1 - self.alpha) * (var + diff * increment))
+        self._count[rows] = count + 1
+        return baseline, scores
+
+class RollingZScoreDetector(StreamingDetector):
+    """@brief Mean and variance of the last window days
+    @details Keeps a ring buffer with running sums, so state per series is
+             window values plus three numbers
+    """
+    
+    name = "zscore"
+    
+    def __init__(self, window: int = 14, threshold: float = 3.0, warmup: int = 7):
+        """@brief Initialize the detector
+        @param window Number of most recent days forming the baseline
+        @param threshold Absolute score at which a value is reported
+        @param warmup Number of observations before a series is scored
+        """
+        ## @brief Number of most recent days forming the baseline
+        self.window = window
+        super().__init__(threshold, warmup)
+    
+    def _allocate(self, capacity: int):
+        """@brief Grow the ring buffer and running sums arrays, keeping existing rows
+        @param capacity New number of rows
+        """
+        if self.capacity == 0:
+            self._buffer = np.zeros((0, self.window))
+            self._sum = np.zeros(0)
+            self._sumsq = np.zeros(0)
+            self._count = np.zeros(0, dtype=np.int64)
+        self._buffer = self._grow(self._buffer, capacity)
+        self._sum = self._grow(self._sum, capacity)
+        self._sumsq = self._grow(self._sumsq, capacity)
+        self._count = self._grow(self._count, capacity)
+        self.capacity = capacity
+    
+    def update(self, rows: np.ndarray, days: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """@brief Score against the last window days, then push the values
+        @param rows Row of every series
+        @param days Day ordinal of every value
+        @param values Value of every series
+        @return Baselines and scores (NaN while a series warms up)
+        @retval Tuple[np.ndarray, np.ndarray] float64 arrays
+        """
+        count = self._count[rows]
+        n = np.minimum(count, self.window)
+        safe_n = np.maximum(n, 1)
+        mean = self._sum[rows] / safe_n
+        var = np.maximum(self._sumsq[rows] / safe_n - mean * mean, 0.0)
+        scores = np.where(count >= self.warmup, self._score(values, mean, var), np.nan)
+        
+        slots = count % self.window
+        oldest = np.where(count >= self.window, self._buffer[rows, slots], 0.0)
+        self._buffer[rows, slots] = values
+        self._sum[rows] += values - oldest
+        self._sumsq[rows] += values * values - oldest * oldest
+        self._count[rows] = count + 1
+        return mean, scores
+
+class SeasonalDetector(StreamingDetector):
+    """@brief Exponentially weighted baseline per weekday
+    @details Compares a Saturday with earlier Saturdays, so regular weekend
+             peaks are not reported; warmup counts weeks
+    """
+    
+    name = "seasonal"
+    
+    def __init__(self, alpha: float = 0.3, threshold: float = 3.0, warmup: int = 3):
+        """@brief Initialize the detector
+        @param alpha Weight of the newest value of a weekday (0..1)
+        @param threshold Absolute score at which a value is reported
+        @param warmup Number of observations of a weekday before it is scored
+        """
+        ## @brief Weight of the newest value of a weekday
+        self.alpha = alpha
+        super().__init__(threshold, warmup)
+    
+    def _allocate(self, capacity: int):
+        """@brief Grow the per-weekday mean, variance and counter arrays, keeping existing rows
+        @param capacity New number of rows
+        """
+        if self.capacity == 0:
+            self._mean = np.zeros((0, 7))
+            self._var = np.zeros((0, 7))
+            self._count = np.zeros((0, 7), dtype=np.int64)
+        self._mean = self._grow(self._mean, capacity)
+        self._var = self._grow(self._var, capacity)
+        self._count = self._grow(self._count, capacity)
+        self.capacity = capacity
+    
+    def update(self, rows: np.ndarray, days: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """@brief Score against the baseline of the same weekday, then update it
+        @param rows Row of every series
+        @param days Day ordinal of every value
+        @param values Value of every series
+        @return Baselines and scores (NaN while a series warms up)
+        @retval Tuple[np.ndarray, np.ndarray] float64 arrays
+        """
+        # Day 0 (1970-01-01) is a Thursday, weekday 0 is Monday
+        weekdays = (days + 3) % 7
+        mean = self._mean[rows, weekdays]
+        var = self._var[rows, weekdays]
+        count = self._count[rows, weekdays]
+        baseline = mean.copy()
+        scores = np.where(count >= self.warmup, self._score(values, mean, var), np.nan)
+        
+        diff = values - mean
+        increment = self.alpha * diff
+        first = count == 0
+        self._mean[rows, weekdays] = np.where(first, values, mean + increment)
+        self._var[rows, weekdays] = np.where(first, 0.0, (1 - self.alpha) * (var + diff * increment))
+        self._count[rows, weekdays] = count + 1
+        return baseline, scores
+
+def default_detectors(threshold: float = 3.0) -> List[StreamingDetector]:
+    """@brief Get the standard detector set
+    @param threshold Absolute score at which a value is reported
+    @return EWMA, rolling z-score and weekday-seasonal detectors
+    @retval List[StreamingDetector] Detectors
+    """
+    return [
+        EwmaDetector(threshold=threshold),
+        RollingZScoreDetector(threshold=threshold),
+        SeasonalDetector(threshold=threshold),
+    ]
+
+class AnomalyMonitor:
+    """@brief Feeds daily counts of many series into streaming detectors
+    @details Every series (for example "game|Reddit Mentions") gets one row in
+             all detectors. Values arrive either as whole days
+             (update_day, observe_series) or post by post (add_post); a day
+             is scored once it is closed, i.e. when a later day starts.
+             Each series remembers the last day it was fed, so feeding an
+             overlapping history again only scores the new days. The events
+             of the last history_days days are kept per series (see
+             events()), so callers can show them again without re-scoring.
+             All methods are thread-safe, so a RedditFeed polled in a fetch
+             thread can add posts while the processor feeds whole days.
+    """
+    
+    def __init__(self, detectors: Optional[List[StreamingDetector]] = None, min_value: int = 3,
+                 history_days: int = 90):
+        """@brief Initialize the monitor
+        @param detectors Detectors to run (defaults to default_detectors())
+        @param min_value Smallest value reported as a spike (and smallest baseline reported as a drop)
+        @param history_days Number of days of events kept per series
+        """
+        ## @brief Detectors to run
+        self.detectors = detectors if detectors is not None else default_detectors()
+        
+        ## @brief Smallest value reported as a spike
+        self.min_value = min_value
+        
+        ## @brief Number of days of events kept per series
+        self.history_days = history_days
+        
+        self._rows = {}
+        self._keys = []
+        self._history: List[List[Tuple[int, AnomalyEvent]]] = []
+        self._last_day = np.zeros(0, dtype=np.int64)
+        self._open_day = np.zeros(0, dtype=np.int64)
+        self._open_count = np.zeros(0, dtype=np.int64)
+        self._lock = threading.RLock()
+    
+    def __len__(self) -> int:
+        """@brief Number of tracked series
+        @return Series count
+        @retval int Number of series
+        """
+        return len(self._keys)
+    
+    def row(self, key: str) -> int:
+        """@brief Get the row of a series, registering it on first use
+        @param key Series key
+        @return Row in the detector state
+        @retval int Row number
+        """
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self._keys)
+                self._rows[key] = row
+                self._keys.append(key)
+                self._history.append([])
+                if row >= len(self._last_day):
+                    capacity = max(16, 2 * len(self._last_day))
+                    self._last_day = StreamingDetector._grow(self._last_day, capacity, fill=-1)
+                    self._open_day = StreamingDetector._grow(self._open_day, capacity, fill=-1)
+                    self._open_count = StreamingDetector._grow(self._open_count, capacity)
+                for detector in self.detectors:
+                    detector.resize(row + 1)
+            return row
+    
+    def update_day(self, day: int, values: Dict[str, int]) -> List[AnomalyEvent]:
+        """@brief Feed one closed day of several series at once
+        @details Series that were already fed this day or a later one are skipped
+        @param day Day ordinal
+        @param values Value per series key
+        @return Events of this day
+        @retval List[AnomalyEvent] Detected anomalies
+        """
+        with self._lock:
+            rows = np.fromiter((self.row(key) for key in values), dtype=np.int64, count=len(values))
+            counts = np.fromiter(values.values(), dtype=np.float64, count=len(values))
+            fresh = self._last_day[rows] < day
+            return self._feed(rows[fresh], np.full(int(fresh.sum()), day, dtype=np.int64), counts[fresh])
+    
+    def observe_series(self, key: str, series: DailySeries, end_day: Optional[int] = None) -> List[AnomalyEvent]:
+        """@brief Feed the days of a series that were not fed before
+        @param key Series key
+        @param series Daily values
+        @param end_day First day that is not closed yet (defaults to the end of the series)
+        @return Events of the newly fed days
+        @retval List[AnomalyEvent] Detected anomalies
+        """
+        with self._lock:
+            row = self.row(key)
+            end_day = series.end_day if end_day is None else min(end_day, series.end_day)
+            start_day = max(series.start_day, int(self._last_day[row]) + 1)
+            events = []
+            rows = np.array([row], dtype=np.int64)
+            for day in range(start_day, end_day):
+                value = series.values[day - series.start_day]
+                events.extend(self._feed(rows, np.array([day], dtype=np.int64), np.array([value], dtype=np.float64)))
+            return events
+    
+    def add_post(self, key: str, created_utc: float) -> List[AnomalyEvent]:
+        """@brief Count one post, closing the previous day of the series when a new day starts
+        @details Days without posts between two posts are fed as zeros; posts
+                 older than the open day are ignored
+        @param key Series key
+        @param created_utc Post time as Unix timestamp
+        @return Events of days closed by this post
+        @retval List[AnomalyEvent] Detected anomalies
+        """
+        with self._lock:
+            row = self.row(key)
+            day = int(created_utc // SECONDS_PER_DAY)
+            open_day = int(self._open_day[row])
+            events = []
+            if open_day < 0:
+                self._open_day[row] = day
+            elif day > open_day:
+                events = self._close(row, day)
+                self._open_day[row] = day
+            elif day < open_day:
+                return events
+            self._open_count[row] += 1
+            return events
+    
+    def flush(self, end_day: int) -> List[AnomalyEvent]:
+        """@brief Close the post counts of all series up to a day
+        @param end_day First day that is not closed yet
+        @return Events of the closed days
+        @retval List[AnomalyEvent] Detected anomalies
+        """
+        with self._lock:
+            events = []
+            for row in np.flatnonzero((self._open_day[:len(self._keys)] >= 0)
+                                      & (self._open_day[:len(self._keys)] < end_day)).tolist():
+                events.extend(self._close(row, end_day))
+                self._open_day[row] = end_day
+            return events
+    
+    def events(self, keys: List[str], start_day: Optional[int] = None) -> List[AnomalyEvent]:
+        """@brief Get the kept events of several series
+        @param keys Series keys (unknown keys have no events)
+        @param start_day Oldest day of the returned events (all kept events if None)
+        @return Events ordered by day
+        @retval List[AnomalyEvent] Detected anomalies
+        """
+        with self._lock:
+            found = []
+            for key in keys:
+                row = self._rows.get(key)
+                if row is not None:
+                    found.extend(item for item in self._history[row] if start_day is None or item[0] >= start_day)
+            found.sort(key=lambda item: item[0])
+            return [event for _, event in found]
+    
+    def _close(self, row: int, next_day: int) -> List[AnomalyEvent]:
+        """@brief Feed the open day of a series and the empty days up to next_day
+        @param row Row of the series
+        @param next_day Day that becomes the open day
+        @return Events of the closed days
+        @retval List[AnomalyEvent] Detected anomalies
+        """
+        open_day = int(self._open_day[row])
+        events = []
+        rows = np.array([row], dtype=np.int64)
+        for day in range(open_day, next_day):
+            value = self._open_count[row] if day == open_day else 0
+            if day > self._last_day[row]:
+                events.extend(self._feed(rows, np.array([day], dtype=np.int64),
+                                         np.array([value], dtype=np.float64)))
+        self._open_count[row] = 0
+        return events
+    
+    def _feed(self, rows: np.ndarray, days: np.ndarray, values: np.ndarray) -> List[AnomalyEvent]:
+        """@brief Run all detectors on one value per row and collect events
+        @param rows Rows of the series
+        @param days Day ordinal per row
+        @param values Value per row
+        @return Detected anomalies
+        @retval List[AnomalyEvent] Events
+        """
+        if len(rows) == 0:
+            return []
+        events = []
+        for detector in self.detectors:
+            baselines, scores = detector.update(rows, days, values)
+            spikes = (scores >= detector.threshold) & (values >= self.min_value)
+            drops = (scores <= -detector.threshold) & (baselines >= self.min_value)
+            for i in np.flatnonzero(spikes | drops).tolist():
+                event = AnomalyEvent(
+                    key=self._keys[rows[i]],
+                    date=day_to_date(days[i]).isoformat(),
+                    value=int(values[i]),
+                    baseline=float(baselines[i]),
+                    score=float(scores[i]),
+                    detector=detector.name,
+                    kind="spike" if scores[i] > 0 else "drop"
+                )
+                events.append(event)
+                self._history[rows[i]].append((int(days[i]), event))
+        self._last_day[rows] = days
+        
+        # Forget events that left the history window
+        for row, day in zip(rows.tolist(), days.tolist()):
+            history = self._history[row]
+            if history and history[0][0] <= day - self.history_days:
+                self._history[row] = [item for item in history if item[0] > day - self.history_days]
+        return events
\ No newline at end of file
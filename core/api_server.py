@@ -0,0 +1,396 @@
+"""Local read-only HTTP API over published results"""
+import gzip
+import json
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from models.data_models import GameResult
+from models.metrics import metrics
+from models.naming import game_slug
+
+class ResultStore:
+    """@brief Latest analysis result of every game
+    @details Writers build a new mapping and replace the reference in one
+             assignment, so readers always see either the old or the new
+             complete set of results and never need a lock. Every publish
+             increments the store version; a result keeps the version it was
+             published with, which is the data version used for ETags.
+    """
+    
+    def __init__(self):
+        """@brief Initialize an empty store"""
+        self._state = (0, {})
+        self._lock = threading.Lock()
+    
+    @property
+    def version(self) -> int:
+        """@brief Version of the last publish
+        @return Store version (0 before the first publish)
+        @retval int Data version
+        """
+        return self._state[0]
+    
+    def publish(self, result: GameResult) -> int:
+        """@brief Replace the result of one game
+        @param result New result (must not be modified afterwards)
+        @return Version assigned to the result
+        @retval int Data version
+        """
+        with self._lock:
+            version, results = self._state
+            version += 1
+            result.version = version
+            result.updated_at = time.time()
+            results = dict(results)
+            results[game_slug(result.game)] = result
+            self._state = (version, results)
+        return version
+    
+    def snapshot(self) -> Tuple[int, Dict[str, GameResult]]:
+        """@brief Get a consistent view of all results
+        @return Store version and results keyed by game slug
+        @retval Tuple[int, Dict[str, GameResult]] Results (do not modify)
+        """
+        return self._state
+
+def _series_payload(result: GameResult) -> dict:
+    """@brief Build the series document of a game
+    @param result Game result
+    @return JSON-serializable dictionary
+    @retval dict Dates and values per column
+    """
+    return {
+        "game": result.game,
+        "version": result.version,
+        "dates": result.dates().tolist(),
+        "columns": {name: values.tolist() for name, values in result.columns.items()}
+    }
+
+def _statistics_payload(result: GameResult) -> dict:
+    """@brief Build the statistics document of a game
+    @param result Game result
+    @return JSON-serializable dictionary
+    @retval dict Statistics per source
+    """
+    return {
+        "game": result.game,
+        "version": result.version,
+        "statistics": {
+            name: {
+                "total": stat.total,
+                "average_daily": stat.average_daily,
+                "max_daily": stat.max_daily,
+                "min_daily": stat.min_daily,
+                "timestamp": stat.timestamp.isoformat() if stat.timestamp else None
+            }
+            for name, stat in result.statistics.items()
+        }
+    }
+
+def _annotations_payload(result: GameResult) -> dict:
+    """@brief Build the annotations document of a game
+    @param result Game result
+    @return JSON-serializable dictionary
+    @retval dict Comments of annotated days and anomalies
+    """
+    dates = result.dates()
+    return {
+        "game": result.game,
+        "version": result.version,
+        "comments": [
+            {"date": str(dates[i]), "comment": result.comments[i]}
+            for i in (result.comments != "").nonzero()[0].tolist()
+        ],
+        "anomalies": [
+            {"date": event.date, "series": event.key, "value": event.value, "baseline": event.baseline,
+             "score": event.score, "detector": event.detector, "kind": event.kind}
+            for event in result.anomalies
+        ]
+    }
+
+## @brief Document builders per route below /games/<slug>
+GAME_ROUTES = {
+    "series": _series_payload,
+    "statistics": _statistics_payload,
+    "annotations": _annotations_payload,
+}
+
+class ApiServer:
+    """@brief Asyncio HTTP/1.1 server for published results
+    @details Serves GET requests:
+             - /health
+             - /games (list of games with versions)
+             - /games/<slug> (series, statistics and annotations)
+             - /games/<slug>/series, /statistics, /annotations
+             Rendered bodies are kept in an LRU keyed by route and data
+             version, so a result is serialized once per version no matter
+             how many readers ask. ETags carry the data version (with a -gz
+             suffix for the compressed body); a matching If-None-Match is
+             answered with 304. Connections are kept alive and bodies are
+             gzip-compressed when the client accepts it.
+             The server runs its own event loop in a background thread.
+    """
+    
+    ## @brief Seconds an idle keep-alive connection stays open
+    IDLE_TIMEOUT = 30
+    
+    ## @brief Bodies smaller than this are sent uncompressed
+    GZIP_MIN_SIZE = 1024
+    
+    ## @brief Largest request body read and discarded on a kept-alive connection, larger ones close it
+    MAX_DISCARDED_BODY = 65536
+    
+    def __init__(self, store: ResultStore, host: str = "127.0.0.1", port: int = 8080, cache_size: int = 256):
+        """@brief Initialize the server
+        @param store Results to serve
+        @param host Interface to listen on
+        @param port TCP port (0 picks a free port)
+        @param cache_size Maximum number of rendered responses kept in memory
+        """
+        ## @brief Results to serve
+        self.store = store
+        
+        ## @brief Interface to listen on
+        self.host = host
+        
+        ## @brief TCP port (the bound port once started)
+        self.port = port
+        
+        ## @brief Maximum number of rendered responses kept in memory
+        self.cache_size = cache_size
+        
+        self._cache = OrderedDict()
+        self._loop = None
+        self._server = None
+        self._thread = None
+    
+    def start(self):
+        """@brief Start serving in a background thread
+        @details Returns once the socket is bound
+        @exception OSError If the address cannot be bound
+        """
+        ready = threading.Event()
+        errors = []
+        
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port))
+            except OSError as e:
+                errors.append(e)
+                ready.set()
+                self._loop.close()
+                return
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            try:
+                self._loop.run_forever()
+            finally:
+                self._server.close()
+                tasks = asyncio.all_tasks(self._loop)
+                for task in tasks:
+                    task.cancel()
+                self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                self._loop.close()
+        
+        self._thread = threading.Thread(target=run, name="api-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        print(f"[API] Serving results on http://{self.host}:{self.port}/games")
+    
+    def stop(self):
+        """@brief Stop the server and wait for its thread"""
+        if self._loop is not None and self._thread is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._thread = None
+    
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """@brief Serve the requests of one connection
+        @param reader Connection input
+        @param writer Connection output
+        """
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), self.IDLE_TIMEOUT)
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), self.IDLE_TIMEOUT)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    await self._send(writer, 400, {"error": "Malformed request"})
+                    break
+                method, target, protocol = parts
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and protocol.upper() == "HTTP/1.1")
+                # A request body is never used; it is read past so the next
+                # request starts on the right byte, or the connection closes
+                length = headers.get("content-length", "0")
+                if ("transfer-encoding" in headers or not length.isdigit()
+                        or int(length) > self.MAX_DISCARDED_BODY):
+                    keep_alive = False
+                elif int(length):
+                    await asyncio.wait_for(reader.readexactly(int(length)), self.IDLE_TIMEOUT)
+                
+                if method not in ("GET", "HEAD"):
+                    await self._send(writer, 405, {"error": "Only GET is supported"}, keep_alive=keep_alive)
+                else:
+                    status, etag, entry = self._respond(urlsplit(target).path)
+                    gzipped = "gzip" in headers.get("accept-encoding", "") and len(entry[0]) >= self.GZIP_MIN_SIZE
+                    if etag is not None and gzipped:
+                        # Each encoding is a different representation with its own validator
+                        etag = etag[:-1] + '-gz"'
+                    if etag is not None and self._etag_matches(headers.get("if-none-match"), etag):
+                        await self._write(writer, 304, b"", etag, keep_alive)
+                    elif gzipped:
+                        # Compressed once per entry, cached entries keep the result
+                        if entry[1] is None:
+                            entry[1] = gzip.compress(entry[0], compresslevel=5)
+                        await self._write(writer, status, entry[1], etag, keep_alive, gzipped=True,
+                                          head=method == "HEAD")
+                    else:
+                        await self._write(writer, status, entry[0], etag, keep_alive, head=method == "HEAD")
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.CancelledError, ConnectionError, asyncio.IncompleteReadError):
+            # Idle timeout, client gone or server stopping
+            pass
+        finally:
+            writer.close()
+    
+    def _respond(self, path: str) -> Tuple[int, Optional[str], list]:
+        """@brief Get the response of a path from the cache or by rendering it
+        @param path Request path
+        @return Status code, ETag (None for errors) and [JSON body, gzip body or None]
+        @retval Tuple[int, Optional[str], list] Response
+        """
+        version, results = self.store.snapshot()
+        parts = [part for part in path.split("/") if part]
+        
+        if parts == ["health"]:
+            return 200, None, [self._encode({"status": "ok", "version": version, "games": len(results)}), None]
+        
+        if parts == ["games"]:
+            key = ("games", version)
+            builder = lambda: {
+                "version": version,
+                "games": [
+                    {"slug": slug, "game": result.game, "version": result.version,
+                     "updated_at": datetime.fromtimestamp(result.updated_at).isoformat()}
+                    for slug, result in sorted(results.items())
+                ]
+            }
+        elif len(parts) in (2, 3) and parts[0] == "games" and parts[1] in results:
+            result = results[parts[1]]
+            route = parts[2] if len(parts) == 3 else None
+            if route is not None and route not in GAME_ROUTES:
+                return 404, None, [self._encode({"error": f"Unknown resource '{route}'"}), None]
+            key = (parts[1], route, result.version)
+            if route is None:
+                builder = lambda: {name: build(result) for name, build in GAME_ROUTES.items()}
+            else:
+                builder = lambda: GAME_ROUTES[route](result)
+        else:
+            return 404, None, [self._encode({"error": "Not found"}), None]
+        
+        etag = '"' + "-".join(str(part) for part in key if part is not None) + '"'
+        entry = self._cache.get(key)
+        if entry is not None:
+            self._cache.move_to_end(key)
+            metrics.incr("api_responses", cache="hit")
+            return 200, etag, entry
+        
+        metrics.incr("api_responses", cache="miss")
+        entry = [self._encode(builder()), None]
+        self._cache[key] = entry
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return 200, etag, entry
+    
+    @staticmethod
+    def _etag_matches(header: Optional[str], etag: str) -> bool:
+        """@brief Check an If-None-Match header against an ETag
+        @details The header is "*" or a comma-separated list of entity tags;
+                 weak tags (W/"...") match their strong counterpart, as
+                 If-None-Match uses weak comparison
+        @param header If-None-Match header value (None if absent)
+        @param etag Current strong ETag
+        @return True if the client's copy is current
+        @retval bool Match result
+        """
+        if header is None:
+            return False
+        if header.strip() == "*":
+            return True
+        for tag in header.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag == etag:
+                return True
+        return False
+    
+    @staticmethod
+    def _encode(document: dict) -> bytes:
+        """@brief Serialize a document
+        @param document JSON-serializable dictionary
+        @details numpy scalars are written as plain numbers
+        @return Compact UTF-8 JSON
+        @retval bytes Response body
+        """
+        return json.dumps(document, separators=(",", ":"), ensure_ascii=False,
+                          default=lambda value: value.item() if hasattr(value, "item") else str(value)).encode("utf-8")
+    
+    async def _send(self, writer: asyncio.StreamWriter, status: int, document: dict, keep_alive: bool = False):
+        """@brief Send an uncached JSON response
+        @param writer Connection output
+        @param status HTTP status code
+        @param document Response document
+        @param keep_alive Keep the connection open
+        """
+        await self._write(writer, status, self._encode(document), None, keep_alive)
+    
+    @staticmethod
+    async def _write(writer: asyncio.StreamWriter, status: int, body: bytes, etag: Optional[str],
+                     keep_alive: bool, gzipped: bool = False, head: bool = False):
+        """@brief Write one HTTP response
+        @param writer Connection output
+        @param status HTTP status code
+        @param body Response body
+        @param etag ETag header value (omitted if None)
+        @param keep_alive Keep the connection open
+        @param gzipped Body is gzip-compressed
+        @param head Send headers only
+        """
+        reasons = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+                   405: "Method Not Allowed"}
+        lines = [f"HTTP/1.1 {status} {reasons.get(status, 'OK')}"]
+        if status != 304:
+            lines.append("Content-Type: application/json; charset=utf-8")
+            lines.append(f"Content-Length: {len(body)}")
+        if etag is not None:
+            lines.append(f"ETag: {etag}")
+            lines.append("Cache-Control: no-cache")
+        if gzipped:
+            lines.append("Content-Encoding: gzip")
+        lines.append("Vary: Accept-Encoding")
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if body and not head and status != 304:
+            writer.write(body)
+        await writer.drain()
\ No newline at end of file
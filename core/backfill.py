@@ -0,0 +1,306 @@
+"""Parallel historical backfill"""
+import os
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from core.paths import game_output_dir
+from models.naming import game_slug
+from models.metrics import metrics
+
+## @brief Per-process stores opened by the worker initializer
+_worker_stores = {}
+
+class BackfillUnit:
+    """@brief History of one game over one day range"""
+    
+    __slots__ = ("game", "app_id", "start_day", "length")
+    
+    def __init__(self, game: str, app_id: str, start_day: int, length: int):
+        """@brief Initialize the unit
+        @param game Name of the game
+        @param app_id Steam App ID of the game
+        @param start_day First day ordinal
+        @param length Number of days
+        """
+        ## @brief Name of the game
+        self.game = game
+        
+        ## @brief Steam App ID of the game
+        self.app_id = app_id
+        
+        ## @brief First day ordinal
+        self.start_day = start_day
+        
+        ## @brief Number of days
+        self.length = length
+    
+    @property
+    def key(self) -> str:
+        """@brief Get the identifier of the unit in the manifest
+        @return "<game slug>/<start day>-<end day>"
+        @retval str Unit key
+        """
+        return f"{game_slug(self.game)}/{self.start_day}-{self.start_day + self.length}"
+
+def plan_units(games: List[Tuple[str, str]], start_day: int, end_day: int, chunk_days: int) -> List[BackfillUnit]:
+    """@brief Split a backfill into (game, day range) units
+    @param games List of (game name, Steam App ID) pairs
+    @param start_day First day ordinal
+    @param end_day Day after the last day
+    @param chunk_days Maximum number of days per unit
+    @return Units covering every game and day once
+    @retval List[BackfillUnit] Work units
+    """
+    return [
+        BackfillUnit(game, app_id, day, min(chunk_days, end_day - day))
+        for game, app_id in games
+        for day in range(start_day, end_day, chunk_days)
+    ]
+
+class BackfillManifest:
+    """@brief Record of completed backfill work, used to resume
+    @details A JSON file listing the finished units (with their result
+             files) and the games whose outputs were written. Only the
+             coordinating process writes it, and every update replaces the
+             file atomically, so an interrupted backfill loses at most the
+             units that were running.
+    """
+    
+    def __init__(self, path: str):
+        """@brief Load (or start) a manifest
+        @param path Path to the JSON file
+        """
+        ## @brief Path to the JSON file
+        self.path = path
+        
+        ## @brief Result file per finished unit key
+        self.units: Dict[str, str] = {}
+        
+        ## @brief Keys of the games whose outputs were written
+        self.games: Dict[str, str] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    state = json.load(f)
+                self.units = state.get("units", {})
+                self.games = state.get("games", {})
+            except (OSError, ValueError) as e:
+                print(f"[Backfill] Ignoring unreadable manifest {path}: {e}")
+    
+    def done(self, unit: BackfillUnit) -> bool:
+        """@brief Check whether a unit finished in an earlier run
+        @param unit Work unit
+        @return True if the unit is recorded and its result file exists
+        @retval bool Completion flag
+        """
+        path = self.units.get(unit.key)
+        return path is not None and os.path.exists(path)
+    
+    def add_unit(self, key: str, path: str):
+        """@brief Record a finished unit
+        @param key Unit key
+        @param path Result file of the unit
+        """
+        self.units[key] = path
+        self.save()
+    
+    def add_game(self, game: str, signature: str):
+        """@brief Record that the outputs of a game were written
+        @param game Name of the game
+        @param signature Day range of the written outputs
+        """
+        self.games[game_slug(game)] = signature
+        self.save()
+    
+    def save(self):
+        """@brief Replace the manifest file atomically"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"units": self.units, "games": self.games}, f)
+        os.replace(tmp_path, self.path)
+
+def _init_worker(snapshot_dir: Optional[str], archive_dir: Optional[str]):
+    """@brief Open the local stores once per worker process
+    @param snapshot_dir Directory of the Steam snapshot store (None to skip Steam)
+    @param archive_dir Directory of the Reddit post archive (None to skip Reddit)
+    """
+    from data_sources.steam_snapshots import SteamSnapshotStore
+    from data_sources.post_archive import PostArchive
+    
+    _worker_stores["snapshots"] = SteamSnapshotStore(snapshot_dir) if snapshot_dir else None
+    _worker_stores["archive"] = PostArchive(archive_dir) if archive_dir else None
+
+def build_unit(unit: BackfillUnit, path: str) -> Tuple[str, str]:
+    """@brief Compute the columns of one unit and write them to a result file
+    @details Runs in a worker process. Steam owners come from the snapshot
+             store, Reddit mentions from the post archive; nothing is
+             fetched. The result is an .npz file holding the column names,
+             the first day and one int64 row per column, so only the file
+             name travels back to the coordinating process.
+    @param unit Work unit
+    @param path Result file path
+    @return Unit key and result file path
+    @retval Tuple[str, str] Finished unit
+    """
+    from data_sources.steam_source import SteamDataSource, owner_history
+    from data_sources.reddit_source import RedditDataSource
+    
+    names, rows = [], []
+    snapshots = _worker_stores.get("snapshots")
+    if snapshots is not None and unit.app_id:
+        series = owner_history(snapshots, int(unit.app_id), unit.start_day, unit.length)
+        if series is not None:
+            names.append(SteamDataSource.column)
+            rows.append(series.values)
+    archive = _worker_stores.get("archive")
+    if archive is not None:
+        names.append(RedditDataSource.column)
+        rows.append(archive.counts(unit.game, unit.start_day, unit.length).values)
+    
+    values = np.vstack(rows) if rows else np.zeros((0, unit.length), dtype=np.int64)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, columns=np.array(names, dtype=str), start_day=unit.start_day, values=values)
+    os.replace(tmp_path, path)
+    return unit.key, path
+
+def render_game(game: str, paths: List[str], output_dir: str, plot: bool, max_points: int) -> str:
+    """@brief Join the units of a game and write its history reports and plot
+    @details Runs in a worker process. Comments are computed over the whole
+             history, since annotation rules compare days with the maximum
+             and mean of the full range.
+    @param game Name of the game
+    @param paths Result files of the game's units
+    @param output_dir Root directory for per-game outputs
+    @param plot Create the history plot
+    @param max_points Maximum number of plotted days
+    @return Name of the game
+    @retval str Finished game
+    @exception ValueError If the game has no unit results
+    """
+    if not paths:
+        raise ValueError(f"No unit results for {game}")
+    
+    import pandas as pd
+    from core.annotations import AnnotationEngine
+    from core.reporter import Reporter
+    from models.time_series import date_strings
+    
+    parts = []
+    for path in paths:
+        with np.load(path) as data:
+            parts.append((int(data["start_day"]), list(data["columns"]), data["values"]))
+    parts.sort(key=lambda part: part[0])
+    names = list(dict.fromkeys(name for _, columns, _ in parts for name in columns))
+    length = sum(values.shape[1] for _, _, values in parts)
+    columns = {name: np.zeros(length, dtype=np.int64) for name in names}
+    offset = 0
+    for _, part_columns, values in parts:
+        for row, name in enumerate(part_columns):
+            columns[name][offset:offset + values.shape[1]] = values[row]
+        offset += values.shape[1]
+    
+    df = pd.DataFrame({"Date": date_strings(parts[0][0], length), **columns}, copy=False)
+    df = AnnotationEngine().annotate(df)
+    game_dir = game_output_dir(output_dir, game)
+    Reporter.save_formatted_csv(df, os.path.join(game_dir, "history_report.csv"), length, game,
+                                data_filename=os.path.join(game_dir, "history.csv"))
+    if plot:
+        from core.visualizer import Visualizer
+        Visualizer.create_plot(df, game, os.path.join(game_dir, "history.png"), fast=True, max_points=max_points)
+    return game
+
+def run_backfill(games: List[Tuple[str, str]], start_day: int, end_day: int, output_dir: str, work_dir: str,
+                 snapshot_dir: Optional[str], archive_dir: Optional[str], workers: Optional[int] = None,
+                 chunk_days: int = 90, plot: bool = True, max_points: int = 1000) -> Tuple[int, List[str]]:
+    """@brief Rebuild the history of many games on all cores
+    @details (game, day range) units are built by a process pool and
+             written to .npz files under work_dir. As soon as all units of a
+             game are done, its reports and plot are rendered in the same
+             pool, so building and rendering overlap. Finished units and
+             games are recorded in a manifest; running the same backfill
+             again skips them and continues where it stopped. A game with a
+             failed unit is not rendered and is reported as failed; its
+             finished units are kept for the next run.
+    @param games List of (game name, Steam App ID) pairs
+    @param start_day First day ordinal
+    @param end_day Day after the last day
+    @param output_dir Root directory for per-game outputs
+    @param work_dir Directory for unit results and the manifest
+    @param snapshot_dir Directory of the Steam snapshot store (None to skip Steam)
+    @param archive_dir Directory of the Reddit post archive (None to skip Reddit)
+    @param workers Number of worker processes (all cores if None)
+    @param chunk_days Maximum number of days per unit
+    @param plot Create a history plot per game
+    @param max_points Maximum number of plotted days
+    @return Number of games whose outputs are complete and the names of the failed games
+    @retval Tuple[int, List[str]] Completed count and failed games
+    """
+    if end_day <= start_day or not games:
+        print("[Backfill] Nothing to do: no games or an empty day range")
+        return 0, []
+    
+    os.makedirs(work_dir, exist_ok=True)
+    manifest = BackfillManifest(os.path.join(work_dir, "manifest.json"))
+    signature = f"{start_day}-{end_day}"
+    units = plan_units(games, start_day, end_day, chunk_days)
+    paths = {unit.key: os.path.join(work_dir, f"{unit.key}.npz") for unit in units}
+    pending = {game: [] for game, _ in games}
+    for unit in units:
+        if not manifest.done(unit):
+            pending[unit.game].append(unit)
+    todo = [game for game, _ in games if pending[game] or manifest.games.get(game_slug(game)) != signature]
+    skipped = len(units) - sum(len(game_units) for game_units in pending.values())
+    print(f"[Backfill] {len(games)} games, {len(units)} units ({skipped} done in an earlier run), "
+          f"{end_day - start_day} days")
+    
+    completed = len(games) - len(todo)
+    failed = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(snapshot_dir, archive_dir)) as executor:
+        def render(game):
+            game_paths = [paths[unit.key] for unit in units if unit.game == game]
+            return executor.submit(render_game, game, game_paths, output_dir, plot, max_points)
+        
+        futures = {}
+        for game in todo:
+            if pending[game]:
+                for unit in pending[game]:
+                    futures[executor.submit(build_unit, unit, paths[unit.key])] = ("unit", unit.game)
+            else:
+                futures[render(game)] = ("game", game)
+        remaining = {game: len(pending[game]) for game in todo}
+        
+        while futures:
+            for future in as_completed(list(futures)):
+                kind, game = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[Backfill] {game}: {kind} failed: {e}")
+                    metrics.incr("errors", stage="backfill")
+                    failed.setdefault(game, str(e))
+                    continue
+                if kind == "unit":
+                    manifest.add_unit(*result)
+                    metrics.incr("backfill_units")
+                    remaining[game] -= 1
+                    if remaining[game] == 0 and game not in failed:
+                        futures[render(game)] = ("game", game)
+                        break
+                else:
+                    manifest.add_game(game, signature)
+                    completed += 1
+                    print(f"[Backfill] {game} done ({completed}/{len(games)})")
+    
+    print(f"[Backfill] Completed {completed}/{len(games)} games in {time.perf_counter() - started:.1f}s")
+    if failed:
+        print(f"[Backfill] {len(failed)} games failed and will be retried by the next run:")
+        for game, reason in failed.items():
+            print(f"   {game}: {reason}")
+    metrics.incr("backfill_failed_games", len(failed))
+    return completed, list(failed)
\ No newline at end of file
@@ -1,37 +1,223 @@
 """Processing data from various sources"""
-import pandas as pd
-from typing import List, Dict, Any
+from __future__ import annotations
+import time
+import threading
+import numpy as np
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Sequence, Tuple, TYPE_CHECKING
 from data_sources.base_data_source import BaseDataSource
-from models.data_models import DataSourceStats
+from models.data_models import DataSourceStats, AnomalyEvent, CombinedBatch
+from models.time_series import DailySeries, date_strings, epoch_day
+from core.annotations import AnnotationEngine
+from core.anomaly import AnomalyMonitor
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+def _submit_daemon(name: str, function, **kwargs) -> Future:
+    """@brief Run a function on a new daemon thread
+    @details Unlike ThreadPoolExecutor workers, which the interpreter joins
+             at exit, a daemon thread stuck in a hung request does not keep
+             the process alive
+    @param name Thread name
+    @param function Function to call
+    @param kwargs Arguments of the call
+    @return Future receiving the result or the exception of the call
+    @retval Future Pending result
+    """
+    future = Future()
+    
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function(**kwargs))
+        except Exception as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, name=name, daemon=True).start()
+    return future
 
 class DataProcessor:
     """@brief Data processor for combining data from multiple sources
     @details Handles fetching, combining, and processing data from various sources
     """
     
-    def __init__(self):
-        """@brief Initialize data processor"""
+    ## @brief Fetch status: source returned in time
+    STATUS_OK = "ok"
+    
+    ## @brief Fetch status: source missed its deadline
+    STATUS_TIMEOUT = "timeout"
+    
+    ## @brief Fetch status: source raised an exception
+    STATUS_ERROR = "error"
+    
+    ## @brief Fetch status: a late fetch of the source from an earlier call is still running
+    STATUS_BUSY = "busy"
+    
+    def __init__(self, concurrent: bool = False, default_timeout: Optional[float] = None):
+        """@brief Initialize data processor
+        @param concurrent Fetch all sources in parallel instead of one after another
+        @param default_timeout Deadline in seconds for sources without their own timeout
+        """
         ## @brief List of data sources to process
         self.data_sources = []
+        
+        ## @brief Run fetches in a thread pool
+        self.concurrent = concurrent
+        
+        ## @brief Deadline used when a source has no explicit timeout
+        self.default_timeout = default_timeout
+        
+        ## @brief Per-source deadlines in seconds, keyed by source name
+        self.timeouts = {}
+        
+        ## @brief Per-source status of the last fetch, keyed by source name
+        self.fetch_status = {}
+        
+        ## @brief Futures of fetches that missed their deadline, keyed by source object
+        self._pending = {}
+        
+        ## @brief Rule engine used for the comment column
+        self.annotation_engine = AnnotationEngine()
+        
+        ## @brief Streaming detectors, state is kept per game and column across runs
+        self.anomaly_monitor = AnomalyMonitor()
     
-    def add_data_source(self, source: BaseDataSource):
+    def add_data_source(self, source: BaseDataSource, timeout: Optional[float] = None):
         """@brief Add a data source to the processor
         @param source Data source to add
+        @param timeout Deadline in seconds for this source in concurrent mode
         """
         self.data_sources.append(source)
+        if timeout is not None:
+            self.timeouts[source.name] = timeout
+    
+    def clear_data_sources(self):
+        """@brief Remove all registered data sources
+        @details Lets one processor be reused for several games in a batch run
+        """
+        self.data_sources = []
+        self.fetch_status = {}
     
     def fetch_all_data(self, **kwargs) -> Dict[str, Any]:
         """@brief Fetch data from all registered sources
+        @details In concurrent mode the sources run in a thread pool and the
+                 call returns once every source finished or missed its
+                 deadline, so the total time is that of the slowest source.
+                 A late source is skipped by later calls until its fetch
+                 finished in the background. The outcome for each source is stored in fetch_status.
         @param kwargs Additional arguments to pass to data sources
         @return Dictionary mapping source names to their data
-        @retval Dict[str, Any] Data from all sources
+        @retval Dict[str, Any] Data from all sources (late sources are omitted)
+        """
+        self.fetch_status = {}
+        if not self.concurrent:
+            results = {}
+            for source in self.data_sources:
+                print(f"Fetching data from {source.name}...")
+                results[source.name] = source.fetch_data(**kwargs)
+                self.fetch_status[source.name] = self.STATUS_OK
+            return results
+        
+        return self._fetch_concurrent(**kwargs)
+    
+    def _fetch_concurrent(self, **kwargs) -> Dict[str, Any]:
+        """@brief Fetch data from all sources in parallel with per-source deadlines
+        @param kwargs Additional arguments to pass to data sources
+        @return Dictionary mapping source names to the data of sources that finished in time
+        @retval Dict[str, Any] Partial results
         """
         results = {}
+        if not self.data_sources:
+            return results
+        
+        # A source whose late fetch is still running is not fetched again,
+        # two fetches would mutate the same source and its clients at once
+        self._pending = {source: future for source, future in self._pending.items() if not future.done()}
+        sources = []
         for source in self.data_sources:
+            if source in self._pending:
+                print(f"[{source.name}] Previous fetch still running, skipping source")
+                self.fetch_status[source.name] = self.STATUS_BUSY
+            else:
+                sources.append(source)
+        if not sources:
+            return results
+        
+        started = time.monotonic()
+        futures = {}
+        for source in sources:
             print(f"Fetching data from {source.name}...")
-            results[source.name] = source.fetch_data(**kwargs)
+            futures[source.name] = (source, _submit_daemon(f"fetch-{source.name}", source.fetch_data, **kwargs))
+        
+        for name, (source, future) in futures.items():
+            deadline = self.timeouts.get(name, self.default_timeout)
+            remaining = None
+            if deadline is not None:
+                remaining = max(0.0, deadline - (time.monotonic() - started))
+            try:
+                results[name] = future.result(timeout=remaining)
+                self.fetch_status[name] = self.STATUS_OK
+            except FutureTimeoutError:
+                print(f"[{name}] Deadline of {deadline}s exceeded, skipping source")
+                self.fetch_status[name] = self.STATUS_TIMEOUT
+                self._pending[source] = future
+            except Exception as e:
+                print(f"[{name}] Error fetching data: {e}")
+                self.fetch_status[name] = self.STATUS_ERROR
+        
+        # Late sources are not waited for, their threads finish in the
+        # background and the sources stay in _pending until then
         return results
     
+    def is_busy(self, source: BaseDataSource) -> bool:
+        """@brief Check whether a late fetch of a source is still running
+        @param source Data source to check
+        @return True if the source must not be fetched or read yet
+        @retval bool Busy flag
+        """
+        future = self._pending.get(source)
+        return future is not None and not future.done()
+    
+    def wait_pending(self, sources: Sequence[BaseDataSource], timeout: float) -> List[BaseDataSource]:
+        """@brief Wait for late fetches of the given sources from an earlier call
+        @details Used before a source is fetched again, e.g. by the next
+                 daemon cycle. All sources share one deadline.
+        @param sources Data sources to wait for
+        @param timeout Maximum total wait in seconds
+        @return Sources whose late fetch is still running after the wait
+        @retval List[BaseDataSource] Sources the next fetch will skip as busy
+        """
+        started = time.monotonic()
+        busy = []
+        for source in sources:
+            future = self._pending.get(source)
+            if future is None:
+                continue
+            remaining = max(0.0, timeout - (time.monotonic() - started))
+            try:
+                future.result(timeout=remaining)
+            except FutureTimeoutError:
+                busy.append(source)
+            except Exception:
+                pass
+        return busy
+    
+    def get_active_sources(self) -> List[BaseDataSource]:
+        """@brief Get sources whose last fetch completed
+        @details Sources that missed their deadline or are still busy with an
+                 earlier late fetch are excluded so that a fetch running in
+                 the background is never read half-way.
+        @return List of data sources
+        @retval List[BaseDataSource] Sources usable for statistics and combination
+        """
+        return [
+            source for source in self.data_sources
+            if self.fetch_status.get(source.name) not in (self.STATUS_TIMEOUT, self.STATUS_BUSY)
+        ]
+    
     def get_all_statistics(self) -> Dict[str, DataSourceStats]:
         """@brief Get statistics from all registered sources
         @details Uses polymorphic interface to get statistics from all sources
@@ -39,7 +225,7 @@ class DataProcessor:
         @retval Dict[str, DataSourceStats] Statistics from all sources
         """
         stats = {}
-        for source in self.data_sources:
+        for source in self.get_active_sources():
             source_stats = source.get_statistics()
             if "error" not in source_stats:
                 stats[source.name] = DataSourceStats(**source_stats)
@@ -47,58 +233,132 @@ class DataProcessor:
     
     def combine_data(self) -> pd.DataFrame:
         """@brief Combine data from all registered sources
+        @details Wraps the columns of combine_columns() into a DataFrame without copying them
         @return Combined data as pandas DataFrame
         @retval pd.DataFrame Combined data with all source information
         @exception ValueError If fewer than 2 sources are registered
         """
-        if len(self.data_sources) < 2:
+        import pandas as pd
+        
+        start_day, length, columns = self.combine_columns()
+        if not columns:
+            return pd.DataFrame()
+        
+        return pd.DataFrame({"Date": date_strings(start_day, length), **columns}, copy=False)
+    
+    def combine_columns(self) -> Tuple[int, int, Dict[str, np.ndarray]]:
+        """@brief Align the data of all registered sources on one day range
+        @details All sources are aligned in a single pass: sources with a
+                 series (and a column name) contribute a slice of their int64
+                 array, other sources are aligned from format_data(). Days a
+                 source does not cover are filled with 0 and the dtype of
+                 every column is kept.
+        @return First day ordinal, number of days and values per column name
+        @retval Tuple[int, int, Dict[str, np.ndarray]] Combined columns
+        @exception ValueError If fewer than 2 sources are registered
+        """
+        sources = self.get_active_sources()
+        if len(sources) < 2:
             raise ValueError("At least 2 data sources needed for combination")
         
-        # Get data from first source (as base)
-        base_df = self.data_sources[0].format_data()
+        # Shared day range covering the analysis period of every source
+        start_day = min(source.window_start_day() for source in sources)
+        end_day = max(source.window_start_day() + source.days for source in sources)
+        length = end_day - start_day
         
-        # Add data from other sources
-        for source in self.data_sources[1:]:
+        columns = {}
+        date_index = None
+        for source in sources:
+            if source.column and source.has_data():
+                columns[source.column] = source.series.window(start_day, length).values
+                continue
+            
+            # Generic sources only provide a DataFrame
             source_df = source.format_data()
-            if not source_df.empty:
-                base_df = pd.merge(base_df, source_df, on="Date", how="outer")
+            if source_df.empty:
+                continue
+            if date_index is None:
+                import pandas as pd
+                date_index = pd.Index(date_strings(start_day, length))
+            positions = date_index.get_indexer(source_df["Date"])
+            inside = positions >= 0
+            for column in source_df.columns.drop("Date"):
+                source_values = source_df[column].to_numpy()
+                values = np.zeros(length, dtype=np.result_type(source_values.dtype, 0))
+                values[positions[inside]] = source_values[inside]
+                columns[column] = values
         
-        # Fill missing values with zeros
-        base_df = base_df.fillna(0)
+        return start_day, length, columns
+    
+    def add_to_batch(self, batch: CombinedBatch, game_name: str, combined_df: pd.DataFrame) -> int:
+        """@brief Append the combined data of one game to a batch
+        @details Reuses the output of combine_data() and add_comments():
+                 columns are aligned on the day range of the batch and the
+                 Comment column is stored as codes of the annotation engine,
+                 so the batch holds the same comments as the per-game files.
+        @param batch Batch collecting many games
+        @param game_name Name of the game
+        @param combined_df Combined (and annotated) data of the game
+        @return Row of the game in the batch
+        @retval int Row number
+        """
+        if combined_df.empty:
+            return batch.add(game_name, {})
+        
+        start_day = epoch_day(datetime.strptime(str(combined_df["Date"].iloc[0]), "%Y-%m-%d").date())
+        
+        def align(values: np.ndarray) -> np.ndarray:
+            return DailySeries(start_day, values).window(batch.start_day, batch.length).values
         
-        return base_df
+        aligned = {
+            name: align(combined_df[name].to_numpy())
+            for name in combined_df.columns if name not in ("Date", self.annotation_engine.output_column)
+        }
+        comments = None
+        if self.annotation_engine.output_column in combined_df.columns:
+            codes = self.annotation_engine.encode(combined_df[self.annotation_engine.output_column].to_numpy())
+            comments = align(codes).astype(np.int8)
+        return batch.add(game_name, aligned, comments)
+    
+    def detect_anomalies(self, game_name: str, columns: Sequence[str] = ("Reddit Mentions",)) -> List[AnomalyEvent]:
+        """@brief Feed the closed days of the fetched series into the anomaly monitor
+        @details Today is still open and is not scored. Days that were fed in
+                 an earlier run of the same processor (batch, daemon) are
+                 skipped, so every day is scored once.
+        @param game_name Name of the game, used in the series keys
+        @param columns Columns of the sources to monitor
+        @return Anomalies of the newly fed days
+        @retval List[AnomalyEvent] Detected events
+        """
+        today = epoch_day(datetime.now(timezone.utc).date())
+        events = []
+        for source in self.get_active_sources():
+            if source.column in columns and source.has_data():
+                events.extend(self.anomaly_monitor.observe_series(f"{game_name}|{source.column}",
+                                                                  source.series, end_day=today))
+        return events
+    
+    def recent_anomalies(self, game_name: str, columns: Sequence[str] = ("Reddit Mentions",),
+                         days: int = 30) -> List[AnomalyEvent]:
+        """@brief Get the anomalies of a game's recent days, including days scored in earlier runs
+        @param game_name Name of the game, used in the series keys
+        @param columns Monitored columns
+        @param days Number of most recent days
+        @return Events ordered by day
+        @retval List[AnomalyEvent] Detected events
+        """
+        today = epoch_day(datetime.now(timezone.utc).date())
+        return self.anomaly_monitor.events([f"{game_name}|{column}" for column in columns], start_day=today - days)
     
     def add_comments(self, df: pd.DataFrame) -> pd.DataFrame:
         """@brief Add comments to combined data based on analysis
+        @details Rules are evaluated by the annotation engine; reporters reuse
+                 the resulting Comment column instead of recomputing it
         @param df Input DataFrame with combined data
         @return DataFrame with added comments column
         @retval pd.DataFrame DataFrame with comments
         """
-        if "Reddit Mentions" not in df.columns:
+        if self.annotation_engine.column not in df.columns:
             return df
-            
-        df_with_comments = df.copy()
-        
-        max_mentions = df['Reddit Mentions'].max()
-        min_mentions = df['Reddit Mentions'].min()
-        avg_mentions = df['Reddit Mentions'].mean()
-        
-        comments = []
-        for _, row in df.iterrows():
-            reddit_val = row['Reddit Mentions']
-            
-            if reddit_val == max_mentions and max_mentions > 0:
-                comment = "Maximum"
-            elif reddit_val >= avg_mentions * 1.5 and reddit_val > 0:
-                comment = "High activity"
-            elif reddit_val == min_mentions:
-                comment = "Minimum"
-            elif reddit_val == 0:
-                comment = "No mentions"
-            else:
-                comment = ""
-            
-            comments.append(comment)
         
-        df_with_comments['Comment'] = comments
-        return df_with_comments
\ No newline at end of file
+        return self.annotation_engine.annotate(df)
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""Pluggable export stage for combined data"""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Dict, List, Sequence, TYPE_CHECKING
+from core.reporter import Reporter
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+class BaseExporter(ABC):
+    """@brief Abstract base class for exporters
+    @details An exporter writes the combined (annotated) data of one game to
+             a destination. Exporters are selected by format name in
+             EXPORT_FORMATS and run one after another.
+    """
+    
+    @abstractmethod
+    def export(self, df: pd.DataFrame, game_name: str, days: int):
+        """@brief Write the data of one game
+        @param df Combined data
+        @param game_name Name of the game
+        @param days Number of days analyzed
+        """
+        pass
+
+class TextReportExporter(BaseExporter):
+    """@brief Fixed-width text report (output.csv)"""
+    
+    def __init__(self, filename: str):
+        """@brief Initialize the exporter
+        @param filename Output filename
+        """
+        ## @brief Output filename
+        self.filename = filename
+    
+    def export(self, df: pd.DataFrame, game_name: str, days: int):
+        """@brief Write the formatted report
+        @param df Combined data
+        @param game_name Name of the game
+        @param days Number of days analyzed
+        """
+        Reporter.save_formatted_csv(df, self.filename, days, game_name, data_filename=None)
+
+class CsvExporter(BaseExporter):
+    """@brief Standard CSV file (data.csv)"""
+    
+    def __init__(self, filename: str, block_size: int = 10000):
+        """@brief Initialize the exporter
+        @param filename Output filename
+        @param block_size Number of rows written at a time
+        """
+        ## @brief Output filename
+        self.filename = filename
+        
+        ## @brief Number of rows written at a time
+        self.block_size = block_size
+    
+    def export(self, df: pd.DataFrame, game_name: str, days: int):
+        """@brief Write the CSV file
+        @param df Combined data
+        @param game_name Name of the game
+        @param days Number of days analyzed
+        """
+        df.to_csv(self.filename, index=False, encoding='utf-8-sig', chunksize=self.block_size)
+        print(f"Standard data saved to {self.filename}")
+
+def _to_arrow_table(df: pd.DataFrame, game_name: str):
+    """@brief Convert combined data into an Arrow table with a Game column
+    @param df Combined data
+    @param game_name Name of the game
+    @return Arrow table
+    @retval pyarrow.Table Table ready for writing
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("pyarrow is required for Parquet/Arrow export: pip install pyarrow")
+    
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return table.append_column("Game", pa.array([game_name] * len(df), type=pa.string()))
+
+class ParquetExporter(BaseExporter):
+    """@brief Partitioned Parquet dataset
+    @details Rows are written into a Hive-style dataset partitioned by game
+             and date. Partitions touched by a run are replaced, so repeated
+             runs append new days and refresh the days they cover without
+             rewriting the rest of the history.
+    """
+    
+    def __init__(self, root: str, compression: str = "zstd",
+                 partition_cols: Sequence[str] = ("Game", "Date")):
+        """@brief Initialize the exporter
+        @param root Root directory of the dataset
+        @param compression Parquet compression codec
+        @param partition_cols Partition columns
+        """
+        ## @brief Root directory of the dataset
+        self.root = root
+        
+        ## @brief Parquet compression codec
+        self.compression = compression
+        
+        ## @brief Partition columns
+        self.partition_cols = list(partition_cols)
+    
+    def export(self, df: pd.DataFrame, game_name: str, days: int):
+        """@brief Write the data into the dataset
+        @param df Combined data
+        @param game_name Name of the game
+        @param days Number of days analyzed
+        """
+        import pyarrow.parquet as pq
+        
+        table = _to_arrow_table(df, game_name)
+        pq.write_to_dataset(
+            table, self.root,
+            partition_cols=self.partition_cols,
+            compression=self.compression,
+            existing_data_behavior="delete_matching",
+            basename_template="part-{i}.parquet"
+        )
+        print(f"Parquet data saved to {self.root}")
+
+class ArrowExporter(BaseExporter):
+    """@brief Arrow IPC (Feather) file per game"""
+    
+    def __init__(self, filename: str, compression: str = "zstd"):
+        """@brief Initialize the exporter
+        @param filename Output filename
+        @param compression Arrow compression codec (zstd, lz4 or uncompressed)
+        """
+        ## @brief Output filename
+        self.filename = filename
+        
+        ## @brief Arrow compression codec
+        self.compression = compression
+    
+    def export(self, df: pd.DataFrame, game_name: str, days: int):
+        """@brief Write the Arrow file
+        @param df Combined data
+        @param game_name Name of the game
+        @param days Number of days analyzed
+        """
+        import pyarrow.feather as feather
+        
+        feather.write_feather(_to_arrow_table(df, game_name), self.filename, compression=self.compression)
+        print(f"Arrow data saved to {self.filename}")
+
+def create_exporters(formats: Sequence[str], outputs: Dict[str, str], compression: str = "zstd") -> List[BaseExporter]:
+    """@brief Create exporters for the requested formats
+    @param formats Format names: "text", "csv", "parquet", "arrow"
+    @param outputs Output paths with keys "report", "data", "parquet" and "arrow"
+    @param compression Compression codec for columnar formats
+    @return List of exporters in the requested order
+    @retval List[BaseExporter] Exporters
+    @exception ValueError If a format is unknown
+    """
+    exporters = []
+    for export_format in formats:
+        if export_format == "text":
+            exporters.append(TextReportExporter(outputs["report"]))
+        elif export_format == "csv":
+            exporters.append(CsvExporter(outputs["data"]))
+        elif export_format == "parquet":
+            exporters.append(ParquetExporter(outputs["parquet"], compression=compression))
+        elif export_format == "arrow":
+            exporters.append(ArrowExporter(outputs["arrow"], compression=compression))
+        else:
+            raise ValueError(f"Unknown export format: {export_format}")
+    return exporters
\ No newline at end of file
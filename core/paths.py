@@ -0,0 +1,14 @@
+"""Output path helpers"""
+import os
+from models.naming import game_slug
+
+def game_output_dir(root: str, game_name: str) -> str:
+    """@brief Get (and create) the output directory of a game
+    @param root Root output directory
+    @param game_name Name of the game
+    @return Path of the per-game directory
+    @retval str Directory path
+    """
+    path = os.path.join(root, game_slug(game_name))
+    os.makedirs(path, exist_ok=True)
+    return path
\ No newline at end of file
@@ -1,9 +1,14 @@
 """Report generation"""
-from typing import Dict
-import pandas as pd
-from models.data_models import DataSourceStats
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+import numpy as np
+from models.data_models import DataSourceStats, AnomalyEvent, CombinedBatch
+from core.annotations import AnnotationEngine
 from config import GAME_NAME
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 class Reporter:
     """@brief Report generator for data analysis results
     @details Handles generating console output and saving data to files
@@ -29,38 +34,31 @@ class Reporter:
         
         # Data
         if "Reddit Mentions" in df.columns:
-            max_mentions = df['Reddit Mentions'].max()
-            min_mentions = df['Reddit Mentions'].min()
-            avg_mentions = df['Reddit Mentions'].mean()
+            mention_stats = AnnotationEngine.compute_stats(df['Reddit Mentions'].to_numpy())
         else:
-            max_mentions = min_mentions = avg_mentions = 0
+            mention_stats = None
         
-        for _, row in df.iterrows():
-            date = row['Date']
-            steam = f"{int(row['Steam Subscribers']):,}" if 'Steam Subscribers' in row else "0"
-            reddit = int(row['Reddit Mentions']) if 'Reddit Mentions' in row else 0
-            
-            # Add comments for peaks
-            if reddit == max_mentions and max_mentions > 0:
-                comment = "Maximum"
-            elif reddit >= avg_mentions * 1.5 and reddit > 0:
-                comment = "High activity"
-            elif reddit == min_mentions:
-                comment = "Minimum"
-            elif reddit == 0:
-                comment = "No mentions"
-            else:
-                comment = ""
-            
-            print(f"{date:<12} {steam:<15} {reddit:<10} {comment}")
+        # Reuse comments computed by the processor
+        if 'Comment' in df.columns:
+            comments = df['Comment'].to_numpy()
+        else:
+            comments = AnnotationEngine().evaluate(df)
+        
+        steam_values = df['Steam Subscribers'].to_numpy() if 'Steam Subscribers' in df.columns else None
+        reddit_values = df['Reddit Mentions'].to_numpy() if 'Reddit Mentions' in df.columns else None
+        dates = df['Date'].to_numpy() if 'Date' in df.columns else []
+        for i, date in enumerate(dates):
+            steam = f"{int(steam_values[i]):,}" if steam_values is not None else "0"
+            reddit = int(reddit_values[i]) if reddit_values is not None else 0
+            print(f"{date:<12} {steam:<15} {reddit:<10} {comments[i]}")
         
         print("-"*80)
-        if "Reddit Mentions" in df.columns:
+        if mention_stats is not None:
             print("Statistics:")
-            print(f"   Average: {avg_mentions:.1f} mentions/day")
-            print(f"   Maximum: {max_mentions} mentions")
-            print(f"   Minimum: {min_mentions} mentions")
-            print(f"   Total mentions: {df['Reddit Mentions'].sum()}")
+            print(f"   Average: {mention_stats['mean']:.1f} mentions/day")
+            print(f"   Maximum: {mention_stats['max']} mentions")
+            print(f"   Minimum: {mention_stats['min']} mentions")
+            print(f"   Total mentions: {mention_stats['total']}")
         print("="*80)
     
     @staticmethod
@@ -82,12 +80,91 @@ class Reporter:
         print("="*50)
     
     @staticmethod
-    def save_formatted_csv(df: pd.DataFrame, filename: str = "output.csv", days: int = 30, game_name: str = None):
+    def print_batch_summary(batch: CombinedBatch):
+        """@brief Print one summary line per game of a batch
+        @details Statistics of all games are computed column-wise in one pass
+        @param batch Combined data of many games
+        """
+        if len(batch) == 0:
+            return
+        
+        print("\n" + "="*80)
+        print(f"BATCH SUMMARY ({len(batch)} games, last {batch.length} days)")
+        print("="*80)
+        print(f"{'Game':<30} {'Steam':<15} {'Mentions':<10} {'Avg/day':<10} {'Max/day'}")
+        print("-"*80)
+        
+        steam = (batch.values("Steam Subscribers")[:, -1] if "Steam Subscribers" in batch.column_names
+                 else np.zeros(len(batch), dtype=np.int64))
+        if "Reddit Mentions" in batch.column_names:
+            mentions = batch.statistics("Reddit Mentions")
+        else:
+            zeros = np.zeros(len(batch), dtype=np.int64)
+            mentions = {"total": zeros, "average_daily": zeros, "max_daily": zeros}
+        for game, latest, total, average, maximum in zip(batch.games, steam.tolist(), mentions["total"].tolist(),
+                                                         mentions["average_daily"].tolist(),
+                                                         mentions["max_daily"].tolist()):
+            print(f"{game[:30]:<30} {latest:<15,} {total:<10} {average:<10.1f} {maximum}")
+        print("="*80)
+    
+    @staticmethod
+    def save_batch_csv(batch: CombinedBatch, filename: str, block_size: int = 100):
+        """@brief Save a batch as one long-format CSV file
+        @details Rows are Game, Date, value columns and Comment. Games are
+                 formatted and written block_size at a time, so memory use
+                 does not grow with the number of games.
+        @param batch Combined data of many games
+        @param filename Output filename
+        @param block_size Number of games formatted and written at a time
+        """
+        dates = batch.dates().tolist()
+        labels = [""] + batch.labels
+        header = ",".join(["Game", "Date"] + batch.column_names + ["Comment"])
+        with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+            f.write(header + "\n")
+            for start in range(0, len(batch), block_size):
+                stop = min(start + block_size, len(batch))
+                columns = [batch.values(column)[start:stop].tolist() for column in batch.column_names]
+                codes = batch.comment_codes()[start:stop].tolist()
+                lines = []
+                for offset, game in enumerate(batch.games[start:stop]):
+                    name = '"' + game.replace('"', '""') + '"' if any(c in game for c in ',"\n') else game
+                    game_values = [values[offset] for values in columns]
+                    for day, date in enumerate(dates):
+                        fields = [str(values[day]) for values in game_values]
+                        lines.append(f"{name},{date},{','.join(fields)},{labels[codes[offset][day]]}\n")
+                f.write("".join(lines))
+        print(f"Batch data saved to {filename}")
+    
+    @staticmethod
+    def print_anomalies(events: List[AnomalyEvent]):
+        """@brief Print anomalies found by the streaming detectors
+        @param events Detected events (nothing is printed if empty)
+        """
+        if not events:
+            return
+        
+        print("\n" + "="*80)
+        print("ANOMALIES")
+        print("="*80)
+        print(f"{'Date':<12} {'Series':<30} {'Value':<8} {'Expected':<10} {'Score':<8} {'Detector'}")
+        print("-"*80)
+        for event in sorted(events, key=lambda e: (e.date, e.key, e.detector)):
+            label = f"{event.kind} ({event.detector})"
+            print(f"{event.date:<12} {event.key[:30]:<30} {event.value:<8} {event.baseline:<10.1f} "
+                  f"{event.score:<+8.1f} {label}")
+        print("="*80)
+    
+    @staticmethod
+    def save_formatted_csv(df: pd.DataFrame, filename: str = "output.csv", days: int = 30, game_name: str = None,
+                           data_filename: Optional[str] = "data.csv", block_size: int = 1000):
         """@brief Save data to formatted CSV file
         @param df DataFrame containing data to save
         @param filename Output filename
         @param days Number of days analyzed
         @param game_name Name of the game being analyzed
+        @param data_filename Filename for the standard CSV copy of the data (None to skip it)
+        @param block_size Number of rows formatted and written at a time
         """
         if game_name is None:
             game_name = GAME_NAME
@@ -116,29 +193,14 @@ class Reporter:
         
         separator = "-" * len(header_line)
         
-        # Create data rows
-        data_lines = []
-        for _, row in df.iterrows():
-            date = row['Date']
-            steam = f"{int(row['Steam Subscribers']):,}" if 'Steam Subscribers' in row else "0"
-            reddit = int(row['Reddit Mentions']) if 'Reddit Mentions' in row else 0
-            comment = row.get('Comment', '')
-            
-            line = (
-                f"{date:<{date_width}} "
-                f"{steam:<{steam_width}} "
-                f"{reddit:<{reddit_width}} "
-                f"{comment:<{comment_width}}"
-            )
-            data_lines.append(line)
-        
         # Create statistics
         if "Reddit Mentions" in df.columns:
+            mention_stats = AnnotationEngine.compute_stats(df['Reddit Mentions'].to_numpy())
             stats = {
-                "avg": df['Reddit Mentions'].mean(),
-                "max": df['Reddit Mentions'].max(),
-                "min": df['Reddit Mentions'].min(),
-                "total": df['Reddit Mentions'].sum()
+                "avg": mention_stats["mean"],
+                "max": mention_stats["max"],
+                "min": mention_stats["min"],
+                "total": mention_stats["total"]
             }
             
             stats_lines = [
@@ -153,14 +215,15 @@ class Reporter:
         else:
             stats_lines = ["", "Data saved successfully"]
         
-        # Save to CSV
+        # Save to CSV, data rows are formatted and written block by block
+        widths = (date_width, steam_width, reddit_width, comment_width)
         with open(filename, 'w', encoding='utf-8-sig') as f:
             f.write(f"{game_name.upper()} POPULARITY ANALYSIS\n")
             f.write("=" * 60 + "\n")
             f.write(header_line + "\n")
             f.write(separator + "\n")
-            for line in data_lines:
-                f.write(line + "\n")
+            for block in Reporter._format_row_blocks(df, widths, block_size):
+                f.write(block)
             f.write(separator + "\n")
             for line in stats_lines:
                 f.write(line + "\n")
@@ -169,5 +232,37 @@ class Reporter:
         print(f"\nFormatted table saved to {filename}")
         
         # Also save standard CSV for compatibility
-        df.to_csv("data.csv", index=False, encoding='utf-8-sig')
-        print("Standard data saved to data.csv")
\ No newline at end of file
+        if data_filename:
+            df.to_csv(data_filename, index=False, encoding='utf-8-sig', chunksize=block_size)
+            print(f"Standard data saved to {data_filename}")
+    
+    @staticmethod
+    def _format_row_blocks(df: pd.DataFrame, widths: Tuple[int, int, int, int],
+                           block_size: int = 1000) -> Iterator[str]:
+        """@brief Format data rows as fixed-width text in blocks
+        @param df DataFrame containing data to format
+        @param widths Widths of the date, steam, reddit and comment columns
+        @param block_size Number of rows per block
+        @return Generator of text blocks, each holding block_size newline-terminated rows
+        @retval Iterator[str] Formatted row blocks
+        """
+        date_width, steam_width, reddit_width, comment_width = widths
+        count = len(df)
+        if count == 0 or 'Date' not in df.columns:
+            return
+        dates = df['Date'].astype(str).to_numpy()
+        steam_values = df['Steam Subscribers'].to_numpy() if 'Steam Subscribers' in df.columns else None
+        reddit_values = df['Reddit Mentions'].to_numpy() if 'Reddit Mentions' in df.columns else None
+        comments = df['Comment'].to_numpy() if 'Comment' in df.columns else None
+        
+        for start in range(0, count, block_size):
+            stop = min(start + block_size, count)
+            steam = ([f"{int(v):,}" for v in steam_values[start:stop]] if steam_values is not None
+                     else ["0"] * (stop - start))
+            reddit = (reddit_values[start:stop].astype(np.int64).tolist() if reddit_values is not None
+                      else [0] * (stop - start))
+            comment = comments[start:stop].tolist() if comments is not None else [""] * (stop - start)
+            yield "".join(
+                f"{d:<{date_width}} {st:<{steam_width}} {r:<{reddit_width}} {c:<{comment_width}}\n"
+                for d, st, r, c in zip(dates[start:stop], steam, reddit, comment)
+            )
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""Interval scheduler for daemon mode"""
+import heapq
+import random
+import threading
+import time
+from typing import Callable, List, Optional
+from models.metrics import metrics
+
+class ScheduledJob:
+    """@brief Job run periodically by the scheduler"""
+    
+    __slots__ = ("name", "func", "runs", "failures")
+    
+    def __init__(self, name: str, func: Callable[[], object]):
+        """@brief Initialize the job
+        @param name Job name used in log messages
+        @param func Function run on every tick
+        """
+        ## @brief Job name
+        self.name = name
+        
+        ## @brief Function run on every tick
+        self.func = func
+        
+        ## @brief Number of completed runs
+        self.runs = 0
+        
+        ## @brief Number of runs that raised an exception
+        self.failures = 0
+
+class Scheduler:
+    """@brief Runs jobs on a fixed interval in staggered slots
+    @details With N jobs and interval T, job i first runs at i * T / N after
+             start and then every T seconds (plus a random jitter), so the
+             load on upstream APIs is spread over the whole interval instead
+             of spiking at the start of each cycle. Jobs run one at a time in
+             the calling thread; a job that overruns delays the next ones
+             without skipping them.
+    """
+    
+    def __init__(self, interval: float, jitter: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic, seed: Optional[int] = None):
+        """@brief Initialize the scheduler
+        @param interval Time between two runs of the same job in seconds
+        @param jitter Maximum random shift of every run in seconds
+        @param clock Monotonic clock function
+        @param seed Random seed for the jitter (optional)
+        """
+        if interval <= 0:
+            raise ValueError("Scheduler interval must be positive")
+        
+        ## @brief Time between two runs of the same job in seconds
+        self.interval = interval
+        
+        ## @brief Maximum random shift of every run in seconds
+        self.jitter = jitter
+        
+        ## @brief Registered jobs
+        self.jobs: List[ScheduledJob] = []
+        
+        ## @brief Event that stops run() when set
+        self.stop_event = threading.Event()
+        
+        self._clock = clock
+        self._random = random.Random(seed)
+    
+    def add_job(self, name: str, func: Callable[[], object]) -> ScheduledJob:
+        """@brief Register a job
+        @param name Job name
+        @param func Function run on every tick
+        @return Registered job
+        @retval ScheduledJob Job handle
+        """
+        job = ScheduledJob(name, func)
+        self.jobs.append(job)
+        return job
+    
+    def stop(self):
+        """@brief Ask run() to return after the current job"""
+        self.stop_event.set()
+    
+    def _shift(self) -> float:
+        """@brief Draw a random jitter
+        @return Shift in seconds within [-jitter, +jitter]
+        @retval float Jitter
+        """
+        return self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+    
+    def run(self, max_cycles: Optional[int] = None):
+        """@brief Run jobs until stopped
+        @param max_cycles Stop after every job ran this many times (runs forever if None)
+        """
+        if not self.jobs:
+            return
+        
+        start = self._clock()
+        slot = self.interval / len(self.jobs)
+        queue = []
+        for index, job in enumerate(self.jobs):
+            base = start + index * slot
+            # The first slot starts immediately, jitter only delays the others
+            due = base + (abs(self._shift()) if index else 0.0)
+            heapq.heappush(queue, (due, index, base, job))
+        
+        while queue and not self.stop_event.is_set():
+            due, index, base, job = heapq.heappop(queue)
+            delay = due - self._clock()
+            if delay > 0 and self.stop_event.wait(delay):
+                break
+            
+            try:
+                with metrics.stage("cycle"):
+                    job.func()
+            except Exception as e:
+                job.failures += 1
+                metrics.incr("errors", stage="cycle")
+                print(f"[Scheduler] Job {job.name} failed: {e}")
+            job.runs += 1
+            
+            if max_cycles is not None and job.runs >= max_cycles:
+                continue
+            # Stay on the slot grid so jitter does not accumulate; overruns run as soon as possible
+            base += self.interval
+            heapq.heappush(queue, (max(base + self._shift(), self._clock()), index, base, job))
\ No newline at end of file
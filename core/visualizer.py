@@ -1,31 +1,61 @@
 """Data visualization"""
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PathCollection
+from matplotlib.figure import Figure
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D
+from typing import Dict, Tuple
 
 class Visualizer:
     """@brief Data visualizer for creating plots and charts
-    @details Handles creation of visual representations of the analyzed data
+    @details Handles creation of visual representations of the analyzed data.
+             Figures are drawn with the non-interactive Agg canvas and never
+             registered with pyplot, so nothing is kept alive between plots.
     """
     
+    ## @brief Figure reused by fast renders
+    _figure = None
+    
+    ## @brief Glyph paths of annotation labels, keyed by label text
+    _label_paths = {}
+    
     @staticmethod
-    def create_plot(df: pd.DataFrame, game_name: str = "Counter-Strike 2", filename: str = "plot.png"):
+    def create_plot(df: pd.DataFrame, game_name: str = "Counter-Strike 2", filename: str = "plot.png",
+                    fast: bool = False, max_points: int = 1000, dpi: int = None):
         """@brief Create plot with dual axes showing Steam subscribers and Reddit mentions
+        @details The fast mode renders at a lower resolution, reuses one figure,
+                 draws all annotations as a single collection and decimates
+                 histories longer than max_points. The input DataFrame is never modified.
         @param df DataFrame containing data to plot
         @param game_name Name of the game being analyzed
         @param filename Output filename for the plot
+        @param fast Use the fast rendering mode
+        @param max_points Maximum number of plotted days in fast mode
+        @param dpi Output resolution (300 by default, 100 in fast mode)
         """
         if 'Date' not in df.columns:
             print("No data for plotting")
             return
-            
-        df['Date'] = pd.to_datetime(df['Date'])
+        
+        dates = pd.to_datetime(df['Date']).to_numpy()
+        columns = {
+            column: df[column].to_numpy()
+            for column in ('Steam Subscribers', 'Reddit Mentions') if column in df.columns
+        }
+        if fast and len(dates) > max_points:
+            dates, columns = Visualizer._decimate(dates, columns, max_points)
         
         # Create figure and axes
-        fig, ax1 = plt.subplots(figsize=(14, 7))
+        fig = Visualizer._get_figure(fast)
+        ax1 = fig.add_subplot()
         
         # Main line - Steam subscribers
-        if 'Steam Subscribers' in df.columns:
-            ax1.plot(df['Date'], df['Steam Subscribers'], 
+        if 'Steam Subscribers' in columns:
+            steam_values = columns['Steam Subscribers']
+            ax1.plot(dates, steam_values, 
                      label="Steam Subscribers", color="blue", linewidth=2)
             ax1.set_ylabel("Steam Subscribers", color="blue")
             ax1.tick_params(axis='y', labelcolor="blue")
@@ -34,7 +64,6 @@ class Visualizer:
             ax1.yaxis.set_major_formatter(lambda x, pos: f"{int(x):,}")
             
             # Set fixed range for Y axis of subscribers
-            steam_values = df['Steam Subscribers']
             min_val = steam_values.min()
             max_val = steam_values.max()
             margin = (max_val - min_val) * 0.1 if max_val != min_val else 1000000
@@ -42,26 +71,109 @@ class Visualizer:
         
         # Second axis - Reddit mentions
         ax2 = ax1.twinx()
-        if 'Reddit Mentions' in df.columns:
-            scatter = ax2.scatter(df['Date'], df['Reddit Mentions'], 
-                                 label="Reddit Mentions", color="red", s=60, alpha=0.7)
+        if 'Reddit Mentions' in columns:
+            reddit_values = columns['Reddit Mentions']
+            ax2.scatter(dates, reddit_values, 
+                        label="Reddit Mentions", color="red", s=60, alpha=0.7)
             
-            # Add annotations for Reddit mentions
-            for _, row in df.iterrows():
-                if row['Reddit Mentions'] > 0:  # Only for non-zero values
-                    ax2.annotate(str(row['Reddit Mentions']), 
-                                (row['Date'], row['Reddit Mentions']),
-                                xytext=(5, 5), textcoords='offset points',
-                                fontsize=8, alpha=0.7)
+            # Add annotations for Reddit mentions, only for non-zero values
+            nonzero = reddit_values > 0
+            if fast:
+                Visualizer._add_annotation_collection(fig, ax2, dates[nonzero], reddit_values[nonzero])
+            else:
+                for date, value in zip(dates[nonzero], reddit_values[nonzero]):
+                    ax2.annotate(str(value), (date, value),
+                                 xytext=(5, 5), textcoords='offset points',
+                                 fontsize=8, alpha=0.7)
             
             ax2.set_ylabel("Reddit Mentions", color="red")
             ax2.tick_params(axis='y', labelcolor="red")
         
         # Plot settings
-        plt.title(f"Data dynamics of subscribers and mentions for game {game_name}", fontsize=16)
+        ax2.set_title(f"Data dynamics of subscribers and mentions for game {game_name}", fontsize=16)
         fig.legend(loc="upper right", bbox_to_anchor=(0.85, 0.85), fontsize=12)
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45, fontsize=10)
-        plt.tight_layout()
-        plt.savefig(filename, dpi=300)
-        print(f"Plot saved to {filename}")
\ No newline at end of file
+        ax2.grid(True, alpha=0.3)
+        ax1.tick_params(axis='x', labelrotation=45, labelsize=10)
+        fig.tight_layout()
+        fig.savefig(filename, dpi=dpi or (100 if fast else 300))
+        
+        # Release the artists, the fast figure itself is kept for the next plot
+        fig.clear()
+        print(f"Plot saved to {filename}")
+    
+    @staticmethod
+    def close():
+        """@brief Release the figure reused by fast renders"""
+        if Visualizer._figure is not None:
+            Visualizer._figure.clear()
+        Visualizer._figure = None
+    
+    @staticmethod
+    def _get_figure(fast: bool) -> Figure:
+        """@brief Get a figure attached to the Agg canvas
+        @param fast Reuse the shared figure of fast renders
+        @return Empty figure
+        @retval Figure Figure to draw on
+        """
+        if not fast:
+            fig = Figure(figsize=(14, 7))
+            FigureCanvasAgg(fig)
+            return fig
+        
+        if Visualizer._figure is None:
+            Visualizer._figure = Figure(figsize=(14, 7))
+            FigureCanvasAgg(Visualizer._figure)
+        return Visualizer._figure
+    
+    @staticmethod
+    def _decimate(dates: np.ndarray, columns: Dict[str, np.ndarray],
+                  max_points: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """@brief Reduce a long history to at most max_points buckets
+        @details Each bucket keeps its first date, the last Steam value and the
+                 maximum Reddit value so that spikes stay visible.
+        @param dates Dates of the rows
+        @param columns Values per column
+        @param max_points Maximum number of buckets
+        @return Decimated dates and columns
+        @retval Tuple[np.ndarray, Dict[str, np.ndarray]] Bucketed data
+        """
+        starts = np.linspace(0, len(dates), max_points, endpoint=False).astype(np.int64)
+        starts = np.unique(starts)
+        ends = np.append(starts[1:], len(dates)) - 1
+        decimated = {}
+        for column, values in columns.items():
+            if column == 'Reddit Mentions':
+                decimated[column] = np.maximum.reduceat(values, starts)
+            else:
+                decimated[column] = values[ends]
+        return dates[starts], decimated
+    
+    @staticmethod
+    def _add_annotation_collection(fig: Figure, ax, dates: np.ndarray, values: np.ndarray):
+        """@brief Draw value labels as one path collection
+        @details Each label is a cached text path offset by (5, 5) points from its data point
+        @param fig Figure being drawn
+        @param ax Axes holding the data points
+        @param dates Dates of the labelled points
+        @param values Values (and label texts) of the labelled points
+        """
+        if len(values) == 0:
+            return
+        
+        paths = []
+        for value in values.tolist():
+            label = str(value)
+            path = Visualizer._label_paths.get(label)
+            if path is None:
+                path = TextPath((5, 5), label, size=8)
+                Visualizer._label_paths[label] = path
+            paths.append(path)
+        
+        # Glyphs are defined in points, offsets in data coordinates
+        offsets = np.column_stack([mdates.date2num(dates), values.astype(float)])
+        collection = PathCollection(
+            paths, offsets=offsets, offset_transform=ax.transData,
+            transform=Affine2D().scale(1 / 72) + fig.dpi_scale_trans,
+            facecolors="black", edgecolors="none", alpha=0.7
+        )
+        ax.add_collection(collection, autolim=False)
\ No newline at end of file
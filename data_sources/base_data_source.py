@@ -1,8 +1,13 @@
 """Base class for data sources"""
+from __future__ import annotations
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta, timezone
-from typing import Dict, Any
-import pandas as pd
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, TYPE_CHECKING
+from models.time_series import DailySeries, epoch_day
+from models.rollups import SeriesRollup, SlidingWindow, RollupLevel
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class BaseDataSource(ABC):
     """@brief Abstract base class for data sources
@@ -10,6 +15,9 @@ class BaseDataSource(ABC):
              Provides common functionality for date handling.
     """
     
+    ## @brief Name of the value column produced by format_data (None if not a single series)
+    column: Optional[str] = None
+    
     def __init__(self, name: str, days: int = 30):
         """@brief Initialize the data source
         @param name Name of the data source
@@ -21,8 +29,68 @@ class BaseDataSource(ABC):
         ## @brief Number of days to analyze
         self.days = days
         
-        ## @brief Data storage dictionary
-        self.data = {}
+        self._series: Optional[DailySeries] = None
+        self._rollup: Optional[SeriesRollup] = None
+        self._closed: Optional[SlidingWindow] = None
+        self._closed_end = 0
+        
+        ## @brief Response cache (optional)
+        self.cache = None
+    
+    @property
+    def series(self) -> Optional[DailySeries]:
+        """@brief Columnar daily values of the source
+        @return Series of the last fetch
+        @retval Optional[DailySeries] Daily values (None if nothing was fetched)
+        """
+        return self._series
+    
+    @series.setter
+    def series(self, series: Optional[DailySeries]):
+        """@brief Store the series of a fetch and update the aggregates
+        @details The rollup and the sliding window of closed days persist
+                 across fetches, only the days that changed or closed since
+                 the previous fetch are folded in
+        @param series Daily values (None to clear the series)
+        """
+        self._series = series
+        if series is None or len(series) == 0:
+            return
+        if self._rollup is None:
+            self._rollup = SeriesRollup(series.start_day, series.values)
+            changed = self._rollup.start_day
+        else:
+            changed = self._rollup.update(series.start_day, series.values)
+        self._close_days(changed)
+    
+    @property
+    def data(self) -> Dict[str, int]:
+        """@brief Daily values as a dictionary
+        @details Compatibility view over series, keyed by YYYY-MM-DD date
+        @return Values keyed by date string
+        @retval Dict[str, int] Daily values (empty if nothing was fetched)
+        """
+        return self.series.to_dict() if self.series is not None else {}
+    
+    @data.setter
+    def data(self, values: Dict[str, int]):
+        """@brief Store daily values given as a dictionary
+        @param values Values keyed by YYYY-MM-DD date
+        """
+        self.series = DailySeries.from_dict(values) if values else None
+    
+    def has_data(self) -> bool:
+        """@brief Check whether the source holds any values
+        @return True if data was fetched
+        @retval bool Data availability
+        """
+        return self.series is not None and len(self.series) > 0
+    
+    def set_cache(self, cache):
+        """@brief Attach a response cache to the data source
+        @param cache ResponseCache instance shared between sources
+        """
+        self.cache = cache
     
     @abstractmethod
     def fetch_data(self, **kwargs) -> Dict[str, Any]:
@@ -49,14 +117,89 @@ class BaseDataSource(ABC):
         """
         pass
     
+    def window_start_day(self) -> int:
+        """@brief Get the first day of the analysis period
+        @return Day ordinal of the oldest analyzed day
+        @retval int Day ordinal
+        """
+        return epoch_day(datetime.now(timezone.utc).date()) - self.days + 1
+    
+    def window_statistics(self, window: Optional[int] = None) -> Dict[str, Any]:
+        """@brief Summarize the most recent days of the series
+        @details The analysis period combines the sliding window of closed
+                 days with today's value, other windows are answered by the
+                 rollup. Neither depends on the window length.
+        @param window Number of days ending today (the analysis period if None)
+        @return Dictionary with total, average_daily, max_daily and min_daily
+        @retval Dict[str, Any] Window statistics
+        """
+        window = self.days if window is None else window
+        today = self.window_start_day() + self.days - 1
+        if self._rollup is None:
+            return {"total": 0, "average_daily": 0, "max_daily": 0, "min_daily": 0}
+        if window != self.days or self._closed is None or self._closed_end != today:
+            return self._rollup.statistics(today + 1 - window, window)
+        
+        closed = self._closed.statistics()
+        current = self._rollup.statistics(today, 1)
+        total = closed["total"] + current["total"]
+        return {
+            "total": total,
+            "average_daily": total / window,
+            "max_daily": max(closed["max_daily"], current["max_daily"]),
+            "min_daily": min(closed["min_daily"], current["min_daily"])
+        }
+    
+    def rollup(self, resolution: str) -> RollupLevel:
+        """@brief Get daily, weekly or monthly aggregates of every fetched day
+        @param resolution "daily", "weekly" or "monthly"
+        @return Buckets of the whole fetched history
+        @retval RollupLevel Rollup level
+        @exception ValueError If nothing was fetched or the resolution is unknown
+        """
+        if self._rollup is None:
+            raise ValueError(f"{self.name} has no data")
+        return self._rollup.level(resolution)
+    
+    def _close_days(self, changed: int):
+        """@brief Push the days closed since the previous fetch into the sliding window
+        @details The window covers the analysis period without today. It is
+                 rebuilt only when a day it already holds changed or the
+                 period moved by more than its length.
+        @param changed Day ordinal of the first day the last update changed
+        """
+        length = self.days - 1
+        today = self.window_start_day() + length
+        if length <= 0:
+            return
+        if (self._closed is None or self._closed.length != length or changed < self._closed_end
+                or self._closed_end < today - length):
+            self._closed = SlidingWindow(length)
+            self._closed_end = today - length
+        if self._closed_end < today:
+            rollup = DailySeries(self._rollup.start_day, self._rollup.values)
+            self._closed.extend(rollup.window(self._closed_end, today - self._closed_end).values.tolist())
+            self._closed_end = today
+    
     def get_common_dates(self) -> list:
         """@brief Get list of dates for analysis period
         @return List of date strings in YYYY-MM-DD format
         @retval list[str] Dates for analysis
         """
-        end_time = datetime.now(timezone.utc).date()
-        dates = [(end_time - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(self.days)]
-        return sorted(dates)
+        return DailySeries.zeros(self.window_start_day(), self.days).dates().tolist()
+    
+    def format_series(self, column: str) -> pd.DataFrame:
+        """@brief Format the analysis period of the series into a DataFrame
+        @details The values column is a view of the stored series, no per-row objects are built
+        @param column Name of the value column
+        @return DataFrame with Date and value columns (empty if nothing was fetched)
+        @retval pd.DataFrame Formatted data
+        """
+        if not self.has_data():
+            import pandas as pd
+            
+            return pd.DataFrame()
+        return self.series.window(self.window_start_day(), self.days).to_frame(column)
     
     def __str__(self):
         """@brief String representation of the object
@@ -0,0 +1,192 @@
+"""Shared HTTP client for API data sources"""
+from __future__ import annotations
+import time
+import random
+import threading
+from typing import Dict, Any, Optional, TYPE_CHECKING
+from models.metrics import metrics
+
+if TYPE_CHECKING:
+    import requests
+
+## @brief Status codes that are retried (rate limited or temporary server errors)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+class TokenBucket:
+    """@brief Thread-safe token bucket rate limiter
+    @details Tokens refill continuously at rate per second up to capacity.
+             A caller that finds the bucket empty reserves its token anyway
+             (the balance goes negative) and sleeps until it is due, so
+             concurrent callers are served in arrival order at exactly the
+             configured rate.
+    """
+    
+    def __init__(self, rate: float, capacity: float = 1.0, clock=time.monotonic, sleep=time.sleep):
+        """@brief Initialize a full bucket
+        @param rate Tokens added per second
+        @param capacity Maximum number of stored tokens (burst size)
+        @param clock Monotonic time function
+        @param sleep Sleep function
+        """
+        ## @brief Tokens added per second
+        self.rate = rate
+        
+        ## @brief Maximum number of stored tokens
+        self.capacity = capacity
+        
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def acquire(self, tokens: float = 1.0) -> float:
+        """@brief Take tokens, waiting until they are available
+        @param tokens Number of tokens to take
+        @return Time spent waiting in seconds
+        @retval float Wait time
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+class HttpClient:
+    """@brief Pooled, rate-limited HTTP client with retries
+    @details Wraps one requests session whose connection pool is shared by all
+             threads, so lookups reuse keep-alive connections. Every request
+             can name a rate limit; requests with the same limit share one
+             token bucket. Connection errors, timeouts, 429 and 5xx responses
+             are retried with exponential backoff and full jitter, honouring
+             Retry-After. Responses are requested gzip-compressed.
+    """
+    
+    def __init__(self, session: requests.Session = None, rate_limits: Optional[Dict[str, float]] = None,
+                 retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0,
+                 pool_size: int = 10, timeout: float = 10.0, seed: Optional[int] = None):
+        """@brief Initialize the client
+        @param session Existing session to use (a pooled one is created on first use otherwise)
+        @param rate_limits Allowed requests per second, keyed by rate limit name
+        @param retries Number of retries after the first attempt
+        @param backoff Base delay of the first retry in seconds
+        @param max_backoff Upper bound of a single delay in seconds
+        @param pool_size Number of kept-alive connections per host
+        @param timeout Default request timeout in seconds
+        @param seed Seed for the backoff jitter (random if None)
+        """
+        ## @brief Token buckets keyed by rate limit name
+        self.limiters = {name: TokenBucket(rate) for name, rate in (rate_limits or {}).items()}
+        
+        ## @brief Number of retries after the first attempt
+        self.retries = retries
+        
+        ## @brief Base delay of the first retry in seconds
+        self.backoff = backoff
+        
+        ## @brief Upper bound of a single delay in seconds
+        self.max_backoff = max_backoff
+        
+        ## @brief Number of kept-alive connections per host
+        self.pool_size = pool_size
+        
+        ## @brief Default request timeout in seconds
+        self.timeout = timeout
+        
+        self._session = session
+        self._owns_session = session is None
+        self._session_lock = threading.Lock()
+        self._random = random.Random(seed)
+    
+    @property
+    def session(self) -> requests.Session:
+        """@brief Get the underlying session, creating a pooled one on first use
+        @return HTTP session
+        @retval requests.Session Shared session
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    session.headers["Accept-Encoding"] = "gzip, deflate"
+                    self._session = session
+        return self._session
+    
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, limit: Optional[str] = None,
+            timeout: Optional[float] = None, source: str = "http") -> requests.Response:
+        """@brief Send a GET request with rate limiting and retries
+        @param url Request URL
+        @param params Query parameters
+        @param limit Name of the rate limit to apply (unlimited if unknown or None)
+        @param timeout Request timeout in seconds (client default if None)
+        @param source Source name used in log messages and metrics (bytes received are counted per attempt)
+        @return Last response; retryable statuses are returned once retries are exhausted
+        @retval requests.Response HTTP response
+        @exception requests.RequestException If the last attempt fails with a connection error or timeout
+        """
+        import requests
+        
+        limiter = self.limiters.get(limit) if limit else None
+        for attempt in range(self.retries + 1):
+            if limiter is not None:
+                limiter.acquire()
+            
+            retry_after = None
+            try:
+                response = self.session.get(url, params=params, timeout=timeout or self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.retries:
+                    raise
+                reason = str(e)
+            else:
+                metrics.incr("bytes", len(response.content), source=source)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+                retry_after = self._retry_after(response)
+            
+            delay = self._backoff_delay(attempt, retry_after)
+            print(f"[{source}] {reason}, retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+            metrics.incr("retries", source=source)
+            time.sleep(delay)
+    
+    def close(self):
+        """@brief Close the session if it was created by the client"""
+        if self._owns_session and self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """@brief Get the delay before a retry
+        @param attempt Number of the failed attempt (0 for the first request)
+        @param retry_after Delay requested by the server in seconds
+        @return Random delay between 0 and the exponential bound, at least retry_after
+        @retval float Delay in seconds
+        """
+        delay = self._random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """@brief Read the Retry-After header
+        @param response HTTP response
+        @return Requested delay in seconds (None if missing or given as a date)
+        @retval Optional[float] Delay in seconds
+        """
+        try:
+            return float(response.headers["Retry-After"])
+        except (KeyError, ValueError):
+            return None
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""Multi-game title matcher"""
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Tuple
+import numpy as np
+from data_sources.steam_catalog import normalize_name
+
+class MentionMatcher:
+    """@brief Aho-Corasick automaton over the names and aliases of all tracked games
+    @details Titles and patterns are normalized with normalize_name() and
+             padded with spaces, so a pattern only matches whole words
+             ("cs2" does not match "cs20"). The automaton is compiled into a
+             complete transition table (one dict per state over the normalized
+             alphabet), so matching a title costs one dict lookup per
+             character however many games and aliases are tracked. The
+             automaton is rebuilt lazily after games are added.
+    """
+    
+    def __init__(self):
+        """@brief Initialize an empty matcher"""
+        ## @brief Tracked game names, indexed by game number
+        self.games: List[str] = []
+        
+        self._game_numbers: Dict[str, int] = {}
+        self._patterns: Dict[str, set] = {}
+        self._delta = None
+        self._outputs = None
+    
+    def add_game(self, game_name: str, aliases: Iterable[str] = ()) -> int:
+        """@brief Track a game under its name and aliases
+        @details Adding a known game again only adds new aliases
+        @param game_name Name of the game
+        @param aliases Other names of the game (abbreviations, old titles)
+        @return Game number
+        @retval int Index into games
+        """
+        number = self._game_numbers.get(game_name)
+        if number is None:
+            number = len(self.games)
+            self.games.append(game_name)
+            self._game_numbers[game_name] = number
+        for name in [game_name, *aliases]:
+            pattern = normalize_name(name)
+            if pattern and number not in self._patterns.setdefault(pattern, set()):
+                self._patterns[pattern].add(number)
+                self._delta = None
+        return number
+    
+    def game_number(self, game_name: str) -> int:
+        """@brief Get the number of a tracked game
+        @param game_name Name of the game
+        @return Game number
+        @retval int Index into games
+        @exception KeyError If the game is not tracked
+        """
+        return self._game_numbers[game_name]
+    
+    def match(self, title: str) -> List[int]:
+        """@brief Find the games mentioned in a title
+        @param title Post title
+        @return Numbers of the mentioned games, each listed once
+        @retval List[int] Game numbers
+        """
+        if self._delta is None:
+            self._build()
+        delta, outputs = self._delta, self._outputs
+        state = 0
+        found = set()
+        for char in f" {normalize_name(title)} ":
+            state = delta[state][char]
+            if outputs[state]:
+                found.update(outputs[state])
+        return sorted(found)
+    
+    def match_many(self, titles: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """@brief Find the games mentioned in many titles
+        @param titles Post titles
+        @return Title index and game number of every (title, game) hit
+        @retval Tuple[np.ndarray, np.ndarray] Parallel int64 arrays
+        """
+        posts, games = [], []
+        for index, title in enumerate(titles):
+            for number in self.match(title):
+                posts.append(index)
+                games.append(number)
+        return np.array(posts, dtype=np.int64), np.array(games, dtype=np.int64)
+    
+    def _build(self):
+        """@brief Compile the patterns into a complete transition table
+        @details Builds the trie, then fills missing transitions and merges
+                 outputs along failure links in breadth-first order
+        """
+        alphabet = " 0123456789abcdefghijklmnopqrstuvwxyz"
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[set] = [set()]
+        for pattern, numbers in self._patterns.items():
+            state = 0
+            for char in f" {pattern} ":
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    outputs.append(set())
+                state = following
+            outputs[state] |= numbers
+        
+        delta: List[Dict[str, int]] = [dict.fromkeys(alphabet, 0) for _ in goto]
+        fail = [0] * len(goto)
+        queue = deque()
+        for char, state in goto[0].items():
+            delta[0][char] = state
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            outputs[state] |= outputs[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for char, following in goto[state].items():
+                fail[following] = delta[fail[state]][char] if state else 0
+                delta[state][char] = following
+                queue.append(following)
+        
+        self._delta = delta
+        self._outputs = [tuple(numbers) for numbers in outputs]
\ No newline at end of file
@@ -0,0 +1,277 @@
+"""Append-only columnar archive of raw Reddit posts"""
+import os
+import json
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Union
+import numpy as np
+from models.time_series import DailySeries, SECONDS_PER_DAY
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+## @brief Archived columns and their fixed-width on-disk types
+POST_COLUMNS = {
+    "id": np.dtype("<i8"),
+    "created_utc": np.dtype("<f8"),
+    "subreddit": np.dtype("<u4"),
+    "score": np.dtype("<i4"),
+    "num_comments": np.dtype("<i4"),
+    "game": np.dtype("<u4")
+}
+
+class PostArchive:
+    """@brief Append-only on-disk archive of raw post fields
+    @details Every column is a file of fixed-width little-endian values
+             (<column>.bin), so any column can be memory-mapped and scanned
+             without parsing or copying. Post ids are stored as base36
+             integers; subreddit and game names are stored as codes into
+             string tables kept in names.json. A post that mentions several
+             games is stored once per game. Columns are appended one after
+             another; if a process stops between two columns, the rows past
+             the shortest column are ignored and overwritten by the next
+             append, so readers never see a partial row. Backfill workers
+             and the daemon may share one archive: appends hold an
+             exclusive lock on archive.lock, and names.json is read again
+             whenever another process replaced it.
+    """
+    
+    def __init__(self, directory: str):
+        """@brief Open (or create) the archive
+        @param directory Directory for the column files and string tables
+        """
+        ## @brief Directory for the column files and string tables
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._lock_path = os.path.join(directory, "archive.lock")
+        self._names_path = os.path.join(directory, "names.json")
+        self._names_version = None
+        self._tables: Dict[str, List[str]] = {"subreddit": [], "game": []}
+        self._codes: Dict[str, Dict[str, int]] = {"subreddit": {}, "game": {}}
+        self._reload_names()
+        self._maps = None
+        self._mapped_rows = -1
+    
+    def __len__(self) -> int:
+        """@brief Get the number of archived rows
+        @return Number of complete rows
+        @retval int Row count
+        """
+        with self._lock:
+            return self._rows()
+    
+    def names(self, table: str) -> List[str]:
+        """@brief Get a string table
+        @param table "subreddit" or "game"
+        @return Names indexed by code
+        @retval List[str] String table
+        """
+        with self._lock:
+            self._reload_names()
+            return list(self._tables[table])
+    
+    def append(self, games: Union[str, Sequence[str]], ids: np.ndarray, created_utc: np.ndarray,
+               subreddits: Sequence[str], scores: np.ndarray, num_comments: np.ndarray) -> int:
+        """@brief Archive matched posts
+        @param games Name of the matched game, or one name per post
+        @param ids Post ids as base36 integers
+        @param created_utc Creation times as Unix timestamps
+        @param subreddits Subreddit name of every post
+        @param scores Post scores
+        @param num_comments Comment counts
+        @return Number of archived rows
+        @retval int Row count
+        """
+        count = len(ids)
+        if count == 0:
+            return 0
+        with self._lock, self._file_lock():
+            # Another process may have added names since they were read
+            self._reload_names()
+            subreddit_codes = np.fromiter((self._code("subreddit", name) for name in subreddits),
+                                          dtype=POST_COLUMNS["subreddit"], count=count)
+            if isinstance(games, str):
+                game_codes = np.full(count, self._code("game", games), dtype=POST_COLUMNS["game"])
+            else:
+                game_codes = np.fromiter((self._code("game", name) for name in games),
+                                         dtype=POST_COLUMNS["game"], count=count)
+            self._save_names()
+            self._write({
+                "id": ids,
+                "created_utc": created_utc,
+                "subreddit": subreddit_codes,
+                "score": np.clip(scores, -2**31, 2**31 - 1),
+                "num_comments": np.clip(num_comments, 0, 2**31 - 1),
+                "game": game_codes
+            })
+        return count
+    
+    def column(self, name: str) -> np.ndarray:
+        """@brief Get a column as a read-only memory map
+        @param name Column name (see POST_COLUMNS)
+        @return Values of all complete rows
+        @retval np.ndarray Memory-mapped column
+        """
+        with self._lock:
+            return self._load()[name]
+    
+    def counts(self, game_name: str, start_day: int, length: int, utc_offset: float = 0.0,
+               min_score: Optional[int] = None, subreddits: Optional[Sequence[str]] = None) -> DailySeries:
+        """@brief Count the archived posts of a game per day
+        @details The game column is scanned once; day buckets are computed
+                 only for the rows of the game. Posts archived more than once
+                 (for example by overlapping runs) are counted once
+        @param game_name Name of the game
+        @param start_day First day ordinal
+        @param length Number of days
+        @param utc_offset Hours added to UTC before bucketing (local-time days)
+        @param min_score Count only posts with at least this score (optional)
+        @param subreddits Count only posts from these subreddits (optional)
+        @return Posts per day
+        @retval DailySeries Daily counts
+        """
+        with self._lock:
+            self._reload_names()
+            code = self._codes["game"].get(game_name)
+            if subreddits is not None:
+                wanted = [self._codes["subreddit"][name] for name in subreddits if name in self._codes["subreddit"]]
+            columns = self._load()
+        if code is None:
+            return DailySeries.zeros(start_day, length)
+        
+        rows = np.flatnonzero(columns["game"] == code)
+        if min_score is not None:
+            rows = rows[columns["score"][rows] >= min_score]
+        if subreddits is not None:
+            rows = rows[np.isin(columns["subreddit"][rows], wanted)]
+        
+        shift = utc_offset * 3600
+        days = np.floor_divide(columns["created_utc"][rows] + shift, SECONDS_PER_DAY).astype(np.int64) - start_day
+        inside = (days >= 0) & (days < length)
+        rows, days = rows[inside], days[inside]
+        _, first = np.unique(columns["id"][rows], return_index=True)
+        return DailySeries(start_day, np.bincount(days[first], minlength=length).astype(np.int64))
+    
+    def _code(self, table: str, name: str) -> int:
+        """@brief Get the code of a name, adding it to the string table if new (lock must be held)
+        @param table "subreddit" or "game"
+        @param name Name to encode
+        @return Code of the name
+        @retval int Index into the string table
+        """
+        code = self._codes[table].get(name)
+        if code is None:
+            code = len(self._tables[table])
+            self._tables[table].append(name)
+            self._codes[table][name] = code
+        return code
+    
+    def _save_names(self):
+        """@brief Replace the string table file atomically (lock and file lock must be held)"""
+        tmp_path = self._names_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._tables, f)
+        os.replace(tmp_path, self._names_path)
+        self._names_version = self._file_version(self._names_path)
+    
+    def _reload_names(self):
+        """@brief Read the string tables again if another process replaced names.json (lock must be held)"""
+        version = self._file_version(self._names_path)
+        if version is None or version == self._names_version:
+            return
+        with open(self._names_path, encoding='utf-8') as f:
+            tables = json.load(f)
+        for table, names in tables.items():
+            self._tables[table] = list(names)
+            self._codes[table] = {name: code for code, name in enumerate(names)}
+        self._names_version = version
+    
+    @staticmethod
+    def _file_version(path: str) -> Optional[tuple]:
+        """@brief Identify the current content of a file that is replaced atomically
+        @param path File path
+        @return Inode, modification time and size, or None if the file does not exist
+        @retval Optional[tuple] File version
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+    
+    @contextmanager
+    def _file_lock(self):
+        """@brief Hold the archive lock shared with other processes
+        @details flock on POSIX, a one-byte msvcrt lock on Windows; blocks
+                 until the lock is free
+        """
+        with open(self._lock_path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def _path(self, name: str) -> str:
+        """@brief Get the file path of a column
+        @param name Column name
+        @return Path to the column file
+        @retval str File path
+        """
+        return os.path.join(self.directory, f"{name}.bin")
+    
+    def _rows(self) -> int:
+        """@brief Get the number of complete rows (lock must be held)
+        @return Length of the shortest column
+        @retval int Row count
+        """
+        rows = []
+        for name, dtype in POST_COLUMNS.items():
+            try:
+                rows.append(os.path.getsize(self._path(name)) // dtype.itemsize)
+            except FileNotFoundError:
+                rows.append(0)
+        return min(rows)
+    
+    def _write(self, values: Dict[str, np.ndarray]):
+        """@brief Append one block of rows to every column (lock must be held)
+        @details Columns are first cut back to the complete rows, so a block
+                 left half-written by an interrupted append is replaced
+        @param values Values per column name, all of the same length
+        """
+        rows = self._rows()
+        for name, dtype in POST_COLUMNS.items():
+            path = self._path(name)
+            with open(path, "ab") as f:
+                f.truncate(rows * dtype.itemsize)
+                f.write(np.ascontiguousarray(values[name], dtype=dtype).tobytes())
+        self._maps = None
+    
+    def _load(self) -> Dict[str, np.ndarray]:
+        """@brief Map all columns, reusing the maps while the archive is unchanged (lock must be held)
+        @return Memory-mapped columns cut to the complete rows
+        @retval Dict[str, np.ndarray] Columns by name
+        """
+        rows = self._rows()
+        if self._maps is None or rows != self._mapped_rows:
+            if rows:
+                self._maps = {name: np.memmap(self._path(name), dtype=dtype, mode="r", shape=(rows,))
+                              for name, dtype in POST_COLUMNS.items()}
+            else:
+                self._maps = {name: np.zeros(0, dtype=dtype) for name, dtype in POST_COLUMNS.items()}
+            self._mapped_rows = rows
+        return self._maps
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""Shared Reddit feed matched against all tracked games"""
+from __future__ import annotations
+import time
+import threading
+import numpy as np
+from datetime import datetime, timezone
+from typing import Callable, Dict, Any, Iterable, List, Optional, Protocol, Sequence, TYPE_CHECKING
+from data_sources.http_client import TokenBucket
+from data_sources.mention_matcher import MentionMatcher
+from data_sources.reddit_search import REDDIT_PAGE_SIZE, REDDIT_LISTING_CAP
+from data_sources.reddit_source import RedditDataSource
+from models.time_series import DailySeries, SECONDS_PER_DAY, epoch_day, day_to_date
+from models.data_models import AnomalyEvent
+from models.metrics import metrics
+
+if TYPE_CHECKING:
+    import praw
+    from data_sources.reddit_state import RedditStateStore
+    from data_sources.post_archive import PostArchive
+
+class PostObserver(Protocol):
+    """@brief Receiver of single posts, such as core.anomaly.AnomalyMonitor
+    @details The feed only depends on this interface; the caller passes the
+             monitor in, so the data layer does not import core
+    """
+    
+    def add_post(self, key: str, created_utc: float) -> List[AnomalyEvent]:
+        """@brief Count one post
+        @param key Series key ("<game>|<column>")
+        @param created_utc Post time as Unix timestamp
+        @return Events of days closed by this post
+        @retval List[AnomalyEvent] Detected anomalies
+        """
+    
+    def flush(self, end_day: int) -> List[AnomalyEvent]:
+        """@brief Close the post counts of all series up to a day
+        @param end_day First day that is not closed yet
+        @return Events of the closed days
+        @retval List[AnomalyEvent] Detected anomalies
+        """
+
+class RedditFeed:
+    """@brief One stream of new submissions counted for every tracked game
+    @details Polls the newest submissions of a set of subreddits (one
+             listing for all of them) and matches every title against the
+             names and aliases of all tracked games with a MentionMatcher.
+             Hits are bucketed per game and day into one counts matrix, so
+             the number of API calls does not grow with the number of games
+             and matching stays linear in the title text. A poll reads the
+             listing only down to the newest post of the previous poll; if
+             that post is not reached within the listing cap, posts in
+             between were missed and a warning is printed (poll more often
+             or narrow the subreddit list). With a monitor, every hit is
+             also counted post by post in the anomaly detectors, so a day
+             is scored as soon as it is over instead of at the next analysis.
+    """
+    
+    ## @brief Key of the feed's own high-water mark in the state store
+    STATE_KEY = "feed"
+    
+    def __init__(self, client_factory: Callable[[], praw.Reddit], subreddits: Sequence[str], days: int = 30,
+                 min_interval: float = 60, rate: Optional[float] = None, state_store: RedditStateStore = None,
+                 archive: PostArchive = None, limit: int = REDDIT_LISTING_CAP, monitor: PostObserver = None):
+        """@brief Initialize the feed
+        @param client_factory Function creating the Reddit client (called on first poll)
+        @param subreddits Subreddits whose new submissions are read
+        @param days Number of days of counts kept per game
+        @param min_interval Minimum time between two polls in seconds (more frequent polls do nothing)
+        @param rate Result pages per second (None for no limit)
+        @param state_store Store keeping counts and the high-water mark between runs (optional)
+        @param archive Archive receiving the raw fields of every matched post (optional)
+        @param limit Maximum number of results per poll
+        @param monitor Anomaly monitor receiving every hit (optional)
+        """
+        ## @brief Subreddits whose new submissions are read
+        self.subreddits = list(subreddits)
+        
+        ## @brief Number of days of counts kept per game
+        self.days = days
+        
+        ## @brief Minimum time between two polls in seconds
+        self.min_interval = min_interval
+        
+        ## @brief Maximum number of results per poll
+        self.limit = limit
+        
+        ## @brief Matcher over the names and aliases of the tracked games
+        self.matcher = MentionMatcher()
+        
+        ## @brief Store keeping counts and the high-water mark between runs (optional)
+        self.state_store = state_store
+        
+        ## @brief Archive receiving the raw fields of every matched post (optional)
+        self.archive = archive
+        
+        ## @brief Anomaly monitor receiving every hit (optional)
+        self.monitor = monitor
+        
+        self._client_factory = client_factory
+        self._client = None
+        self._bucket = TokenBucket(rate) if rate else None
+        self._lock = threading.Lock()
+        self._start_day = epoch_day(datetime.now(timezone.utc).date()) - days
+        self._counts = np.zeros((0, days + 1), dtype=np.int64)
+        self._last_poll = None
+        self._newest_utc = None
+        self._newest_ids = []
+        if state_store is not None:
+            state = state_store.load(self.STATE_KEY)
+            if state:
+                self._newest_utc, self._newest_ids = state["newest_utc"], state["newest_ids"]
+    
+    def add_game(self, game_name: str, aliases: Iterable[str] = ()):
+        """@brief Count mentions of a game from the next poll on
+        @details Counts stored by previous runs are restored
+        @param game_name Name of the game
+        @param aliases Other names of the game
+        """
+        with self._lock:
+            number = self.matcher.add_game(game_name, aliases)
+            if number < len(self._counts):
+                return
+            self._counts = np.vstack([self._counts, np.zeros((1, self._counts.shape[1]), dtype=np.int64)])
+            state = self.state_store.load(self._state_key(game_name)) if self.state_store else None
+            if state:
+                self._counts[number] = DailySeries.from_dict(state["daily"]).window(
+                    self._start_day, self._counts.shape[1]).values
+    
+    def poll(self, now: float = None) -> int:
+        """@brief Read the submissions posted since the previous poll
+        @param now Current Unix time (defaults to time.time())
+        @return Number of new submissions read (0 if polled less than min_interval ago)
+        @retval int Number of posts
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if self._last_poll is not None and now - self._last_poll < self.min_interval:
+                return 0
+            self._last_poll = now
+            self._advance(int(now // SECONDS_PER_DAY))
+            
+            if self._client is None:
+                self._client = self._client_factory()
+            results = iter(self._client.subreddit("+".join(self.subreddits)).new(limit=self.limit))
+            stop_utc = max(self._newest_utc or 0.0, self._start_day * SECONDS_PER_DAY)
+            mark_ids = set(self._newest_ids)
+            titles, timestamps, posts = [], [], []
+            newest_utc, newest_ids = self._newest_utc, list(self._newest_ids)
+            count = pages = 0
+            reached = False
+            # Stopping at the limit means the listing was cut off, not finished
+            while count < self.limit:
+                if count % REDDIT_PAGE_SIZE == 0:
+                    if self._bucket is not None:
+                        self._bucket.acquire()
+                    pages += 1
+                post = next(results, None)
+                if post is None:
+                    reached = True
+                    break
+                count += 1
+                created_utc = post.created_utc
+                if created_utc < stop_utc:
+                    reached = True
+                    break
+                if created_utc == self._newest_utc and post.id in mark_ids:
+                    continue
+                titles.append(post.title)
+                timestamps.append(created_utc)
+                posts.append(post)
+                if newest_utc is None or created_utc > newest_utc:
+                    newest_utc, newest_ids = created_utc, [post.id]
+                elif created_utc == newest_utc:
+                    newest_ids.append(post.id)
+            metrics.incr("api_calls", pages, source="Reddit feed")
+            metrics.incr("posts_fetched", len(titles), source="Reddit feed")
+            if not reached and self._newest_utc is not None:
+                print(f"[Reddit] Feed listing ended before the previous poll, posts may be missing "
+                      f"(poll more often than every {self.min_interval:.0f}s or track fewer subreddits)")
+            
+            hit_posts, hit_games = self.matcher.match_many(titles)
+            if self.archive is not None and len(hit_posts):
+                hits = [posts[i] for i in hit_posts.tolist()]
+                self.archive.append([self.matcher.games[number] for number in hit_games.tolist()],
+                                    np.array([int(post.id, 36) for post in hits], dtype=np.int64),
+                                    np.asarray(timestamps, dtype=np.float64)[hit_posts],
+                                    [str(post.subreddit) for post in hits],
+                                    np.array([post.score for post in hits], dtype=np.int64),
+                                    np.array([post.num_comments for post in hits], dtype=np.int64))
+            if len(hit_posts):
+                offsets = (np.asarray(timestamps, dtype=np.float64)[hit_posts] // SECONDS_PER_DAY).astype(
+                    np.int64) - self._start_day
+                valid = (offsets >= 0) & (offsets < self._counts.shape[1])
+                width = self._counts.shape[1]
+                self._counts += np.bincount(hit_games[valid] * width + offsets[valid],
+                                            minlength=self._counts.size).reshape(self._counts.shape)
+            if self.monitor is not None:
+                self._observe(hit_games, np.asarray(timestamps, dtype=np.float64)[hit_posts],
+                              int(now // SECONDS_PER_DAY))
+            self._newest_utc, self._newest_ids = newest_utc, newest_ids
+            if self.state_store is not None:
+                self._save(set(hit_games.tolist()))
+            return len(titles)
+    
+    def series(self, game_name: str, start_day: int, length: int) -> DailySeries:
+        """@brief Get the mention counts of a game
+        @param game_name Name of a tracked game
+        @param start_day First day ordinal
+        @param length Number of days
+        @return Counts per day (0 for days outside the kept range)
+        @retval DailySeries Copy of the counts
+        @exception KeyError If the game is not tracked
+        """
+        with self._lock:
+            counts = DailySeries(self._start_day, self._counts[self.matcher.game_number(game_name)].copy())
+        return counts.window(start_day, length)
+    
+    def _advance(self, today: int):
+        """@brief Move the kept day range forward so that it ends with today
+        @param today Day ordinal of the current day
+        """
+        shift = today - (self._start_day + self._counts.shape[1] - 1)
+        if shift <= 0:
+            return
+        counts = np.zeros_like(self._counts)
+        if shift < counts.shape[1]:
+            counts[:, :-shift] = self._counts[:, shift:]
+        self._counts = counts
+        self._start_day += shift
+    
+    def _observe(self, games: np.ndarray, timestamps: np.ndarray, today: int):
+        """@brief Count hits in the anomaly monitor and close the days before today
+        @param games Game number of every hit
+        @param timestamps Creation time of every hit
+        @param today Day ordinal of the current day
+        """
+        events = []
+        # The listing is newest first, the monitor expects posts in creation order
+        for i in np.argsort(timestamps, kind="stable").tolist():
+            key = f"{self.matcher.games[games[i]]}|{RedditDataSource.column}"
+            events += self.monitor.add_post(key, float(timestamps[i]))
+        events += self.monitor.flush(today)
+        if events:
+            print(f"[Reddit] Feed flagged {len(events)} anomalies")
+    
+    def _state_key(self, game_name: str) -> str:
+        """@brief Get the state store key of a game's counts
+        @param game_name Name of the game
+        @return Key distinct from the keys of search-based sources
+        @retval str State key
+        """
+        return f"{self.STATE_KEY} {game_name}"
+    
+    def _save(self, numbers: set):
+        """@brief Persist the high-water mark and the counts of games with new hits
+        @param numbers Numbers of the games with new hits
+        """
+        first_day = day_to_date(self._start_day).isoformat()
+        self.state_store.save(self.STATE_KEY, {}, first_day, self._newest_utc, self._newest_ids)
+        for number in numbers:
+            daily = DailySeries(self._start_day, self._counts[number]).to_dict()
+            self.state_store.save(self._state_key(self.matcher.games[number]), daily, first_day, None, [])
+
+class RedditFeedSource(RedditDataSource):
+    """@brief Reddit mentions of one game read from a shared RedditFeed
+    @details Polling is shared by all games tracked by the feed; fetching
+             polls the feed (at most once per min_interval) and reads the
+             game's row of the counts
+    """
+    
+    def __init__(self, name: str = "Reddit", days: int = 30, game_name: str = "Counter-Strike 2",
+                 feed: RedditFeed = None):
+        """@brief Initialize the source
+        @param name Name of the data source
+        @param days Number of days to analyze
+        @param game_name Name of the game (must be tracked by the feed)
+        @param feed Shared feed
+        """
+        super().__init__(name, days, game_name)
+        
+        ## @brief Shared feed
+        self.feed = feed
+    
+    def fetch_data(self, game_name: str = None, **kwargs) -> Dict[str, Any]:
+        """@brief Poll the feed and read the mention counts of the game
+        @param game_name Name of the game (optional)
+        @param kwargs Additional arguments (not used)
+        @return Dictionary containing mention data
+        @retval Dict[str, Any] Mention data including mentions count and daily data
+        """
+        game_name = game_name or self.game_name
+        if not self.reddit_config["client_id"]:
+            print("[Reddit] Reddit API credentials not set")
+            return {"mentions": {}, "daily_data": {}, "total": 0}
+        
+        try:
+            new_posts = self.feed.poll()
+            if new_posts:
+                print(f"[Reddit] Feed: {new_posts} new posts")
+            start_day = self.window_start_day()
+            self.series = self.feed.series(game_name, start_day, self.days)
+            counts = self.series.values
+            mentions = {day_to_date(start_day + i): count for i, count in enumerate(counts.tolist())}
+            total_mentions = int(counts.sum())
+            print(f"[Reddit] Found {total_mentions} mentions in {self.days} days (feed)")
+            return {"mentions": mentions, "daily_data": self.data, "total": total_mentions}
+        except Exception as e:
+            print(f"[Reddit] Error fetching data: {e}")
+            metrics.incr("errors", source=self.name)
+            return {"mentions": {}, "daily_data": {}, "total": 0}
\ No newline at end of file
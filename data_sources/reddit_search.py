@@ -0,0 +1,391 @@
+"""Sharded Reddit search"""
+from __future__ import annotations
+import time
+import threading
+import numpy as np
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Sequence, TYPE_CHECKING
+from data_sources.http_client import TokenBucket
+from models.time_series import SECONDS_PER_DAY
+
+## @brief Number of results per Reddit listing page
+REDDIT_PAGE_SIZE = 100
+
+## @brief Maximum number of results Reddit returns for one listing
+REDDIT_LISTING_CAP = 1000
+
+## @brief Search time filters from narrowest to widest with the days they span
+TIME_FILTERS = [("day", 1), ("week", 7), ("month", 28), ("year", 365), ("all", None)]
+
+## @brief Sort orders of the extra shards of a capped subreddit
+## @details Each order returns a different selection of up to 1000 posts
+WIDEN_SORTS = ("top", "comments", "relevance")
+
+## @brief Maximum number of subreddits a capped search of r/all is split into
+SPLIT_SUBREDDITS = 20
+
+if TYPE_CHECKING:
+    import praw
+
+class SearchShard:
+    """@brief One listing of a sharded search and what it returned"""
+    
+    __slots__ = ("subreddit", "sort", "time_filter", "ids", "timestamps", "subreddits", "scores", "num_comments",
+                 "pages", "oldest_utc", "capped")
+    
+    def __init__(self, subreddit: str, sort: str = "new", time_filter: str = "all"):
+        """@brief Initialize the shard
+        @param subreddit Subreddit searched
+        @param sort Sort order of the listing
+        @param time_filter Reddit time filter of the listing
+        """
+        ## @brief Subreddit searched
+        self.subreddit = subreddit
+        
+        ## @brief Sort order of the listing
+        self.sort = sort
+        
+        ## @brief Reddit time filter of the listing
+        self.time_filter = time_filter
+        
+        ## @brief Ids of the collected posts as base36 integers
+        self.ids = array('q')
+        
+        ## @brief Creation times of the collected posts
+        self.timestamps = array('d')
+        
+        ## @brief Subreddit names of the collected posts
+        self.subreddits: List[str] = []
+        
+        ## @brief Scores of the collected posts
+        self.scores = array('q')
+        
+        ## @brief Comment counts of the collected posts
+        self.num_comments = array('q')
+        
+        ## @brief Number of result pages requested
+        self.pages = 0
+        
+        ## @brief Creation time of the oldest result read (None if the listing was empty)
+        self.oldest_utc = None
+        
+        ## @brief The listing ended at the result cap before it covered the window
+        self.capped = False
+
+class SearchResult:
+    """@brief Deduplicated posts of a sharded search"""
+    
+    __slots__ = ("ids", "timestamps", "subreddits", "scores", "num_comments", "newest_utc", "newest_ids", "shards",
+                 "complete_since")
+    
+    def __init__(self, ids: np.ndarray, timestamps: np.ndarray, subreddits: np.ndarray, scores: np.ndarray,
+                 num_comments: np.ndarray, newest_utc: Optional[float], newest_ids: List[str],
+                 shards: List[SearchShard], complete_since: Optional[float] = None):
+        """@brief Initialize the result
+        @param ids Ids of the new posts as base36 integers
+        @param timestamps Creation times of the new posts, one per post
+        @param subreddits Subreddit names of the new posts
+        @param scores Scores of the new posts
+        @param num_comments Comment counts of the new posts
+        @param newest_utc Newest creation time seen (the high-water mark for the next run)
+        @param newest_ids Ids of the posts created at newest_utc
+        @param shards Listings that were read
+        @param complete_since Every post created since this time was reached (None if every post of the window was)
+        """
+        ## @brief Ids of the new posts as base36 integers
+        self.ids = ids
+        
+        ## @brief Creation times of the new posts, one per post
+        self.timestamps = timestamps
+        
+        ## @brief Subreddit names of the new posts
+        self.subreddits = subreddits
+        
+        ## @brief Scores of the new posts
+        self.scores = scores
+        
+        ## @brief Comment counts of the new posts
+        self.num_comments = num_comments
+        
+        ## @brief Newest creation time seen
+        self.newest_utc = newest_utc
+        
+        ## @brief Ids of the posts created at newest_utc
+        self.newest_ids = newest_ids
+        
+        ## @brief Listings that were read
+        self.shards = shards
+        
+        ## @brief Every post created since this time was reached (None if every post of the window was)
+        self.complete_since = complete_since
+    
+    @property
+    def complete(self) -> bool:
+        """@brief Check whether every post of the window could be reached
+        @return True if no listing stayed capped
+        @retval bool Completeness
+        """
+        return self.complete_since is None
+    
+    @property
+    def pages(self) -> int:
+        """@brief Get the number of result pages requested by all shards
+        @return Page count
+        @retval int Number of API calls
+        """
+        return sum(shard.pages for shard in self.shards)
+
+class ShardedSearch:
+    """@brief Reddit search split into concurrent listings
+    @details Reddit returns at most 1000 results per listing, so a single
+             search sorted by date silently stops short of the window start
+             for popular games. The search runs in two rounds:
+             1. one listing sorted by date per subreddit; a listing that
+                reaches the window start is complete,
+             2. for every subreddit whose listing hit the cap, extra listings
+                with other sort orders and every time filter that reaches
+                past the oldest post already read, each returning a
+                different selection of up to 1000 older posts,
+             3. if r/all is still capped, one listing sorted by date per
+                subreddit among its most frequent results, widened again
+                when capped; each subreddit has its own result cap.
+             Listings of a round run concurrently on worker threads with one
+             client per thread and share one rate limit per result page.
+             Posts found by several listings are counted once: ids are
+             stored as 64-bit integers and deduplicated with np.unique.
+             Only posts older than the oldest post of the first round can
+             be missed, and only when the extra listings are capped as well;
+             the result tells since when every post was reached.
+    """
+    
+    def __init__(self, client_factory: Callable[[], praw.Reddit], subreddits: Sequence[str] = ("all",),
+                 workers: int = 4, rate: Optional[float] = None, limit: int = REDDIT_LISTING_CAP):
+        """@brief Initialize the search
+        @param client_factory Function creating a Reddit client, called once per worker thread
+        @param subreddits Subreddits searched ("all" for every subreddit)
+        @param workers Maximum number of concurrent listings
+        @param rate Result pages per second over all workers (None for no limit)
+        @param limit Maximum number of results per listing
+        """
+        ## @brief Subreddits searched
+        self.subreddits = list(subreddits)
+        
+        ## @brief Maximum number of concurrent listings
+        self.workers = max(1, workers)
+        
+        ## @brief Maximum number of results per listing
+        self.limit = limit
+        
+        self._client_factory = client_factory
+        self._bucket = TokenBucket(rate) if rate else None
+        self._local = threading.local()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    def search(self, query: str, window_start_utc: float, mark_utc: Optional[float] = None,
+               mark_ids: Iterable[str] = ()) -> SearchResult:
+        """@brief Collect the posts matching a query since the window start
+        @param query Reddit search query
+        @param window_start_utc Unix timestamp of the first second of the window
+        @param mark_utc Timestamp of the newest post counted in a previous run (optional)
+        @param mark_ids Ids of the posts counted at mark_utc
+        @return Deduplicated posts newer than the window start and the mark
+        @retval SearchResult Search result
+        """
+        stop_utc = window_start_utc if mark_utc is None else max(window_start_utc, mark_utc)
+        skip_ids = frozenset(int(post_id, 36) for post_id in mark_ids)
+        
+        shards = self._run([SearchShard(subreddit) for subreddit in self.subreddits], query, stop_utc, skip_ids)
+        extra = self._widen_capped(shards, query, stop_utc, skip_ids)
+        capped = {shard.subreddit for shard in extra if shard.capped}
+        incomplete = [shard for shard in shards if shard.capped and shard.subreddit in capped]
+        
+        split = []
+        for shard in incomplete:
+            if shard.subreddit == "all":
+                split += [SearchShard(name) for name in self.split(shard, extra)]
+        if split:
+            print(f"[Reddit] r/all still capped, searching {len(split)} subreddits separately")
+            split = self._run(split, query, stop_utc, skip_ids)
+            split += self._widen_capped(split, query, stop_utc, skip_ids)
+        
+        # Every listing sorted by date read all posts newer than its oldest
+        # result, posts before that may be missing if nothing else reached them
+        complete_since = max((shard.oldest_utc for shard in incomplete), default=None)
+        return self._merge(shards + extra + split, mark_utc, mark_ids, complete_since)
+    
+    def widen(self, shard: SearchShard, stop_utc: float, now: float = None) -> List[SearchShard]:
+        """@brief Plan the extra listings for a capped listing sorted by date
+        @details Uses every time filter from the narrowest one reaching past
+                 the oldest post read up to the first one covering the window
+        @param shard Capped listing
+        @param stop_utc Oldest creation time still needed
+        @param now Current Unix time (defaults to time.time())
+        @return Extra listings of the same subreddit
+        @retval List[SearchShard] Planned shards
+        """
+        now = time.time() if now is None else now
+        oldest_utc = shard.oldest_utc if shard.oldest_utc is not None else now
+        filters = []
+        for name, days in TIME_FILTERS:
+            reach_utc = now - days * SECONDS_PER_DAY if days is not None else float("-inf")
+            if reach_utc < oldest_utc:
+                filters.append(name)
+            if reach_utc <= stop_utc:
+                break
+        return [SearchShard(shard.subreddit, sort, time_filter) for time_filter in filters for sort in WIDEN_SORTS]
+    
+    def split(self, shard: SearchShard, extra: Sequence[SearchShard]) -> List[str]:
+        """@brief Plan the subreddits a capped listing of r/all is split into
+        @param shard Capped listing of r/all sorted by date
+        @param extra Extra listings already read
+        @return The subreddits with the most results that are not searched on their own yet
+        @retval List[str] Subreddit names
+        """
+        found = Counter(shard.subreddits)
+        for other in extra:
+            if other.subreddit == shard.subreddit:
+                found.update(other.subreddits)
+        searched = set(self.subreddits)
+        return [name for name, _ in found.most_common() if name not in searched][:SPLIT_SUBREDDITS]
+    
+    def _widen_capped(self, shards: List[SearchShard], query: str, stop_utc: float,
+                      skip_ids: frozenset) -> List[SearchShard]:
+        """@brief Read the extra listings of every capped listing
+        @param shards Read listings
+        @param query Reddit search query
+        @param stop_utc Oldest creation time still needed
+        @param skip_ids Ids counted in a previous run
+        @return Extra listings with their results
+        @retval List[SearchShard] Completed shards
+        """
+        extra = []
+        for shard in shards:
+            if shard.capped:
+                extra += self.widen(shard, stop_utc)
+        if extra:
+            print(f"[Reddit] {sum(s.capped for s in shards)} listings capped, "
+                  f"searching {len(extra)} extra listings")
+            extra = self._run(extra, query, stop_utc, skip_ids)
+        return extra
+    
+    def close(self):
+        """@brief Stop the worker threads"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+    
+    def _run(self, shards: List[SearchShard], query: str, stop_utc: float, skip_ids: frozenset) -> List[SearchShard]:
+        """@brief Read listings concurrently
+        @param shards Listings to read
+        @param query Reddit search query
+        @param stop_utc Oldest creation time still needed
+        @param skip_ids Ids counted in a previous run
+        @return The same shards with their results
+        @retval List[SearchShard] Completed shards
+        """
+        if len(shards) == 1 or self.workers == 1:
+            for shard in shards:
+                self._read(shard, query, stop_utc, skip_ids)
+            return shards
+        
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="reddit-search")
+            executor = self._executor
+        futures = [executor.submit(self._read, shard, query, stop_utc, skip_ids) for shard in shards]
+        for future in futures:
+            future.result()
+        return shards
+    
+    def _client(self) -> praw.Reddit:
+        """@brief Get the Reddit client of the current thread
+        @return Client created by the factory on first use in this thread
+        @retval praw.Reddit Reddit client
+        """
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self._client_factory()
+        return client
+    
+    def _read(self, shard: SearchShard, query: str, stop_utc: float, skip_ids: frozenset):
+        """@brief Read one listing
+        @details A listing sorted by date is not paged any further once a post
+                 is older than stop_utc; other listings are read to the end
+                 and filtered.
+        @param shard Listing to read, receives the results
+        @param query Reddit search query
+        @param stop_utc Oldest creation time still needed
+        @param skip_ids Ids counted in a previous run
+        """
+        results = iter(self._client().subreddit(shard.subreddit).search(
+            query, sort=shard.sort, time_filter=shard.time_filter, limit=self.limit))
+        by_date = shard.sort == "new"
+        count = 0
+        reached = False
+        # Reddit serves no results past the limit, so no page is counted or paid for there
+        while count < self.limit:
+            # Pages are fetched when their first result is read
+            if count % REDDIT_PAGE_SIZE == 0:
+                if self._bucket is not None:
+                    self._bucket.acquire()
+                shard.pages += 1
+            post = next(results, None)
+            if post is None:
+                reached = True
+                break
+            count += 1
+            created_utc = post.created_utc
+            if shard.oldest_utc is None or created_utc < shard.oldest_utc:
+                shard.oldest_utc = created_utc
+            if created_utc < stop_utc:
+                if by_date:
+                    reached = True
+                    break
+                continue
+            post_id = int(post.id, 36)
+            if post_id in skip_ids:
+                continue
+            shard.ids.append(post_id)
+            shard.timestamps.append(created_utc)
+            shard.subreddits.append(str(getattr(post, "subreddit", shard.subreddit)))
+            shard.scores.append(int(getattr(post, "score", 0) or 0))
+            shard.num_comments.append(int(getattr(post, "num_comments", 0) or 0))
+        # Stopping at the limit means the listing may have been cut short
+        shard.capped = not reached
+    
+    @staticmethod
+    def _merge(shards: List[SearchShard], mark_utc: Optional[float], mark_ids: Iterable[str],
+               complete_since: Optional[float] = None) -> SearchResult:
+        """@brief Count every post once and update the high-water mark
+        @param shards Read listings
+        @param mark_utc Previous high-water mark (optional)
+        @param mark_ids Ids at the previous high-water mark
+        @param complete_since Every post created since this time was reached (None if every post of the window was)
+        @return Deduplicated search result
+        @retval SearchResult Merged result
+        """
+        if not shards:
+            empty = np.zeros(0, dtype=np.int64)
+            return SearchResult(empty, np.zeros(0, dtype=np.float64), np.zeros(0, dtype=object), empty, empty,
+                                mark_utc, list(mark_ids), [], complete_since)
+        ids = np.concatenate([np.frombuffer(shard.ids, dtype=np.int64) for shard in shards])
+        timestamps = np.concatenate([np.frombuffer(shard.timestamps, dtype=np.float64) for shard in shards])
+        ids, first = np.unique(ids, return_index=True)
+        timestamps = timestamps[first]
+        subreddits = np.array([name for shard in shards for name in shard.subreddits], dtype=object)[first]
+        scores = np.concatenate([np.frombuffer(shard.scores, dtype=np.int64) for shard in shards])[first]
+        num_comments = np.concatenate([np.frombuffer(shard.num_comments, dtype=np.int64) for shard in shards])[first]
+        
+        newest_utc, newest_ids = mark_utc, list(mark_ids)
+        if len(timestamps):
+            latest = float(timestamps.max())
+            if newest_utc is None or latest > newest_utc:
+                newest_utc, newest_ids = latest, []
+            if latest == newest_utc:
+                newest_ids += [np.base_repr(post_id, 36).lower() for post_id in ids[timestamps == latest].tolist()]
+        return SearchResult(ids, timestamps, subreddits, scores, num_comments, newest_utc, newest_ids, shards,
+                            complete_since)
\ No newline at end of file
@@ -1,20 +1,58 @@
 """Reddit data source"""
-import praw
+from __future__ import annotations
+import numpy as np
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any
-import pandas as pd
+from typing import Dict, Any, Optional, TYPE_CHECKING
 from data_sources.base_data_source import BaseDataSource
+from data_sources.reddit_search import ShardedSearch
+from models.time_series import DailySeries, SECONDS_PER_DAY, epoch_day, day_to_date, bucket_by_day
+from models.metrics import metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import praw
+    from data_sources.post_archive import PostArchive
+
+def create_reddit_client(reddit_config: Dict[str, str], source: str = "Reddit") -> praw.Reddit:
+    """@brief Create a Reddit API client
+    @details Lets several sources share one client instead of authenticating per game.
+             The client's session counts the bytes of every response, so
+             search and feed listings are both measured.
+    @param reddit_config Dictionary with client_id, client_secret and user_agent
+    @param source Source name of the transferred bytes in metrics
+    @return Reddit API client
+    @retval praw.Reddit Reddit client instance
+    """
+    import praw
+    import requests
+    
+    def count_bytes(response, *args, **kwargs):
+        metrics.incr("bytes", len(response.content), source=source)
+    
+    session = requests.Session()
+    session.hooks["response"].append(count_bytes)
+    return praw.Reddit(
+        client_id=reddit_config["client_id"],
+        client_secret=reddit_config["client_secret"],
+        user_agent=reddit_config["user_agent"],
+        requestor_kwargs={"session": session}
+    )
 
 class RedditDataSource(BaseDataSource):
     """@brief Reddit data source implementation
     @details Fetches mention data from Reddit API for a specific game
     """
     
-    def __init__(self, name: str = "Reddit", days: int = 30, game_name: str = "Counter-Strike 2"):
+    ## @brief Name of the value column
+    column = "Reddit Mentions"
+    
+    def __init__(self, name: str = "Reddit", days: int = 30, game_name: str = "Counter-Strike 2",
+                 reddit_client: praw.Reddit = None):
         """@brief Initialize Reddit data source
         @param name Name of the data source
         @param days Number of days to analyze
         @param game_name Name of the game to search for
+        @param reddit_client Shared Reddit API client (optional)
         """
         super().__init__(name, days)
         
@@ -22,7 +60,16 @@ class RedditDataSource(BaseDataSource):
         self.game_name = game_name
         
         ## @brief Reddit API client instance
-        self.reddit_client = None
+        self.reddit_client = reddit_client
+        
+        ## @brief Store for incremental state (optional, enables incremental mode)
+        self.state_store = None
+        
+        ## @brief Search planner (a single-threaded search of r/all on this source's client if None)
+        self.search = None
+        
+        ## @brief Archive of the raw fields of fetched posts (optional)
+        self.archive = None
         
         ## @brief Reddit API configuration
         self.reddit_config = {
@@ -43,25 +90,53 @@ class RedditDataSource(BaseDataSource):
             "user_agent": user_agent
         }
     
+    def set_state_store(self, state_store):
+        """@brief Enable incremental ingestion
+        @details With a state store only posts newer than the last seen post are
+                 fetched and merged into the stored per-day counts
+        @param state_store RedditStateStore instance
+        """
+        self.state_store = state_store
+    
     def _get_reddit_client(self):
         """@brief Get Reddit API client instance
         @return Reddit API client
         @retval praw.Reddit Reddit client instance
         """
         if not self.reddit_client:
-            self.reddit_client = praw.Reddit(
-                client_id=self.reddit_config["client_id"],
-                client_secret=self.reddit_config["client_secret"],
-                user_agent=self.reddit_config["user_agent"]
-            )
+            self.reddit_client = create_reddit_client(self.reddit_config)
         return self.reddit_client
     
+    def set_search(self, search: ShardedSearch):
+        """@brief Use a shared sharded search instead of a single-threaded search of r/all
+        @param search ShardedSearch instance
+        """
+        self.search = search
+    
+    def set_archive(self, archive: PostArchive):
+        """@brief Keep the raw fields of every newly fetched post
+        @details Archived posts can be counted again for other windows or
+                 filters without fetching them (see ArchivedRedditSource)
+        @param archive PostArchive instance
+        """
+        self.archive = archive
+    
+    def _get_search(self) -> ShardedSearch:
+        """@brief Get the search planner
+        @return The shared search, or a single-threaded search using this source's client
+        @retval ShardedSearch Search planner
+        """
+        if self.search is None:
+            self.search = ShardedSearch(self._get_reddit_client, workers=1)
+        return self.search
+    
     def fetch_data(self, game_name: str = None, **kwargs) -> Dict[str, Any]:
         """@brief Fetch mention data from Reddit
         @param game_name Name of the game to search for (optional)
         @param kwargs Additional arguments (not used)
         @return Dictionary containing mention data
-        @retval Dict[str, Any] Mention data including mentions count and daily data
+        @retval Dict[str, Any] Mention data including mentions count, daily data and the
+                dates whose counts may be incomplete because the search was capped
         """
         game_name = game_name or self.game_name
         if not game_name:
@@ -71,73 +146,152 @@ class RedditDataSource(BaseDataSource):
             print("[Reddit] Reddit API credentials not set")
             return {"mentions": {}, "daily_data": {}, "total": 0}
         
+        query = f"title:{game_name}"
+        end_time = datetime.now(timezone.utc)
+        cache_key = f"{query}|{self.days}"
+        
         try:
-            reddit = self._get_reddit_client()
-            end_time = datetime.now(timezone.utc)
-            start_time = end_time - timedelta(days=self.days)
-
-            # Initialize all days with 0
-            mentions = {}
-            current = start_time
-            while current <= end_time:
-                mentions[current.date()] = 0
-                current += timedelta(days=1)
-
-            query = f"title:{game_name}"
-            results = reddit.subreddit("all").search(query, sort="new", limit=1000)
+            start_day = (end_time - timedelta(days=self.days)).date()
+            day_count = (end_time.date() - start_day).days + 1
+            days = [start_day + timedelta(days=i) for i in range(day_count)]
+            first_ordinal = epoch_day(start_day)
+            today_ordinal = first_ordinal + day_count - 1
+            last_closed = (end_time.date() - timedelta(days=1)).strftime('%Y-%m-%d')
 
-            for post in results:
-                post_time = datetime.fromtimestamp(post.created_utc, tz=timezone.utc)
-                post_date = post_time.date()
-                if post_date in mentions:
-                    mentions[post_date] += 1
+            # Restore counts and high-water mark from the previous run. A state
+            # whose counts start after the window (DAYS was raised) is dropped,
+            # the search then goes back to the window start
+            counts = np.zeros(day_count, dtype=np.int64)
+            state = self.state_store.load(query) if self.state_store else None
+            if state and state.get("first_day", "9999-12-31") > start_day.isoformat():
+                print("[Reddit] Stored state does not cover the window, searching every day again")
+                state = None
+            mark_utc = state["newest_utc"] if state else None
+            mark_ids = set(state["newest_ids"]) if state else set()
+            if state:
+                counts += DailySeries.from_dict(state["daily"]).window(first_ordinal, day_count).values
+            
+            # Closed days do not change any more: with their counts cached only
+            # today is searched, still past the mark and into the archive
+            cached = self.cache.get(self.name, cache_key, last_closed) if self.cache else None
+            search_ordinal = first_ordinal
+            if cached is not None:
+                counts[:-1] = DailySeries.from_dict(cached).window(first_ordinal, day_count - 1).values
+                search_ordinal = today_ordinal
+                print("[Reddit] Closed days cached, searching today only")
 
-            # Convert dates to strings
-            self.data = {
-                date.strftime('%Y-%m-%d'): count 
-                for date, count in mentions.items()
-            }
+            result = self._get_search().search(query, search_ordinal * SECONDS_PER_DAY, mark_utc, mark_ids)
+            newest_utc, newest_ids = result.newest_utc, result.newest_ids
+            counts += bucket_by_day(result.timestamps, first_ordinal, day_count)
+            new_posts = len(result.timestamps)
+            if self.archive is not None:
+                self.archive.append(game_name, result.ids, result.timestamps, result.subreddits, result.scores,
+                                    result.num_comments)
+            metrics.incr("api_calls", result.pages, source=self.name)
+            metrics.incr("posts_fetched", new_posts, source=self.name)
+            # Days starting before the search reached every post may miss some
+            incomplete_days = []
+            if not result.complete:
+                last_incomplete = min(int(result.complete_since // SECONDS_PER_DAY), today_ordinal)
+                incomplete_days = DailySeries.zeros(search_ordinal, last_incomplete - search_ordinal + 1) \
+                    .dates().tolist()
+                print(f"[Reddit] Search results were capped, {len(incomplete_days)} days may be incomplete")
+            mentions = dict(zip(days, counts.tolist()))
+            self.series = DailySeries(first_ordinal, counts)
+            
+            # A capped search may have missed posts just past the mark, so the
+            # mark only advances when every post of the window was reached
+            if self.state_store and result.complete:
+                self.state_store.save(query, self.data, start_day.isoformat(), newest_utc, newest_ids)
+                if state:
+                    print(f"[Reddit] Incremental update: {new_posts} new posts since last run")
+            elif self.state_store:
+                print("[Reddit] Keeping the previous high-water mark until a search completes")
             
-            total_mentions = sum(mentions.values())
+            if self.cache and cached is None and result.complete:
+                self.cache.put(self.name, cache_key, last_closed,
+                               DailySeries(first_ordinal, counts[:-1]).to_dict())
+            
+            total_mentions = int(counts.sum())
             print(f"[Reddit] Found {total_mentions} mentions in {self.days} days")
             
-            return {"mentions": mentions, "daily_data": self.data, "total": total_mentions}
+            return {"mentions": mentions, "daily_data": self.data, "total": total_mentions,
+                    "incomplete_days": incomplete_days}
             
         except Exception as e:
             print(f"[Reddit] Error fetching data: {e}")
+            metrics.incr("errors", source=self.name)
             return {"mentions": {}, "daily_data": {}, "total": 0}
     
-    def get_statistics(self) -> Dict[str, Any]:
+    def get_statistics(self, window: Optional[int] = None) -> Dict[str, Any]:
         """@brief Get statistics for Reddit data
+        @param window Number of most recent days to summarize (the analysis period if None)
         @return Dictionary containing statistical information
         @retval Dict[str, Any] Statistics including total, average, min, max values
         """
-        if not self.data:
+        if not self.has_data():
             return {"error": "No data for analysis"}
         
-        values = list(self.data.values())
-        return {
-            "total": sum(values),
-            "average_daily": sum(values) / len(values) if values else 0,
-            "max_daily": max(values) if values else 0,
-            "min_daily": min(values) if values else 0,
-            "data_source": self.name
-        }
+        stats = self.window_statistics(window)
+        stats["data_source"] = self.name
+        return stats
     
     def format_data(self) -> pd.DataFrame:
         """@brief Format Reddit data into DataFrame
         @return Formatted data as pandas DataFrame
         @retval pd.DataFrame DataFrame with Date and Reddit Mentions columns
         """
-        if not self.data:
-            return pd.DataFrame()
+        return self.format_series(self.column)
+
+class ArchivedRedditSource(RedditDataSource):
+    """@brief Reddit mentions of one game counted from the post archive
+    @details Nothing is fetched; the day counts are recomputed from the
+             archived posts, so the window, day boundaries and filters can
+             change without downloading posts again
+    """
+    
+    def __init__(self, name: str = "Reddit", days: int = 30, game_name: str = "Counter-Strike 2",
+                 archive: PostArchive = None, utc_offset: float = 0.0, min_score: Optional[int] = None):
+        """@brief Initialize the source
+        @param name Name of the data source
+        @param days Number of days to analyze
+        @param game_name Name of the game the posts were archived for
+        @param archive Post archive
+        @param utc_offset Hours added to UTC before posts are bucketed by day
+        @param min_score Count only posts with at least this score (optional)
+        """
+        super().__init__(name, days, game_name)
+        self.archive = archive
         
-        dates = self.get_common_dates()
-        rows = []
-        for date in dates:
-            rows.append({
-                "Date": date,
-                "Reddit Mentions": self.data.get(date, 0)
-            })
+        ## @brief Hours added to UTC before posts are bucketed by day
+        self.utc_offset = utc_offset
+        
+        ## @brief Count only posts with at least this score (None for all posts)
+        self.min_score = min_score
+    
+    def fetch_data(self, game_name: str = None, **kwargs) -> Dict[str, Any]:
+        """@brief Count the archived posts of the game per day
+        @param game_name Name of the game (optional)
+        @param kwargs Additional arguments (not used)
+        @return Dictionary containing mention data
+        @retval Dict[str, Any] Mention data including mentions count and daily data
+        """
+        game_name = game_name or self.game_name
+        if self.archive is None:
+            print("[Reddit] No post archive configured")
+            return {"mentions": {}, "daily_data": {}, "total": 0}
         
-        return pd.DataFrame(rows)
\ No newline at end of file
+        try:
+            start_day = self.window_start_day()
+            self.series = self.archive.counts(game_name, start_day, self.days, utc_offset=self.utc_offset,
+                                              min_score=self.min_score)
+            counts = self.series.values
+            mentions = {day_to_date(start_day + i): count for i, count in enumerate(counts.tolist())}
+            total_mentions = int(counts.sum())
+            print(f"[Reddit] Found {total_mentions} mentions in {self.days} days (archive)")
+            return {"mentions": mentions, "daily_data": self.data, "total": total_mentions}
+            
+        except Exception as e:
+            print(f"[Reddit] Error reading the post archive: {e}")
+            metrics.incr("errors", source=self.name)
+            return {"mentions": {}, "daily_data": {}, "total": 0}
\ No newline at end of file
@@ -0,0 +1,69 @@
+"""Persisted state for incremental Reddit ingestion"""
+import os
+import json
+from typing import Dict, Any, Optional
+from models.naming import game_slug
+
+class RedditStateStore:
+    """@brief File-based store for incremental Reddit mention state
+    @details Keeps one JSON file per search query holding the per-day mention
+             counts, the first day they cover and the high-water mark (newest
+             created_utc and the ids of the posts seen at that timestamp).
+             Files are replaced atomically.
+    """
+    
+    def __init__(self, directory: str):
+        """@brief Initialize the state store
+        @param directory Directory for state files
+        """
+        ## @brief Directory for state files
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def _path(self, query: str) -> str:
+        """@brief Get the state file path of a query
+        @param query Search query
+        @return Path to the JSON state file
+        @retval str File path
+        """
+        return os.path.join(self.directory, f"reddit-{game_slug(query)}.json")
+    
+    def load(self, query: str) -> Optional[Dict[str, Any]]:
+        """@brief Load the state of a query
+        @param query Search query
+        @return State with "daily", "first_day", "newest_utc" and "newest_ids" keys, or None
+        @retval Optional[Dict[str, Any]] Stored state
+        """
+        path = self._path(query)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[Reddit] Ignoring unreadable state file {path}: {e}")
+            return None
+        if state.get("query") != query:
+            return None
+        return state
+    
+    def save(self, query: str, daily: Dict[str, int], first_day: str, newest_utc: Optional[float],
+             newest_ids: list):
+        """@brief Save the state of a query
+        @param query Search query
+        @param daily Mention counts keyed by YYYY-MM-DD date
+        @param first_day First searched day (YYYY-MM-DD), every post since then up to newest_utc is counted
+        @param newest_utc Timestamp of the newest post seen
+        @param newest_ids Ids of the posts seen at newest_utc
+        """
+        path = self._path(query)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "query": query,
+                "daily": daily,
+                "first_day": first_day,
+                "newest_utc": newest_utc,
+                "newest_ids": newest_ids
+            }, f)
+        os.replace(tmp_path, path)
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""Persistent response cache for data sources"""
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Optional
+from models.metrics import metrics
+
+class ResponseCache:
+    """@brief On-disk TTL cache for API responses
+    @details Stores JSON-serializable values in SQLite keyed by source name,
+             request key (app id, search query) and day. Every source has its
+             own time-to-live, the table is bounded by max_entries with
+             oldest-first eviction, and hits/misses are counted per source.
+    """
+    
+    def __init__(self, path: str, ttls: Dict[str, float] = None, default_ttl: float = 3600,
+                 max_entries: int = 10000):
+        """@brief Open (or create) the cache database
+        @param path Path to the SQLite file
+        @param ttls Time-to-live in seconds per source name
+        @param default_ttl Time-to-live for sources without an entry in ttls
+        @param max_entries Maximum number of stored entries
+        """
+        ## @brief Path to the SQLite file
+        self.path = path
+        
+        ## @brief Time-to-live in seconds per source name
+        self.ttls = dict(ttls or {})
+        
+        ## @brief Time-to-live for sources without an explicit value
+        self.default_ttl = default_ttl
+        
+        ## @brief Maximum number of stored entries
+        self.max_entries = max_entries
+        
+        ## @brief Cache hits per source name
+        self.hits = {}
+        
+        ## @brief Cache misses per source name
+        self.misses = {}
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " source TEXT NOT NULL, key TEXT NOT NULL, day TEXT NOT NULL,"
+            " value TEXT NOT NULL, stored_at REAL NOT NULL,"
+            " PRIMARY KEY (source, key, day))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at)")
+        self._conn.commit()
+    
+    def get(self, source: str, key: str, day: str) -> Optional[Any]:
+        """@brief Look up a cached value
+        @param source Name of the data source
+        @param key Request key (app id, query)
+        @param day Day the value belongs to in YYYY-MM-DD format
+        @return Cached value or None if missing or expired
+        @retval Optional[Any] Decoded value
+        """
+        ttl = self.ttls.get(source, self.default_ttl)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM entries WHERE source = ? AND key = ? AND day = ?",
+                (source, key, day)
+            ).fetchone()
+            if row is None or time.time() - row[1] > ttl:
+                self.misses[source] = self.misses.get(source, 0) + 1
+                metrics.incr("cache_misses", source=source)
+                return None
+            self.hits[source] = self.hits.get(source, 0) + 1
+            metrics.incr("cache_hits", source=source)
+        return json.loads(row[0])
+    
+    def put(self, source: str, key: str, day: str, value: Any):
+        """@brief Store a value, evicting the oldest entries when the cache is full
+        @param source Name of the data source
+        @param key Request key (app id, query)
+        @param day Day the value belongs to in YYYY-MM-DD format
+        @param value JSON-serializable value
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (source, key, day, value, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (source, key, day, json.dumps(value), time.time())
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE rowid IN "
+                    "(SELECT rowid FROM entries ORDER BY stored_at LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+    
+    def get_statistics(self) -> Dict[str, Dict[str, int]]:
+        """@brief Get hit/miss counters
+        @return Dictionary mapping source names to their hit and miss counts
+        @retval Dict[str, Dict[str, int]] Cache counters
+        """
+        sources = set(self.hits) | set(self.misses)
+        return {
+            source: {"hits": self.hits.get(source, 0), "misses": self.misses.get(source, 0)}
+            for source in sorted(sources)
+        }
+    
+    def clear(self):
+        """@brief Remove all entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+    
+    def close(self):
+        """@brief Close the database connection"""
+        with self._lock:
+            self._conn.close()
\ No newline at end of file
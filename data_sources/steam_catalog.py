@@ -0,0 +1,332 @@
+"""Local catalog of Steam applications"""
+import os
+import re
+import time
+import sqlite3
+import difflib
+import threading
+import unicodedata
+from datetime import datetime, timezone
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from data_sources.http_client import HttpClient
+from data_sources.steam_source import STEAMSPY_API_URL, SteamDataSource, default_steamspy_client
+from data_sources.steam_snapshots import SNAPSHOT_DTYPE, SteamSnapshotStore
+from models.data_models import CatalogEntry
+from models.time_series import epoch_day
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+def normalize_name(name: str) -> str:
+    """@brief Normalize a game name for lookups
+    @details Case-folds, strips accents and trademark signs and collapses
+             punctuation and whitespace, so "Counter-Strike™ 2" and
+             "counter strike 2" share one key.
+    @param name Game name
+    @return Normalized name
+    @retval str Lookup key
+    """
+    decomposed = unicodedata.normalize("NFKD", name.casefold())
+    ascii_name = decomposed.encode("ascii", "ignore").decode("ascii")
+    return _NON_ALNUM.sub(" ", ascii_name).strip()
+
+class SteamCatalog:
+    """@brief On-disk catalog of Steam applications with an in-memory name index
+    @details The paged SteamSpy "all" listing is stored in SQLite. On first
+             lookup all rows are loaded once into an index of flat arrays
+             ordered by owners:
+             - exact lookups use a dict of normalized names (O(1));
+             - prefix lookups bisect a sorted list of normalized names;
+             - fuzzy lookups score all names by trigram overlap (Dice
+               coefficient) with one bincount over an inverted index
+               (built on first use) and rank the best ones with difflib.
+             refresh() fetches a limited number of pages per call and
+             remembers where it stopped, so a full listing can be loaded
+             across several runs within SteamSpy's rate limit. With a
+             snapshot store the owner ranges and CCU of every listed app are
+             recorded as well, so one listing pass adds a day of history for
+             all apps.
+    """
+    
+    ## @brief Number of trigram candidates ranked with difflib per fuzzy lookup
+    FUZZY_CANDIDATES = 20
+    
+    def __init__(self, path: str, client: HttpClient = None, api_url: str = STEAMSPY_API_URL,
+                 snapshot_store: SteamSnapshotStore = None):
+        """@brief Open (or create) the catalog database
+        @param path Path to the SQLite file
+        @param client HTTP client for refreshes (the process-wide SteamSpy client if None)
+        @param api_url SteamSpy API endpoint
+        @param snapshot_store Store receiving owner snapshots of refreshed pages (optional)
+        """
+        ## @brief Path to the SQLite file
+        self.path = path
+        
+        ## @brief HTTP client used for refreshes
+        self.client = client
+        
+        ## @brief SteamSpy API endpoint
+        self.api_url = api_url
+        
+        ## @brief Store receiving owner snapshots of refreshed pages
+        self.snapshot_store = snapshot_store
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS apps ("
+            " app_id INTEGER PRIMARY KEY, name TEXT NOT NULL, owners INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+        self._loaded = False
+        self._trigrams = None
+    
+    def __len__(self) -> int:
+        """@brief Get the number of indexed applications
+        @return Number of catalog entries
+        @retval int Entry count
+        """
+        self._ensure_loaded()
+        return len(self._names)
+    
+    def refresh(self, max_pages: Optional[int] = None, max_age: Optional[float] = None) -> int:
+        """@brief Fetch pages of the SteamSpy listing into the catalog
+        @details Continues at the page where the previous refresh stopped. A
+                 completed pass is not repeated until it is older than max_age.
+        @param max_pages Maximum number of pages fetched by this call (all remaining if None)
+        @param max_age Skip the refresh if the last complete pass is younger than this many seconds
+        @return Number of stored or updated applications
+        @retval int Row count
+        """
+        completed_at = float(self._get_meta("completed_at", "0"))
+        next_page = int(self._get_meta("next_page", "0"))
+        if next_page == 0 and max_age is not None and time.time() - completed_at < max_age:
+            print("[Catalog] Catalog is up to date")
+            return 0
+        
+        client = self.client or default_steamspy_client()
+        stored = 0
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            response = client.get(self.api_url, params={"request": "all", "page": next_page},
+                                  limit="all", timeout=60, source="Catalog")
+            response.raise_for_status()
+            listing = response.json()
+            pages += 1
+            if not listing:
+                # Past the last page, the pass is complete
+                next_page = 0
+                self._set_meta(completed_at=str(time.time()), next_page="0")
+                break
+            
+            stored += self._store_page(listing)
+            next_page += 1
+            self._set_meta(next_page=str(next_page))
+            print(f"[Catalog] Page {next_page - 1}: {len(listing)} applications")
+        
+        if stored:
+            self._loaded = False
+            self._trigrams = None
+        return stored
+    
+    def lookup(self, name: str) -> Optional[CatalogEntry]:
+        """@brief Find an application by exact (normalized) name
+        @param name Game name
+        @return Entry with the most owners among equally named applications, or None
+        @retval Optional[CatalogEntry] Matching application
+        """
+        self._ensure_loaded()
+        row = self._exact.get(normalize_name(name))
+        return None if row is None else self._entry(row)
+    
+    def prefix(self, text: str, limit: int = 10) -> List[CatalogEntry]:
+        """@brief Find applications whose normalized name starts with text
+        @param text Name prefix
+        @param limit Maximum number of results
+        @return Matching entries, most owned first
+        @retval List[CatalogEntry] Matching applications
+        """
+        self._ensure_loaded()
+        key = normalize_name(text)
+        lo = bisect_left(self._sorted_keys, key)
+        hi = bisect_left(self._sorted_keys, key + "\x7f", lo)
+        # Rows are numbered by owners, so the smallest row numbers are the most owned
+        rows = self._sorted_rows[lo:hi]
+        if len(rows) > limit:
+            rows = np.partition(rows, limit - 1)[:limit]
+        return [self._entry(row) for row in np.sort(rows).tolist()]
+    
+    def fuzzy(self, name: str, limit: int = 5, cutoff: float = 0.6) -> List[Tuple[CatalogEntry, float]]:
+        """@brief Find applications with a similar name
+        @param name Game name
+        @param limit Maximum number of results
+        @param cutoff Minimum similarity ratio (0..1)
+        @return Pairs of entry and similarity, best first
+        @retval List[Tuple[CatalogEntry, float]] Similar applications
+        """
+        self._ensure_loaded()
+        key = normalize_name(name)
+        trigrams = self._get_trigrams()
+        query = self._name_trigrams(key)
+        postings = [trigrams[trigram] for trigram in query if trigram in trigrams]
+        if not postings:
+            return []
+        
+        shared = np.bincount(np.concatenate(postings), minlength=len(self._names))
+        scores = 2.0 * shared / (len(query) + self._trigram_counts)
+        count = min(self.FUZZY_CANDIDATES, int(np.count_nonzero(shared)))
+        candidates = np.argpartition(-scores, count - 1)[:count]
+        
+        matcher = difflib.SequenceMatcher(b=key, autojunk=False)
+        ranked = []
+        for row in candidates.tolist():
+            matcher.set_seq1(self._keys[row])
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                ranked.append((-ratio, row))
+        ranked.sort()
+        return [(self._entry(row), -negative) for negative, row in ranked[:limit]]
+    
+    def resolve(self, name: str, cutoff: float = 0.8) -> Optional[str]:
+        """@brief Get the Steam App ID of a game name
+        @details Tries an exact match first and falls back to the most similar name
+        @param name Game name
+        @param cutoff Minimum similarity ratio of a fuzzy match
+        @return Steam App ID, or None if nothing matches
+        @retval Optional[str] App id as used by SteamDataSource
+        """
+        entry = self.lookup(name)
+        if entry is None:
+            matches = self.fuzzy(name, limit=1, cutoff=cutoff)
+            if not matches:
+                return None
+            entry, ratio = matches[0]
+            print(f"[Catalog] '{name}' matched to '{entry.name}' ({ratio:.0%})")
+        return str(entry.app_id)
+    
+    def close(self):
+        """@brief Close the database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    def _store_page(self, listing: Dict[str, Dict]) -> int:
+        """@brief Upsert one page of the SteamSpy listing
+        @param listing Decoded page mapping app ids to application details
+        @return Number of stored applications
+        @retval int Row count
+        """
+        now = time.time()
+        today = epoch_day(datetime.now(timezone.utc).date())
+        rows = []
+        snapshots = []
+        for app_id, details in listing.items():
+            name = (details.get("name") or "").strip()
+            if not name:
+                continue
+            app_id = int(details.get("appid", app_id))
+            try:
+                owners_lo, owners_hi = SteamDataSource.parse_owner_range(details)
+                snapshots.append((app_id, today, owners_lo, owners_hi, int(details.get("ccu") or 0)))
+            except ValueError:
+                owners_lo = 0
+            rows.append((app_id, name, owners_lo, now))
+        
+        if self.snapshot_store is not None:
+            self.snapshot_store.append_many(np.array(snapshots, dtype=SNAPSHOT_DTYPE))
+        
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO apps (app_id, name, owners, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (app_id) DO UPDATE SET name = excluded.name, owners = excluded.owners,"
+                " updated_at = excluded.updated_at",
+                rows
+            )
+            self._conn.commit()
+        return len(rows)
+    
+    def _ensure_loaded(self):
+        """@brief Build the in-memory index from the database on first use"""
+        if self._loaded:
+            return
+        with self._lock:
+            rows = self._conn.execute("SELECT app_id, name, owners FROM apps ORDER BY owners DESC, app_id").fetchall()
+        
+        self._app_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        self._owners = np.fromiter((row[2] for row in rows), dtype=np.int64, count=len(rows))
+        self._names = [row[1] for row in rows]
+        self._keys = [normalize_name(name) for name in self._names]
+        
+        # Rows are ordered by owners, so setdefault keeps the most owned duplicate
+        self._exact = {}
+        for row, key in enumerate(self._keys):
+            self._exact.setdefault(key, row)
+        
+        order = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        self._sorted_keys = [self._keys[row] for row in order]
+        self._sorted_rows = np.array(order, dtype=np.int64)
+        self._loaded = True
+    
+    def _get_trigrams(self) -> Dict[str, np.ndarray]:
+        """@brief Get the inverted trigram index, building it on first use
+        @return Row numbers per trigram
+        @retval Dict[str, np.ndarray] Trigram postings
+        """
+        if self._trigrams is None:
+            index = {}
+            counts = np.zeros(len(self._keys), dtype=np.int64)
+            for row, key in enumerate(self._keys):
+                row_trigrams = self._name_trigrams(key)
+                counts[row] = len(row_trigrams)
+                for trigram in row_trigrams:
+                    index.setdefault(trigram, []).append(row)
+            self._trigram_counts = counts
+            self._trigrams = {trigram: np.array(rows, dtype=np.int32) for trigram, rows in index.items()}
+        return self._trigrams
+    
+    @staticmethod
+    def _name_trigrams(key: str) -> set:
+        """@brief Get the distinct trigrams of a normalized name
+        @param key Normalized name
+        @return Trigrams of the name padded with spaces
+        @retval set Trigram set
+        """
+        padded = f"  {key} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+    
+    def _entry(self, row: int) -> CatalogEntry:
+        """@brief Build the entry of an index row
+        @param row Row number in the index
+        @return Catalog entry
+        @retval CatalogEntry Application data
+        """
+        return CatalogEntry(int(self._app_ids[row]), self._names[row], int(self._owners[row]))
+    
+    def _get_meta(self, key: str, default: str) -> str:
+        """@brief Read a metadata value
+        @param key Metadata key
+        @param default Value returned if the key is missing
+        @return Stored value
+        @retval str Metadata value
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+    
+    def _set_meta(self, **values: str):
+        """@brief Write metadata values
+        @param values Values keyed by metadata key
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                values.items()
+            )
+            self._conn.commit()
\ No newline at end of file
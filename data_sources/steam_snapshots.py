@@ -0,0 +1,234 @@
+"""Append-only store of daily Steam owner snapshots"""
+import os
+import threading
+from typing import Tuple
+import numpy as np
+
+## @brief Fixed-size snapshot record (32 bytes)
+SNAPSHOT_DTYPE = np.dtype([
+    ("app_id", "<u4"),
+    ("day", "<i4"),
+    ("owners_lo", "<i8"),
+    ("owners_hi", "<i8"),
+    ("ccu", "<i8")
+])
+
+def _keys(records: np.ndarray) -> np.ndarray:
+    """@brief Get the sort keys (app id, day) of snapshot records
+    @param records Snapshot records
+    @return Keys ordering records by app id, then day
+    @retval np.ndarray uint64 keys
+    """
+    return (records["app_id"].astype(np.uint64) << np.uint64(32)) | records["day"].astype(np.uint64)
+
+def _latest_per_key(records: np.ndarray) -> np.ndarray:
+    """@brief Sort records by (app id, day) and keep the last written one per key
+    @param records Snapshot records in write order
+    @return Sorted records without duplicates
+    @retval np.ndarray Snapshot records
+    """
+    if len(records) == 0:
+        return records
+    keys = _keys(records)
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    last = np.append(keys[1:] != keys[:-1], True)
+    return records[order[last]]
+
+class SteamSnapshotStore:
+    """@brief Append-only on-disk store of Steam owner snapshots
+    @details Every record holds one (app id, day) observation: the SteamSpy
+             owner range and the concurrent user count. New records are
+             appended to a log file; once the log holds COMPACT_THRESHOLD
+             records and a quarter of the main file it is merged into the
+             main file, which is kept sorted by (app id, day), so merge cost
+             stays amortized as the store grows. Reads memory-map the main
+             file and locate a window with two binary searches, so a range
+             scan costs O(log n) plus the records returned, regardless of
+             how many apps and days are stored. A later record for the same
+             app and day replaces the earlier one.
+    """
+    
+    ## @brief Minimum number of logged records that triggers a merge into the main file
+    COMPACT_THRESHOLD = 4096
+    
+    def __init__(self, directory: str):
+        """@brief Open (or create) the store
+        @param directory Directory for the store files
+        """
+        ## @brief Directory for the store files
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        
+        ## @brief Sorted main file
+        self.main_path = os.path.join(directory, "snapshots.bin")
+        
+        ## @brief Append log of records not merged yet
+        self.log_path = os.path.join(directory, "snapshots.log")
+        
+        self._lock = threading.Lock()
+        self._main = None
+        self._main_keys = None
+        self._main_stamp = None
+        self._log = None
+        self._log_keys = None
+        self._log_size = None
+    
+    def __len__(self) -> int:
+        """@brief Get the number of stored records (a day present in both the log and the main file counts twice)
+        @return Record count
+        @retval int Number of records
+        """
+        with self._lock:
+            return len(self._load_main()[0]) + len(self._load_log()[0])
+    
+    def append(self, app_id: int, day: int, owners_lo: int, owners_hi: int, ccu: int = 0):
+        """@brief Store one snapshot
+        @param app_id Steam App ID
+        @param day Day ordinal of the observation
+        @param owners_lo Lower bound of the owner range
+        @param owners_hi Upper bound of the owner range
+        @param ccu Concurrent users
+        """
+        self.append_many(np.array([(app_id, day, owners_lo, owners_hi, ccu)], dtype=SNAPSHOT_DTYPE))
+    
+    def append_many(self, records: np.ndarray):
+        """@brief Store several snapshots with one write
+        @param records Records of SNAPSHOT_DTYPE
+        """
+        if len(records) == 0:
+            return
+        with self._lock:
+            with open(self.log_path, "ab") as f:
+                # Drop a record torn by an interrupted write, later records would be misaligned
+                size = f.seek(0, os.SEEK_END)
+                if size % SNAPSHOT_DTYPE.itemsize:
+                    f.truncate(size - size % SNAPSHOT_DTYPE.itemsize)
+                f.write(np.ascontiguousarray(records, dtype=SNAPSHOT_DTYPE).tobytes())
+            logged = os.path.getsize(self.log_path) // SNAPSHOT_DTYPE.itemsize
+            if logged >= max(self.COMPACT_THRESHOLD, len(self._load_main()[0]) // 4):
+                self._compact()
+    
+    def history(self, app_id: int, start_day: int, end_day: int) -> np.ndarray:
+        """@brief Get the snapshots of one app in a day range
+        @param app_id Steam App ID
+        @param start_day First day ordinal (inclusive)
+        @param end_day Last day ordinal (exclusive)
+        @return One record per observed day, ordered by day
+        @retval np.ndarray Records of SNAPSHOT_DTYPE
+        """
+        with self._lock:
+            main, keys = self._load_main()
+            bounds = [self._key(app_id, start_day), self._key(app_id, end_day)]
+            lo, hi = np.searchsorted(keys, bounds)
+            found = np.array(main[lo:hi])
+            
+            log, log_keys = self._load_log()
+            lo, hi = np.searchsorted(log_keys, bounds)
+            logged = log[lo:hi]
+        
+        if len(logged) == 0:
+            return found
+        return _latest_per_key(np.concatenate([found, logged]))
+    
+    def last_before(self, app_id: int, day: int) -> np.ndarray:
+        """@brief Get the latest snapshot of one app before a day
+        @param app_id Steam App ID
+        @param day Day ordinal (exclusive)
+        @return The latest earlier record, or no record
+        @retval np.ndarray Zero or one records of SNAPSHOT_DTYPE
+        """
+        with self._lock:
+            main, keys = self._load_main()
+            position = int(np.searchsorted(keys, self._key(app_id, day)))
+            found = np.array(main[position - 1:position]) if position > 0 else np.zeros(0, dtype=SNAPSHOT_DTYPE)
+            found = found[found["app_id"] == app_id]
+            
+            log, log_keys = self._load_log()
+            position = int(np.searchsorted(log_keys, self._key(app_id, day)))
+            logged = log[position - 1:position] if position > 0 else log[:0]
+            logged = logged[logged["app_id"] == app_id]
+        
+        if len(logged) == 0 or (len(found) and found["day"][0] > logged["day"][0]):
+            return found
+        return logged.copy()
+    
+    def compact(self):
+        """@brief Merge the log into the sorted main file"""
+        with self._lock:
+            self._compact()
+    
+    @staticmethod
+    def _key(app_id: int, day: int) -> np.uint64:
+        """@brief Get the sort key of an (app id, day) pair
+        @param app_id Steam App ID
+        @param day Day ordinal
+        @return Key ordering by app id, then day
+        @retval np.uint64 Sort key
+        """
+        return np.uint64((int(app_id) << 32) | max(int(day), 0))
+    
+    def _compact(self):
+        """@brief Merge the log into the main file (lock must be held)
+        @details The merged file replaces the main file atomically before the
+                 log is emptied; if the process stops in between, the log is
+                 merged again and duplicates collapse.
+        """
+        log, _ = self._load_log()
+        if len(log) == 0:
+            return
+        main, _ = self._load_main()
+        merged = _latest_per_key(np.concatenate([np.array(main), log]))
+        
+        self._main = None
+        self._main_keys = None
+        tmp_path = self.main_path + ".tmp"
+        merged.tofile(tmp_path)
+        os.replace(tmp_path, self.main_path)
+        open(self.log_path, "wb").close()
+        self._main_stamp = None
+        self._log = None
+        self._log_keys = None
+        self._log_size = None
+    
+    def _load_main(self) -> Tuple[np.ndarray, np.ndarray]:
+        """@brief Map the main file and its keys, reusing them while the file is unchanged
+        @return Records and their sort keys
+        @retval Tuple[np.ndarray, np.ndarray] Memory-mapped records and uint64 keys
+        """
+        try:
+            stat = os.stat(self.main_path)
+            stamp = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            stamp = (0, 0)
+        
+        if stamp != self._main_stamp:
+            count = stamp[0] // SNAPSHOT_DTYPE.itemsize
+            if count:
+                self._main = np.memmap(self.main_path, dtype=SNAPSHOT_DTYPE, mode="r", shape=(count,))
+            else:
+                self._main = np.zeros(0, dtype=SNAPSHOT_DTYPE)
+            self._main_keys = _keys(self._main)
+            self._main_stamp = stamp
+        return self._main, self._main_keys
+    
+    def _load_log(self) -> Tuple[np.ndarray, np.ndarray]:
+        """@brief Read the log, reusing the last read while its size is unchanged
+        @details Records are sorted like the main file with later writes
+                 replacing earlier ones; a partially written trailing record is ignored
+        @return Sorted logged records and their sort keys
+        @retval Tuple[np.ndarray, np.ndarray] Records of SNAPSHOT_DTYPE and uint64 keys
+        """
+        try:
+            size = os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            size = 0
+        
+        if size != self._log_size:
+            count = size // SNAPSHOT_DTYPE.itemsize
+            log = (np.fromfile(self.log_path, dtype=SNAPSHOT_DTYPE, count=count) if count
+                   else np.zeros(0, dtype=SNAPSHOT_DTYPE))
+            self._log = _latest_per_key(log)
+            self._log_keys = _keys(self._log)
+            self._log_size = size
+        return self._log, self._log_keys
\ No newline at end of file
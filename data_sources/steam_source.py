@@ -1,90 +1,226 @@
 """Steam data source"""
-import requests
+from __future__ import annotations
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any
-import pandas as pd
+import threading
+import numpy as np
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
 from data_sources.base_data_source import BaseDataSource
+from data_sources.http_client import HttpClient
+from models.time_series import DailySeries, epoch_day
+from models.metrics import metrics
+from config import STEAMSPY_API_URL, STEAMSPY_RATE_LIMITS
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from data_sources.steam_snapshots import SteamSnapshotStore
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+def default_steamspy_client() -> HttpClient:
+    """@brief Get the process-wide client used by sources without their own client
+    @details Sharing one client keeps all such sources within SteamSpy's limits
+    @return Client with the SteamSpy rate limits
+    @retval HttpClient Shared client
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient(rate_limits=STEAMSPY_RATE_LIMITS)
+        return _default_client
+
+def owner_history(snapshot_store: SteamSnapshotStore, app_id: int, start_day: int, length: int,
+                  fallback: Optional[int] = None) -> Optional[DailySeries]:
+    """@brief Build a day series of owner counts from stored snapshots
+    @details Days without a snapshot carry the previous value forward; days
+             before the first snapshot take the latest earlier snapshot, or
+             the earliest one in the range if there is none.
+    @param snapshot_store Store of daily owner snapshots
+    @param app_id Steam App ID
+    @param start_day First day ordinal
+    @param length Number of days
+    @param fallback Value used when the app has no snapshot at all (None to return None)
+    @return Owner lower bound per day
+    @retval Optional[DailySeries] Series covering the range, or None without snapshots and fallback
+    """
+    records = snapshot_store.history(app_id, start_day, start_day + length)
+    previous = snapshot_store.last_before(app_id, start_day)
+    if len(records) == 0 and len(previous) == 0 and fallback is None:
+        return None
+    
+    # Index of the latest known snapshot for every day, -1 before the first one
+    latest = np.full(length, -1, dtype=np.int64)
+    latest[records["day"] - start_day] = np.arange(len(records))
+    latest = np.maximum.accumulate(latest)
+    
+    values = np.empty(length, dtype=np.int64)
+    known = latest >= 0
+    values[known] = records["owners_lo"][latest[known]]
+    if len(previous):
+        values[~known] = previous["owners_lo"][0]
+    else:
+        values[~known] = records["owners_lo"][0] if len(records) else fallback
+    return DailySeries(start_day, values)
 
 class SteamDataSource(BaseDataSource):
     """@brief Steam data source implementation
-    @details Fetches subscriber data from SteamSpy API for a specific game
+    @details Fetches subscriber data from SteamSpy API for a specific game.
+             With a snapshot store every fetch is recorded and the day series
+             is read back from the stored history; without one the current
+             owner count is used for every day.
     """
     
-    def __init__(self, name: str = "Steam", days: int = 30, app_id: str = "730"):
+    ## @brief Name of the value column
+    column = "Steam Subscribers"
+    
+    def __init__(self, name: str = "Steam", days: int = 30, app_id: str = "730",
+                 client: HttpClient = None, api_url: str = STEAMSPY_API_URL):
         """@brief Initialize Steam data source
         @param name Name of the data source
         @param days Number of days to analyze
         @param app_id Steam App ID for the game
+        @param client Shared HTTP client (the process-wide SteamSpy client if None)
+        @param api_url SteamSpy API endpoint
         """
         super().__init__(name, days)
         
         ## @brief Steam App ID for the game
         self.app_id = app_id
         
+        ## @brief HTTP client used for API requests
+        self.client = client
+        
+        ## @brief SteamSpy API endpoint
+        self.api_url = api_url
+        
         ## @brief Number of subscribers
         self.subscribers = 0
+        
+        ## @brief Store of daily owner snapshots (None to use the current count for every day)
+        self.snapshot_store = None
+    
+    def set_snapshot_store(self, snapshot_store: SteamSnapshotStore):
+        """@brief Record fetches in a snapshot store and read the day series from its history
+        @param snapshot_store SteamSnapshotStore instance
+        """
+        self.snapshot_store = snapshot_store
     
     def fetch_data(self, **kwargs) -> Dict[str, Any]:
         """@brief Fetch subscriber data from SteamSpy
+        @details A failed request or a response without owner data leaves the
+                 source without data instead of reporting 0 subscribers, so
+                 the combined series never contains fake zeros.
         @param kwargs Additional arguments (not used)
         @return Dictionary containing subscriber data
-        @retval Dict[str, Any] Subscriber data including total count and daily data
+        @retval Dict[str, Any] Subscriber data including total count and daily data, or an error message
         """
-        url = f"https://steamspy.com/api.php?request=appdetails&appid={self.app_id}"
+        today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Get concrete number instead of range
-            owners = data.get("owners", 0)
-            if " .. " in str(owners):
-                self.subscribers = int(owners.replace(",", "").split(" .. ")[0])
+            data = self.cache.get(self.name, str(self.app_id), today) if self.cache else None
+            cached = data is not None
+            if data is None:
+                client = self.client or default_steamspy_client()
+                response = client.get(self.api_url, params={"request": "appdetails", "appid": self.app_id},
+                                      limit="appdetails", source=self.name)
+                metrics.incr("api_calls", source=self.name)
+                response.raise_for_status()
+                data = response.json()
+                owners_lo, owners_hi = self.parse_owner_range(data)
+                if self.cache:
+                    self.cache.put(self.name, str(self.app_id), today, data)
             else:
-                self.subscribers = int(owners)
+                owners_lo, owners_hi = self.parse_owner_range(data)
+            self.subscribers = owners_lo
             
             print(f"[Steam] Approximate number of owners: {self.subscribers:,}")
             
-            # Create dictionary with same value for all dates
-            dates = self.get_common_dates()
-            self.data = {date: self.subscribers for date in dates}
+            if self.snapshot_store is not None:
+                day = epoch_day(datetime.now(timezone.utc).date())
+                ccu = int(data.get("ccu") or 0)
+                # A cache hit repeats an earlier response, record it only if today's snapshot differs
+                if not (cached and self._is_recorded(day, owners_lo, owners_hi, ccu)):
+                    self.snapshot_store.append(int(self.app_id), day, owners_lo, owners_hi, ccu)
+                self.series = self._history_series()
+            else:
+                # Same value for all dates
+                self.series = DailySeries.constant(self.window_start_day(), self.days, self.subscribers)
             
             return {"subscribers": self.subscribers, "daily_data": self.data}
             
         except Exception as e:
             print(f"[Steam] Error fetching data: {e}")
-            return {"subscribers": 0, "daily_data": {}}
+            metrics.incr("errors", source=self.name)
+            self.series = None
+            self.subscribers = 0
+            return {"error": str(e)}
+    
+    def _is_recorded(self, day: int, owners_lo: int, owners_hi: int, ccu: int) -> bool:
+        """@brief Check whether the store already holds this snapshot
+        @param day Day ordinal of the snapshot
+        @param owners_lo Lower bound of the owner range
+        @param owners_hi Upper bound of the owner range
+        @param ccu Concurrent users
+        @return True if the latest record of the app is this day with the same values
+        @retval bool Snapshot already stored
+        """
+        latest = self.snapshot_store.last_before(int(self.app_id), day + 1)
+        return (len(latest) == 1 and int(latest["day"][0]) == day and int(latest["owners_lo"][0]) == owners_lo
+                and int(latest["owners_hi"][0]) == owners_hi and int(latest["ccu"][0]) == ccu)
+    
+    def _history_series(self) -> DailySeries:
+        """@brief Build the day series of the analysis period from stored snapshots
+        @details See owner_history(); the current owner count is used if
+                 the app has no snapshot yet
+        @return Owner lower bound per day
+        @retval DailySeries Series covering the analysis period
+        """
+        return owner_history(self.snapshot_store, int(self.app_id), self.window_start_day(), self.days,
+                             fallback=self.subscribers)
     
-    def get_statistics(self) -> Dict[str, Any]:
+    @staticmethod
+    def parse_owner_range(data: Dict[str, Any]) -> Tuple[int, int]:
+        """@brief Get the owner range from an appdetails response
+        @details SteamSpy reports owners as a range ("1,000,000 .. 2,000,000")
+        @param data Decoded appdetails response
+        @return Lower and upper bound of the owner range (equal for a plain number)
+        @retval Tuple[int, int] Owner range
+        @exception ValueError If the response has no owner data
+        """
+        owners = data.get("owners") if isinstance(data, dict) else None
+        if owners is None or owners == "":
+            raise ValueError("No owner data in SteamSpy response")
+        bounds = [int(bound) for bound in str(owners).replace(",", "").split(" .. ")]
+        return bounds[0], bounds[-1]
+    
+    @staticmethod
+    def parse_owners(data: Dict[str, Any]) -> int:
+        """@brief Get the owner count from an appdetails response
+        @details The lower bound of the owner range is used
+        @param data Decoded appdetails response
+        @return Lower bound of the owner range
+        @retval int Number of owners
+        @exception ValueError If the response has no owner data
+        """
+        return SteamDataSource.parse_owner_range(data)[0]
+    
+    def get_statistics(self, window: Optional[int] = None) -> Dict[str, Any]:
         """@brief Get statistics for Steam data
+        @param window Number of most recent days to summarize (the analysis period if None)
         @return Dictionary containing statistical information
         @retval Dict[str, Any] Statistics including total, average, min, max values
         """
-        if not self.data:
+        if not self.has_data():
             return {"error": "No data for analysis"}
         
-        return {
-            "total": self.subscribers,
-            "average_daily": self.subscribers,
-            "min_daily": self.subscribers,
-            "max_daily": self.subscribers,
-            "data_source": self.name
-        }
+        # Owners are a level, not a count: the total is the current value
+        stats = self.window_statistics(window)
+        stats["total"] = self.subscribers
+        stats["data_source"] = self.name
+        return stats
     
     def format_data(self) -> pd.DataFrame:
         """@brief Format Steam data into DataFrame
         @return Formatted data as pandas DataFrame
         @retval pd.DataFrame DataFrame with Date and Steam Subscribers columns
         """
-        if not self.data:
-            return pd.DataFrame()
-        
-        dates = self.get_common_dates()
-        rows = []
-        for date in dates:
-            rows.append({
-                "Date": date,
-                "Steam Subscribers": self.data.get(date, 0)
-            })
-        
-        return pd.DataFrame(rows)
\ No newline at end of file
+        return self.format_series(self.column)
\ No newline at end of file
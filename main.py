@@ -1,12 +1,50 @@
 """Main application file"""
+from __future__ import annotations
 import os
+import csv
+import argparse
+from datetime import date, datetime, timezone
+from typing import List, Tuple, Dict, TYPE_CHECKING
+import numpy as np
 from dotenv import load_dotenv
+from data_sources.base_data_source import BaseDataSource
 from data_sources.steam_source import SteamDataSource
-from data_sources.reddit_source import RedditDataSource
+from data_sources.reddit_source import RedditDataSource, ArchivedRedditSource, create_reddit_client
+from data_sources.reddit_search import ShardedSearch
+from data_sources.reddit_feed import RedditFeed, RedditFeedSource
+from data_sources.post_archive import PostArchive
+from data_sources.response_cache import ResponseCache
+from data_sources.http_client import HttpClient
+from data_sources.steam_catalog import SteamCatalog
+from data_sources.steam_snapshots import SteamSnapshotStore
+from data_sources.reddit_state import RedditStateStore
 from core.data_processor import DataProcessor
+from models.data_models import CombinedBatch, GameResult, DataSourceStats, AnomalyEvent
+from models.time_series import epoch_day
+from models.metrics import metrics
+from models.naming import game_slug
 from core.reporter import Reporter
-from core.visualizer import Visualizer
-from config import GAME_NAME, STEAM_APP_ID, DAYS, REDDIT_CONFIG
+from core.exporters import create_exporters
+from core.paths import game_output_dir
+from core.scheduler import Scheduler
+from core.api_server import ApiServer, ResultStore
+from core.backfill import run_backfill
+from config import (GAME_NAME, STEAM_APP_ID, DAYS, STEAMSPY_API_URL, REDDIT_CONFIG, CONCURRENT_FETCH, FETCH_TIMEOUTS,
+                    GAMES, OUTPUT_DIR, CACHE_ENABLED, CACHE_PATH, CACHE_TTLS, CACHE_MAX_ENTRIES,
+                    REDDIT_INCREMENTAL, STATE_DIR, REDDIT_SUBREDDITS, REDDIT_SEARCH_WORKERS, REDDIT_RATE_LIMIT,
+                    REDDIT_FEED, REDDIT_FEED_SUBREDDITS, REDDIT_FEED_INTERVAL, REDDIT_ALIASES,
+                    REDDIT_ARCHIVE, ARCHIVE_DIR, REDDIT_FROM_ARCHIVE,
+                    BACKFILL_DIR, BACKFILL_CHUNK_DAYS, BACKFILL_WORKERS, EXPORT_FORMATS, EXPORT_COMPRESSION, PARQUET_DIR,
+                    FAST_PLOTS, PLOT_MAX_POINTS, CREATE_PLOTS, METRICS_ENABLED, METRICS_JSON_PATH,
+                    METRICS_PROMETHEUS_PATH, DAEMON_INTERVAL, DAEMON_JITTER, DAEMON_PENDING_WAIT,
+                    STEAMSPY_RATE_LIMITS, HTTP_RETRIES, HTTP_BACKOFF, HTTP_POOL_SIZE,
+                    CATALOG_PATH, CATALOG_MAX_AGE, CATALOG_FUZZY_CUTOFF, STEAM_HISTORY, SNAPSHOT_DIR,
+                    ANOMALY_DETECTION, ANOMALY_COLUMNS, API_HOST, API_PORT, API_CACHE_SIZE)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# requests, pandas, praw and matplotlib are imported by the stages that use them
 
 def load_environment():
     """@brief Load environment variables from .env file
@@ -19,24 +57,196 @@ def load_environment():
     REDDIT_CONFIG["client_secret"] = os.getenv("REDDIT_CLIENT_SECRET", "")
     REDDIT_CONFIG["user_agent"] = os.getenv("REDDIT_USER_AGENT", "SteamAnalyticsBot by User")
 
-def main():
-    """@brief Main application entry point
-    @details Orchestrates the entire data analysis process:
-             1. Loads configuration
-             2. Creates data sources
-             3. Fetches data
-             4. Processes and combines data
-             5. Generates reports
-             6. Creates visualizations
+def create_cache() -> ResponseCache:
+    """@brief Create the response cache from configuration
+    @return Response cache or None if caching is disabled
+    @retval ResponseCache Shared cache instance
     """
-    print("Starting data analysis...")
-    
-    # Load environment variables
-    load_environment()
+    if not CACHE_ENABLED:
+        return None
+    return ResponseCache(CACHE_PATH, ttls=CACHE_TTLS, max_entries=CACHE_MAX_ENTRIES)
+
+def print_cache_statistics(cache: ResponseCache):
+    """@brief Print cache hit/miss counters
+    @param cache Response cache (may be None)
+    """
+    if cache is None:
+        return
+    for source_name, counters in cache.get_statistics().items():
+        print(f"[Cache] {source_name}: {counters['hits']} hits, {counters['misses']} misses")
+
+## @brief Snapshot store shared by all Steam sources of the process
+_snapshot_store = None
+
+def get_snapshot_store() -> SteamSnapshotStore:
+    """@brief Get the Steam snapshot store from configuration
+    @details One store is shared by all sources so that appends are serialized by its lock
+    @return Shared store or None if history is disabled
+    @retval SteamSnapshotStore Snapshot store
+    """
+    global _snapshot_store
+    if STEAM_HISTORY and _snapshot_store is None:
+        _snapshot_store = SteamSnapshotStore(SNAPSHOT_DIR)
+    return _snapshot_store
+
+_post_archive = None
+
+def get_post_archive(required: bool = False) -> PostArchive:
+    """@brief Get the raw post archive from configuration
+    @details One archive is shared by all sources so that appends are serialized by its lock
+    @param required Open the archive even if archiving is disabled (for reading it)
+    @return Shared archive or None if archiving is disabled
+    @retval PostArchive Post archive
+    """
+    global _post_archive
+    if (REDDIT_ARCHIVE or required) and _post_archive is None:
+        _post_archive = PostArchive(ARCHIVE_DIR)
+    return _post_archive
+
+_reddit_search = None
+
+def get_reddit_search() -> ShardedSearch:
+    """@brief Get the sharded Reddit search from configuration
+    @details One search is shared by all sources, so every listing counts
+             against the same rate limit; each worker thread gets its own client
+    @return Shared search
+    @retval ShardedSearch Reddit search planner
+    """
+    global _reddit_search
+    if _reddit_search is None:
+        _reddit_search = ShardedSearch(lambda: create_reddit_client(REDDIT_CONFIG), REDDIT_SUBREDDITS,
+                                       workers=REDDIT_SEARCH_WORKERS, rate=REDDIT_RATE_LIMIT)
+    return _reddit_search
+
+_reddit_feed = None
+
+def get_reddit_feed() -> RedditFeed:
+    """@brief Get the shared Reddit feed from configuration
+    @return Feed counting mentions of all tracked games
+    @retval RedditFeed Shared feed
+    """
+    global _reddit_feed
+    if _reddit_feed is None:
+        _reddit_feed = RedditFeed(lambda: create_reddit_client(REDDIT_CONFIG, "Reddit feed"), REDDIT_FEED_SUBREDDITS,
+                                  DAYS, min_interval=REDDIT_FEED_INTERVAL, rate=REDDIT_RATE_LIMIT,
+                                  state_store=RedditStateStore(STATE_DIR), archive=get_post_archive())
+    return _reddit_feed
+
+def track_feed_games(games: List[Tuple[str, str]], from_archive: bool = REDDIT_FROM_ARCHIVE):
+    """@brief Register games with the shared feed before its first poll
+    @details Posts are matched only against games known at poll time
+    @param games List of (game name, Steam App ID) pairs
+    @param from_archive Reddit mentions are counted from the archive, the feed is not used
+    """
+    if not REDDIT_FEED or from_archive:
+        return
+    feed = get_reddit_feed()
+    for game_name, _ in games:
+        feed.add_game(game_name, REDDIT_ALIASES.get(game_name, ()))
+
+def watch_feed_anomalies(processor: DataProcessor, from_archive: bool = REDDIT_FROM_ARCHIVE):
+    """@brief Let the shared feed count its hits in the anomaly monitor of a processor
+    @details Days of the feed games are then scored as soon as a poll sees
+             that they are over
+    @param processor Data processor whose monitor receives the hits
+    @param from_archive Reddit mentions are counted from the archive, the feed is not used
+    """
+    if not REDDIT_FEED or from_archive or not ANOMALY_DETECTION or RedditDataSource.column not in ANOMALY_COLUMNS:
+        return
+    get_reddit_feed().monitor = processor.anomaly_monitor
+
+def create_http_client() -> HttpClient:
+    """@brief Create the pooled HTTP client from configuration
+    @return Client with the SteamSpy rate limits and retry settings
+    @retval HttpClient Shared client
+    """
+    return HttpClient(rate_limits=STEAMSPY_RATE_LIMITS, retries=HTTP_RETRIES, backoff=HTTP_BACKOFF,
+                      pool_size=HTTP_POOL_SIZE)
+
+def resolve_app_ids(games: List[Tuple[str, str]], http_client: HttpClient = None) -> List[Tuple[str, str]]:
+    """@brief Fill in missing Steam App IDs from the local catalog
+    @details Games that cannot be resolved are skipped with a message
+    @param games List of (game name, Steam App ID) pairs, the app id may be empty
+    @param http_client Shared HTTP client (optional)
+    @return List of (game name, Steam App ID) pairs with app ids
+    @retval List[Tuple[str, str]] Games to track
+    """
+    if all(app_id for _, app_id in games):
+        return games
     
-    # Create data sources
-    steam_source = SteamDataSource(name="Steam", days=DAYS, app_id=STEAM_APP_ID)
-    reddit_source = RedditDataSource(name="Reddit", days=DAYS, game_name=GAME_NAME)
+    catalog = SteamCatalog(CATALOG_PATH, client=http_client, api_url=STEAMSPY_API_URL)
+    try:
+        if len(catalog) == 0:
+            print("[Catalog] Catalog is empty, run 'python main.py --refresh-catalog' first")
+        resolved = []
+        for game_name, app_id in games:
+            if not app_id:
+                app_id = catalog.resolve(game_name, cutoff=CATALOG_FUZZY_CUTOFF)
+                if app_id is None:
+                    print(f"[Catalog] No Steam app found for '{game_name}', skipping")
+                    continue
+            resolved.append((game_name, app_id))
+    finally:
+        catalog.close()
+    return resolved
+
+def refresh_catalog(max_pages: int = None):
+    """@brief Load the SteamSpy app listing into the local catalog
+    @details SteamSpy allows one listing page per minute, an interrupted
+             refresh continues where it stopped on the next call
+    @param max_pages Maximum number of pages to fetch (all remaining if None)
+    """
+    http_client = create_http_client()
+    catalog = SteamCatalog(CATALOG_PATH, client=http_client, api_url=STEAMSPY_API_URL,
+                           snapshot_store=get_snapshot_store())
+    try:
+        stored = catalog.refresh(max_pages=max_pages, max_age=CATALOG_MAX_AGE)
+        print(f"[Catalog] {stored} applications updated, {len(catalog)} in catalog")
+    finally:
+        catalog.close()
+        http_client.close()
+
+def print_catalog_matches(name: str, limit: int = 10):
+    """@brief Print catalog entries matching a game name
+    @param name Game name or name prefix
+    @param limit Maximum number of printed entries per match type
+    """
+    catalog = SteamCatalog(CATALOG_PATH)
+    try:
+        exact = catalog.lookup(name)
+        if exact is not None:
+            print(f"Exact:  {exact.app_id:>8}  {exact.name}")
+        for entry in catalog.prefix(name, limit):
+            print(f"Prefix: {entry.app_id:>8}  {entry.name}")
+        for entry, ratio in catalog.fuzzy(name, limit):
+            print(f"Fuzzy:  {entry.app_id:>8}  {entry.name} ({ratio:.0%})")
+    finally:
+        catalog.close()
+
+def create_sources(game_name: str, app_id: str, http_client: HttpClient = None,
+                   reddit_client=None, cache: ResponseCache = None,
+                   from_archive: bool = REDDIT_FROM_ARCHIVE) -> List[BaseDataSource]:
+    """@brief Create the data sources of one game
+    @param game_name Name of the game
+    @param app_id Steam App ID of the game
+    @param http_client Shared HTTP client (optional)
+    @param reddit_client Shared Reddit API client (optional)
+    @param cache Shared response cache (optional)
+    @param from_archive Count Reddit mentions from archived posts instead of fetching them
+    @return Configured data sources
+    @retval List[BaseDataSource] Steam and Reddit sources
+    """
+    steam_source = SteamDataSource(name="Steam", days=DAYS, app_id=app_id, client=http_client,
+                                   api_url=STEAMSPY_API_URL)
+    if from_archive:
+        reddit_source = ArchivedRedditSource(name="Reddit", days=DAYS, game_name=game_name,
+                                             archive=get_post_archive(required=True))
+    elif REDDIT_FEED:
+        track_feed_games([(game_name, app_id)])
+        reddit_source = RedditFeedSource(name="Reddit", days=DAYS, game_name=game_name, feed=get_reddit_feed())
+    else:
+        reddit_source = RedditDataSource(name="Reddit", days=DAYS, game_name=game_name,
+                                         reddit_client=reddit_client)
     
     # Set Reddit credentials
     if REDDIT_CONFIG["client_id"]:
@@ -45,41 +255,433 @@ def main():
             REDDIT_CONFIG["client_secret"],
             REDDIT_CONFIG["user_agent"]
         )
+        if not REDDIT_FEED:
+            reddit_source.set_search(get_reddit_search())
+    if REDDIT_ARCHIVE and type(reddit_source) is RedditDataSource:
+        reddit_source.set_archive(get_post_archive())
     
-    # Create data processor
-    processor = DataProcessor()
-    processor.add_data_source(steam_source)
-    processor.add_data_source(reddit_source)
+    if cache is not None:
+        steam_source.set_cache(cache)
+        reddit_source.set_cache(cache)
+    if REDDIT_INCREMENTAL and not REDDIT_FEED:
+        reddit_source.set_state_store(RedditStateStore(STATE_DIR))
+    if STEAM_HISTORY:
+        steam_source.set_snapshot_store(get_snapshot_store())
     
+    return [steam_source, reddit_source]
+
+def register_sources(processor: DataProcessor, game_name: str, app_id: str,
+                     http_client: HttpClient = None, reddit_client=None, cache: ResponseCache = None,
+                     from_archive: bool = REDDIT_FROM_ARCHIVE):
+    """@brief Create the data sources of one game and register them in the processor
+    @param processor Data processor to register the sources in
+    @param game_name Name of the game
+    @param app_id Steam App ID of the game
+    @param http_client Shared HTTP client (optional)
+    @param reddit_client Shared Reddit API client (optional)
+    @param cache Shared response cache (optional)
+    @param from_archive Count Reddit mentions from archived posts instead of fetching them
+    """
+    add_sources(processor, create_sources(game_name, app_id, http_client, reddit_client, cache, from_archive))
+
+def add_sources(processor: DataProcessor, sources: List[BaseDataSource]):
+    """@brief Register data sources with their configured fetch deadlines
+    @param processor Data processor to register the sources in
+    @param sources Data sources to register
+    """
+    for source in sources:
+        processor.add_data_source(source, timeout=FETCH_TIMEOUTS.get(source.name))
+
+def game_outputs(output_dir: str, game_name: str) -> Dict[str, str]:
+    """@brief Get the output paths of one game in batch and daemon mode
+    @param output_dir Root directory for per-game outputs
+    @param game_name Name of the game
+    @return Output paths with keys "report", "data", "parquet", "arrow" and "plot"
+    @retval Dict[str, str] Output paths
+    """
+    game_dir = game_output_dir(output_dir, game_name)
+    return {
+        "report": os.path.join(game_dir, "output.csv"),
+        "data": os.path.join(game_dir, "data.csv"),
+        "parquet": os.path.join(output_dir, "parquet"),
+        "arrow": os.path.join(game_dir, "data.arrow"),
+        "plot": os.path.join(game_dir, "plot.png")
+    }
+
+def run_analysis(processor: DataProcessor, game_name: str, outputs: Dict[str, str],
+                 fast_plot: bool = FAST_PLOTS, plot: bool = CREATE_PLOTS, stats_only: bool = False,
+                 batch: CombinedBatch = None, result_store: ResultStore = None) -> bool:
+    """@brief Run fetch, statistics, combination, reports and plots for the registered sources
+    @param processor Data processor with the sources of one game
+    @param game_name Name of the game
+    @param outputs Output paths with keys "report", "data", "parquet", "arrow" and "plot"
+    @param fast_plot Use the fast rendering mode for the plot
+    @param plot Create the plot (matplotlib is not imported otherwise)
+    @param stats_only Stop after printing statistics
+    @param batch Batch collecting the combined data of many games (optional)
+    @param result_store Store the finished result is published to for the API server (optional)
+    @return True if the analysis completed
+    @retval bool Completion flag
+    """
     # Fetch data (polymorphic interface)
     print("Fetching data from all sources...")
-    data = processor.fetch_all_data()
+    with metrics.stage("fetch"):
+        processor.fetch_all_data()
+    for source_name, status in processor.fetch_status.items():
+        metrics.incr("fetches", source=source_name, status=status)
+        if status != DataProcessor.STATUS_OK:
+            print(f"[{source_name}] Fetch status: {status}")
     
     # Get statistics (polymorphic interface)
     print("Getting statistics...")
-    stats = processor.get_all_statistics()
+    with metrics.stage("statistics"):
+        stats = processor.get_all_statistics()
     if stats:
         Reporter.print_statistics(stats)
+    if ANOMALY_DETECTION:
+        with metrics.stage("anomalies"):
+            events = processor.detect_anomalies(game_name, ANOMALY_COLUMNS)
+        for event in events:
+            metrics.incr("anomalies", detector=event.detector, kind=event.kind)
+        Reporter.print_anomalies(events)
+    if stats_only:
+        return True
     
     # Combine data
     print("Combining data...")
     try:
-        combined_df = processor.combine_data()
-        combined_df = processor.add_comments(combined_df)
+        with metrics.stage("combine"):
+            combined_df = processor.combine_data()
+        with metrics.stage("annotate"):
+            combined_df = processor.add_comments(combined_df)
+        if batch is not None:
+            with metrics.stage("batch"):
+                processor.add_to_batch(batch, game_name, combined_df)
     except Exception as e:
         print(f"Error combining  {e}")
-        return
+        metrics.incr("errors", stage="combine")
+        return False
+    metrics.incr("rows", len(combined_df))
+    if result_store is not None and len(combined_df):
+        publish_result(result_store, game_name, combined_df, stats,
+                       processor.recent_anomalies(game_name, ANOMALY_COLUMNS, DAYS) if ANOMALY_DETECTION else [])
     
     # Generate reports
     print("Generating reports...")
-    Reporter.print_console_table(combined_df, DAYS, GAME_NAME)
-    Reporter.save_formatted_csv(combined_df, "output.csv", DAYS, GAME_NAME)
+    with metrics.stage("report"):
+        Reporter.print_console_table(combined_df, DAYS, game_name)
+        for exporter in create_exporters(EXPORT_FORMATS, outputs, EXPORT_COMPRESSION):
+            exporter.export(combined_df, game_name, DAYS)
     
     # Visualization
+    if not plot:
+        return True
     print("Creating plots...")
-    Visualizer.create_plot(combined_df, GAME_NAME, "plot.png")
+    with metrics.stage("plot"):
+        from core.visualizer import Visualizer
+        Visualizer.create_plot(combined_df, game_name, outputs["plot"], fast=fast_plot, max_points=PLOT_MAX_POINTS)
+    return True
+
+def publish_result(result_store: ResultStore, game_name: str, combined_df: pd.DataFrame,
+                   stats: Dict[str, DataSourceStats], events: List[AnomalyEvent]):
+    """@brief Publish the result of one game to the API server
+    @details Columns are copied, so the published result does not share
+             memory with sources that are updated in the next cycle
+    @param result_store Store read by the API server
+    @param game_name Name of the game
+    @param combined_df Combined and annotated data
+    @param stats Statistics per source
+    @param events Anomalies of the analysis period, including days scored in earlier runs
+    """
+    dates = combined_df["Date"].to_numpy()
+    columns = {
+        name: combined_df[name].to_numpy(copy=True)
+        for name in combined_df.columns if name not in ("Date", "Comment")
+    }
+    comments = (combined_df["Comment"].to_numpy(dtype=object, copy=True) if "Comment" in combined_df.columns
+                else np.full(len(dates), "", dtype=object))
+    start_day = epoch_day(date.fromisoformat(str(dates[0])))
+    result_store.publish(GameResult(game_name, start_day, columns, comments, dict(stats), list(events)))
+
+def export_metrics():
+    """@brief Write the run metrics as JSON and Prometheus text files
+    @details Does nothing when instrumentation is disabled
+    """
+    if not metrics.enabled:
+        return
+    metrics.write_json(METRICS_JSON_PATH)
+    metrics.write_prometheus(METRICS_PROMETHEUS_PATH)
+    print(f"Metrics saved to {METRICS_JSON_PATH} and {METRICS_PROMETHEUS_PATH}")
+
+def main(plot: bool = CREATE_PLOTS, stats_only: bool = False, from_archive: bool = REDDIT_FROM_ARCHIVE):
+    """@brief Main application entry point
+    @details Orchestrates the entire data analysis process:
+             1. Loads configuration
+             2. Creates data sources
+             3. Fetches data
+             4. Processes and combines data
+             5. Generates reports
+             6. Creates visualizations
+    @param plot Create the plot
+    @param stats_only Stop after printing statistics
+    @param from_archive Count Reddit mentions from archived posts instead of fetching them
+    """
+    print("Starting data analysis...")
+    
+    # Load environment variables
+    load_environment()
+    
+    # Create data processor and sources
+    cache = create_cache()
+    processor = DataProcessor(concurrent=CONCURRENT_FETCH)
+    watch_feed_anomalies(processor, from_archive)
+    http_client = create_http_client()
+    register_sources(processor, GAME_NAME, STEAM_APP_ID, http_client=http_client, cache=cache,
+                     from_archive=from_archive)
     
-    print("Analysis completed!")
+    outputs = {
+        "report": "output.csv",
+        "data": "data.csv",
+        "parquet": PARQUET_DIR,
+        "arrow": f"{game_slug(GAME_NAME)}.arrow",
+        "plot": "plot.png"
+    }
+    try:
+        completed = run_analysis(processor, GAME_NAME, outputs, plot=plot, stats_only=stats_only)
+    finally:
+        http_client.close()
+    print_cache_statistics(cache)
+    export_metrics()
+    if completed:
+        print("Analysis completed!")
+
+def run_batch(games: List[Tuple[str, str]], output_dir: str = OUTPUT_DIR,
+              plot: bool = CREATE_PLOTS, stats_only: bool = False, from_archive: bool = REDDIT_FROM_ARCHIVE):
+    """@brief Analyze several games in a single run
+    @details One processor, one HTTP client and one Reddit client are shared
+             by all games; each game writes its files into its own directory
+             under output_dir.
+    @param games List of (game name, Steam App ID) pairs
+    @param output_dir Root directory for per-game outputs
+    @param plot Create a plot for every game
+    @param stats_only Stop after printing statistics
+    @param from_archive Count Reddit mentions from archived posts instead of fetching them
+    """
+    print(f"Starting batch analysis of {len(games)} games...")
+    
+    load_environment()
+    
+    processor = DataProcessor(concurrent=CONCURRENT_FETCH)
+    http_client = create_http_client()
+    reddit_client = create_reddit_client(REDDIT_CONFIG) if REDDIT_CONFIG["client_id"] else None
+    cache = create_cache()
+    games = resolve_app_ids(games, http_client)
+    track_feed_games(games, from_archive)
+    watch_feed_anomalies(processor, from_archive)
+    batch = None
+    if not stats_only:
+        batch = CombinedBatch.for_last_days(DAYS, [SteamDataSource.column, RedditDataSource.column],
+                                            processor.annotation_engine.labels, capacity=len(games))
+    
+    completed = 0
+    try:
+        for game_name, app_id in games:
+            print(f"\n### {game_name} (app {app_id})")
+            processor.clear_data_sources()
+            register_sources(processor, game_name, app_id, http_client=http_client,
+                             reddit_client=reddit_client, cache=cache, from_archive=from_archive)
+            
+            outputs = game_outputs(output_dir, game_name)
+            if run_analysis(processor, game_name, outputs, fast_plot=True, plot=plot, stats_only=stats_only,
+                            batch=batch):
+                completed += 1
+    finally:
+        http_client.close()
+        if plot and not stats_only:
+            from core.visualizer import Visualizer
+            Visualizer.close()
+    
+    if batch is not None and len(batch):
+        Reporter.print_batch_summary(batch)
+        os.makedirs(output_dir, exist_ok=True)
+        Reporter.save_batch_csv(batch, os.path.join(output_dir, "combined.csv"))
+    print_cache_statistics(cache)
+    metrics.incr("games", completed, status="completed")
+    export_metrics()
+    print(f"\nBatch analysis completed: {completed}/{len(games)} games")
+
+def run_daemon(games: List[Tuple[str, str]], interval: float = DAEMON_INTERVAL, jitter: float = DAEMON_JITTER,
+               output_dir: str = OUTPUT_DIR, plot: bool = CREATE_PLOTS, max_cycles: int = None,
+               serve: bool = False, host: str = API_HOST, port: int = API_PORT,
+               from_archive: bool = REDDIT_FROM_ARCHIVE):
+    """@brief Track games continuously in one long-running process
+    @details Environment, HTTP client, Reddit client, cache and data sources
+             are created once and stay warm between cycles. Every game gets
+             its own slot within the interval (see Scheduler), so requests to
+             SteamSpy and Reddit are spread out instead of arriving in bursts.
+             A source whose fetch is still running from the previous cycle
+             is awaited briefly and otherwise skipped. SIGINT/SIGTERM stop the daemon after the current game. With
+             serve, the latest result of every game is also available from
+             a local JSON API (see ApiServer) while the daemon runs.
+    @param games List of (game name, Steam App ID) pairs
+    @param interval Time between two updates of the same game in seconds
+    @param jitter Maximum random shift of every update in seconds
+    @param output_dir Root directory for per-game outputs
+    @param plot Create a plot on every update
+    @param max_cycles Stop after every game was updated this many times (runs forever if None)
+    @param serve Serve the results over HTTP
+    @param host Interface of the API server
+    @param port TCP port of the API server
+    @param from_archive Count Reddit mentions from archived posts instead of fetching them
+    """
+    import signal
+    
+    print(f"Starting daemon for {len(games)} games (interval {interval}s, jitter {jitter}s)...")
+    load_environment()
+    
+    processor = DataProcessor(concurrent=CONCURRENT_FETCH)
+    watch_feed_anomalies(processor, from_archive)
+    http_client = create_http_client()
+    reddit_client = create_reddit_client(REDDIT_CONFIG) if REDDIT_CONFIG["client_id"] else None
+    cache = create_cache()
+    games = resolve_app_ids(games, http_client)
+    scheduler = Scheduler(interval, jitter)
+    result_store = ResultStore() if serve else None
+    
+    for game_name, app_id in games:
+        sources = create_sources(game_name, app_id, http_client, reddit_client, cache, from_archive)
+        outputs = game_outputs(output_dir, game_name)
+        
+        def update(game_name=game_name, sources=sources, outputs=outputs):
+            print(f"\n### {game_name}")
+            # A fetch that missed its deadline last cycle may still run on the
+            # same source objects, give it a moment instead of fetching twice
+            for source in processor.wait_pending(sources, DAEMON_PENDING_WAIT):
+                print(f"[{source.name}] Fetch of the previous cycle still running")
+            processor.clear_data_sources()
+            add_sources(processor, sources)
+            run_analysis(processor, game_name, outputs, fast_plot=True, plot=plot, result_store=result_store)
+            export_metrics()
+        
+        scheduler.add_job(game_name, update)
+    
+    def handle_signal(signum, frame):
+        print(f"Received signal {signum}, stopping after the current game...")
+        scheduler.stop()
+    
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    
+    server = ApiServer(result_store, host, port, cache_size=API_CACHE_SIZE) if serve else None
+    try:
+        if server is not None:
+            server.start()
+        scheduler.run(max_cycles=max_cycles)
+    finally:
+        if server is not None:
+            server.stop()
+        http_client.close()
+        if plot:
+            from core.visualizer import Visualizer
+            Visualizer.close()
+        print_cache_statistics(cache)
+    print("Daemon stopped")
+
+def backfill(games: List[Tuple[str, str]], days: int, output_dir: str = OUTPUT_DIR, plot: bool = CREATE_PLOTS,
+             workers: int = BACKFILL_WORKERS):
+    """@brief Rebuild the history of many games from local data on all cores
+    @details Steam owners come from the snapshot store and Reddit mentions
+             from the post archive, so nothing is fetched. Each game gets
+             history.csv, history_report.csv and history.png in its output
+             directory. An interrupted backfill continues where it stopped
+             when run again with the same games and days.
+    @param games List of (game name, Steam App ID) pairs
+    @param days Number of days of history up to today
+    @param output_dir Root directory for per-game outputs
+    @param plot Create a history plot per game
+    @param workers Number of worker processes (all cores if None)
+    """
+    games = resolve_app_ids(games)
+    end_day = epoch_day(datetime.now(timezone.utc).date()) + 1
+    run_backfill(games, end_day - days, end_day, output_dir, BACKFILL_DIR,
+                 SNAPSHOT_DIR if STEAM_HISTORY else None, ARCHIVE_DIR, workers=workers,
+                 chunk_days=BACKFILL_CHUNK_DAYS, plot=plot, max_points=PLOT_MAX_POINTS)
+    export_metrics()
+
+def load_games_file(filename: str) -> List[Tuple[str, str]]:
+    """@brief Load a games list from a CSV file
+    @details Each line holds a game name and optionally its Steam App ID (resolved
+             from the local catalog if missing), lines starting with '#' are ignored
+    @param filename Path to the CSV file
+    @return List of (game name, Steam App ID) pairs, the app id is empty if not given
+    @retval List[Tuple[str, str]] Games to track
+    """
+    games = []
+    with open(filename, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith("#"):
+                continue
+            games.append((row[0].strip(), row[1].strip() if len(row) > 1 else ""))
+    return games
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """@brief Parse command line arguments
+    @param argv Argument list (defaults to sys.argv)
+    @return Parsed arguments
+    @retval argparse.Namespace Command line options
+    """
+    parser = argparse.ArgumentParser(description="Steam and Reddit game popularity tracker")
+    parser.add_argument("--batch", action="store_true",
+                        help="track all games from config.GAMES (or --games) in one run")
+    parser.add_argument("--games", metavar="FILE",
+                        help="CSV file with 'game name[,app id]' lines for batch mode")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help="root directory for per-game outputs in batch mode")
+    parser.add_argument("--no-plot", action="store_true",
+                        help="skip plotting (matplotlib is not imported)")
+    parser.add_argument("--stats-only", action="store_true",
+                        help="only fetch data and print statistics")
+    parser.add_argument("--daemon", action="store_true",
+                        help="keep running and update all games every --interval seconds")
+    parser.add_argument("--interval", type=float, default=DAEMON_INTERVAL,
+                        help="seconds between two updates of the same game in daemon mode")
+    parser.add_argument("--jitter", type=float, default=DAEMON_JITTER,
+                        help="maximum random shift of every update in daemon mode")
+    parser.add_argument("--serve", action="store_true",
+                        help="serve the latest results as JSON over HTTP in daemon mode")
+    parser.add_argument("--port", type=int, default=API_PORT,
+                        help="TCP port of the JSON API (--serve)")
+    parser.add_argument("--from-archive", action="store_true",
+                        help="count Reddit mentions from archived posts instead of fetching them")
+    parser.add_argument("--backfill", type=int, metavar="DAYS",
+                        help="rebuild DAYS days of history for all games from local data using all cores")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS,
+                        help="number of backfill worker processes (default: all cores)")
+    parser.add_argument("--refresh-catalog", nargs="?", type=int, const=0, metavar="PAGES",
+                        help="load the SteamSpy app listing into the local catalog (at most PAGES pages)")
+    parser.add_argument("--lookup", metavar="NAME",
+                        help="look up a game name in the local catalog")
+    parser.add_argument("--metrics", action="store_true",
+                        help="record stage timings and API counters (JSON and Prometheus output)")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = parse_args()
+    plot = CREATE_PLOTS and not args.no_plot
+    metrics.enable(METRICS_ENABLED or args.metrics)
+    from_archive = REDDIT_FROM_ARCHIVE or args.from_archive
+    if args.refresh_catalog is not None:
+        refresh_catalog(args.refresh_catalog or None)
+    elif args.lookup:
+        print_catalog_matches(args.lookup)
+    elif args.backfill:
+        backfill(load_games_file(args.games) if args.games else GAMES, args.backfill, args.output_dir,
+                 plot=plot, workers=args.workers)
+    elif args.daemon:
+        run_daemon(load_games_file(args.games) if args.games else GAMES, args.interval, args.jitter,
+                   args.output_dir, plot=plot, serve=args.serve, port=args.port, from_archive=from_archive)
+    elif args.batch or args.games:
+        run_batch(load_games_file(args.games) if args.games else GAMES, args.output_dir,
+                  plot=plot, stats_only=args.stats_only, from_archive=from_archive)
+    else:
+        main(plot=plot, stats_only=args.stats_only, from_archive=from_archive)
\ No newline at end of file
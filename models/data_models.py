@@ -1,53 +1,392 @@
 """ Data model definitions """
-from dataclasses import dataclass
-from typing import Dict, Any
-from datetime import datetime
+from __future__ import annotations
+from typing import Dict, Any, List, Optional, Sequence, TYPE_CHECKING
+from datetime import datetime, timezone
+import numpy as np
+from models.time_series import date_strings, epoch_day
 
-@dataclass
-class DataSourceStats:
+if TYPE_CHECKING:
+    import pandas as pd
+
+def _field_equal(left: Any, right: Any) -> bool:
+    """@brief Compare two field values, element-wise for arrays and containers
+    @param left First value
+    @param right Second value
+    @return True if the values are equal
+    @retval bool Equality
+    """
+    if isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+        return np.array_equal(left, right)
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(_field_equal(left[key], right[key]) for key in left)
+    if isinstance(left, (list, tuple)) and isinstance(right, (list, tuple)):
+        return len(left) == len(right) and all(_field_equal(a, b) for a, b in zip(left, right))
+    return bool(left == right)
+
+class _Record:
+    """@brief Base of the slotted record types
+    @details Records declare their fields in __slots__ instead of using
+             dataclasses, which only generate slots from Python 3.10 on.
+             Comparison and repr follow the declared fields; array fields
+             compare element-wise.
+    """
+    
+    __slots__ = ()
+    
+    def __eq__(self, other) -> bool:
+        """@brief Compare two records field by field
+        @param other Object to compare with
+        @return True if other is a record of the same type with equal fields
+        @retval bool Equality
+        """
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(_field_equal(getattr(self, name), getattr(other, name)) for name in self.__slots__)
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        """@brief Describe the record with its fields
+        @return Representation like ClassName(field=value, ...)
+        @retval str Record representation
+        """
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({fields})"
+
+class DataSourceStats(_Record):
     """@brief Statistics for a data source
     @details Contains statistical information about data from a specific source
     """
     
-    ## @brief Total count of items
-    total: int
+    __slots__ = ("total", "average_daily", "max_daily", "min_daily", "data_source", "timestamp")
+    
+    def __init__(self, total: int, average_daily: float, max_daily: int, min_daily: int, data_source: str,
+                 timestamp: datetime = None):
+        """@brief Initialize the statistics
+        @param total Total count of items
+        @param average_daily Average daily count
+        @param max_daily Maximum daily count
+        @param min_daily Minimum daily count
+        @param data_source Name of the data source
+        @param timestamp Time the statistics were calculated (now if None)
+        """
+        ## @brief Total count of items
+        self.total = total
+        
+        ## @brief Average daily count
+        self.average_daily = average_daily
+        
+        ## @brief Maximum daily count
+        self.max_daily = max_daily
+        
+        ## @brief Minimum daily count
+        self.min_daily = min_daily
+        
+        ## @brief Name of the data source
+        self.data_source = data_source
+        
+        ## @brief Timestamp of when statistics were calculated
+        self.timestamp = timestamp if timestamp is not None else datetime.now()
+
+class CombinedData(_Record):
+    """@brief Combined data from multiple sources
+    @details Represents data points that combine information from different sources
+    """
     
-    ## @brief Average daily count
-    average_daily: float
+    __slots__ = ("date", "steam_subscribers", "reddit_mentions", "comment")
     
-    ## @brief Maximum daily count
-    max_daily: int
+    def __init__(self, date: str, steam_subscribers: int, reddit_mentions: int, comment: str = ""):
+        """@brief Initialize the data point
+        @param date Date of the data point
+        @param steam_subscribers Number of Steam subscribers
+        @param reddit_mentions Number of Reddit mentions
+        @param comment Optional comment about the data point
+        """
+        ## @brief Date of the data point
+        self.date = date
+        
+        ## @brief Number of Steam subscribers
+        self.steam_subscribers = steam_subscribers
+        
+        ## @brief Number of Reddit mentions
+        self.reddit_mentions = reddit_mentions
+        
+        ## @brief Optional comment about the data point
+        self.comment = comment
+
+class CatalogEntry(_Record):
+    """@brief Steam application from the local catalog
+    @details One row of the SteamSpy app listing
+    """
     
-    ## @brief Minimum daily count
-    min_daily: int
+    __slots__ = ("app_id", "name", "owners")
     
-    ## @brief Name of the data source
-    data_source: str
+    def __init__(self, app_id: int, name: str, owners: int = 0):
+        """@brief Initialize the entry
+        @param app_id Steam App ID
+        @param name Application name as listed by SteamSpy
+        @param owners Lower bound of the owner range
+        """
+        ## @brief Steam App ID
+        self.app_id = app_id
+        
+        ## @brief Application name as listed by SteamSpy
+        self.name = name
+        
+        ## @brief Lower bound of the owner range
+        self.owners = owners
+
+class AnomalyEvent(_Record):
+    """@brief Unusual daily value found by a streaming detector
+    @details Emitted once per detector for every closed day whose value
+             deviates from the learned baseline by more than the threshold
+    """
     
-    ## @brief Timestamp of when statistics were calculated
-    timestamp: datetime = None
+    __slots__ = ("key", "date", "value", "baseline", "score", "detector", "kind")
     
-    def __post_init__(self):
-        """@brief Post-initialization method
-        @details Sets timestamp if not provided
+    def __init__(self, key: str, date: str, value: int, baseline: float, score: float, detector: str,
+                 kind: str = "spike"):
+        """@brief Initialize the event
+        @param key Tracked series (game name and column)
+        @param date Day of the value in YYYY-MM-DD format
+        @param value Observed value
+        @param baseline Value expected by the detector
+        @param score Deviation in standard deviations (positive for spikes)
+        @param detector Name of the detector
+        @param kind "spike" or "drop"
         """
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+        ## @brief Tracked series (game name and column)
+        self.key = key
+        
+        ## @brief Day of the value in YYYY-MM-DD format
+        self.date = date
+        
+        ## @brief Observed value
+        self.value = value
+        
+        ## @brief Value expected by the detector
+        self.baseline = baseline
+        
+        ## @brief Deviation in standard deviations (positive for spikes)
+        self.score = score
+        
+        ## @brief Name of the detector
+        self.detector = detector
+        
+        ## @brief "spike" or "drop"
+        self.kind = kind
 
-@dataclass
-class CombinedData:
-    """@brief Combined data from multiple sources
-    @details Represents data points that combine information from different sources
+class GameResult(_Record):
+    """@brief Published analysis result of one game
+    @details Immutable once published: the arrays are private copies, so
+             readers can use a result while a newer one is being computed
     """
     
-    ## @brief Date of the data point
-    date: str
+    __slots__ = ("game", "start_day", "columns", "comments", "statistics", "anomalies", "version", "updated_at")
     
-    ## @brief Number of Steam subscribers
-    steam_subscribers: int
+    def __init__(self, game: str, start_day: int, columns: Dict[str, np.ndarray], comments: np.ndarray,
+                 statistics: Dict[str, DataSourceStats], anomalies: List[AnomalyEvent], version: int = 0,
+                 updated_at: float = 0.0):
+        """@brief Initialize the result
+        @param game Name of the game
+        @param start_day Day ordinal of the first value
+        @param columns Values per column name, one per day
+        @param comments Comment per day ("" where no rule matched)
+        @param statistics Statistics per source name
+        @param anomalies Recent anomalies of the game
+        @param version Data version assigned when the result is published
+        @param updated_at Unix time of publication
+        """
+        ## @brief Name of the game
+        self.game = game
+        
+        ## @brief Day ordinal of the first value
+        self.start_day = start_day
+        
+        ## @brief Values per column name, one per day
+        self.columns = columns
+        
+        ## @brief Comment per day ("" where no rule matched)
+        self.comments = comments
+        
+        ## @brief Statistics per source name
+        self.statistics = statistics
+        
+        ## @brief Recent anomalies of the game
+        self.anomalies = anomalies
+        
+        ## @brief Data version assigned when the result is published
+        self.version = version
+        
+        ## @brief Unix time of publication
+        self.updated_at = updated_at
     
-    ## @brief Number of Reddit mentions
-    reddit_mentions: int
+    def dates(self) -> np.ndarray:
+        """@brief Get the date labels of the values
+        @return Array of 'YYYY-MM-DD' strings
+        @retval np.ndarray Cached read-only labels
+        """
+        return date_strings(self.start_day, len(self.comments))
+
+class CombinedBatch:
+    """@brief Combined data of many games as one struct of arrays
+    @details All games share one day range. Every column is a single int64
+             array of shape (games, days) and comments are stored as int8
+             codes into labels, so a batch holds no per-row objects and its
+             size is fixed by games x days x columns. Rows grow by doubling
+             the game axis. CombinedData records and DataFrames are built on
+             demand for single rows and games.
+    """
+    
+    __slots__ = ("start_day", "length", "column_names", "labels", "games", "_values", "_comments")
     
-    ## @brief Optional comment about the data point
-    comment: str = ""
\ No newline at end of file
+    def __init__(self, start_day: int, length: int, column_names: Sequence[str],
+                 labels: Sequence[str] = (), capacity: int = 16):
+        """@brief Initialize an empty batch
+        @param start_day Day ordinal of the first day
+        @param length Number of days
+        @param column_names Names of the value columns
+        @param labels Comment labels, code i refers to labels[i - 1] and code 0 is no comment
+        @param capacity Number of games allocated up front
+        """
+        ## @brief Day ordinal of the first day
+        self.start_day = int(start_day)
+        
+        ## @brief Number of days
+        self.length = int(length)
+        
+        ## @brief Names of the value columns
+        self.column_names = list(column_names)
+        
+        ## @brief Comment labels
+        self.labels = list(labels)
+        
+        ## @brief Game names in row order
+        self.games: List[str] = []
+        
+        self._values = np.zeros((len(self.column_names), capacity, self.length), dtype=np.int64)
+        self._comments = np.zeros((capacity, self.length), dtype=np.int8)
+    
+    @classmethod
+    def for_last_days(cls, days: int, column_names: Sequence[str], labels: Sequence[str] = (),
+                      capacity: int = 16) -> CombinedBatch:
+        """@brief Create a batch covering the last days up to today (UTC)
+        @param days Number of days
+        @param column_names Names of the value columns
+        @param labels Comment labels
+        @param capacity Number of games allocated up front
+        @return Empty batch
+        @retval CombinedBatch New batch
+        """
+        start_day = epoch_day(datetime.now(timezone.utc).date()) - days + 1
+        return cls(start_day, days, column_names, labels, capacity)
+    
+    def __len__(self) -> int:
+        """@brief Number of games in the batch
+        @return Game count
+        @retval int Number of rows along the game axis
+        """
+        return len(self.games)
+    
+    def add(self, game_name: str, columns: Dict[str, np.ndarray], comments: Optional[np.ndarray] = None) -> int:
+        """@brief Append the data of one game
+        @param game_name Name of the game
+        @param columns Values per column name, one value per day of the batch (missing columns stay 0)
+        @param comments Comment codes per day (optional)
+        @return Row of the game
+        @retval int Row number
+        """
+        row = len(self.games)
+        if row == self._values.shape[1]:
+            self._grow(2 * row)
+        for index, name in enumerate(self.column_names):
+            if name in columns:
+                self._values[index, row] = columns[name]
+        if comments is not None:
+            self._comments[row] = comments
+        self.games.append(game_name)
+        return row
+    
+    def values(self, column: str) -> np.ndarray:
+        """@brief Get one column for all games
+        @param column Column name
+        @return View of shape (games, days)
+        @retval np.ndarray int64 values
+        """
+        return self._values[self.column_names.index(column), :len(self.games)]
+    
+    def comment_codes(self) -> np.ndarray:
+        """@brief Get the comment codes of all games
+        @return View of shape (games, days)
+        @retval np.ndarray int8 codes (0 for no comment)
+        """
+        return self._comments[:len(self.games)]
+    
+    def dates(self) -> np.ndarray:
+        """@brief Get the date labels of the day axis
+        @return Array of 'YYYY-MM-DD' strings
+        @retval np.ndarray Cached read-only labels
+        """
+        return date_strings(self.start_day, self.length)
+    
+    def statistics(self, column: str) -> Dict[str, np.ndarray]:
+        """@brief Compute per-game statistics of one column in a single vectorized pass
+        @param column Column name
+        @return Arrays with one total, average_daily, max_daily and min_daily value per game
+        @retval Dict[str, np.ndarray] Statistics per game
+        """
+        values = self.values(column)
+        if values.shape[1] == 0:
+            zeros = np.zeros(len(self.games), dtype=np.int64)
+            return {"total": zeros, "average_daily": zeros.astype(float), "max_daily": zeros, "min_daily": zeros}
+        return {
+            "total": values.sum(axis=1),
+            "average_daily": values.mean(axis=1),
+            "max_daily": values.max(axis=1),
+            "min_daily": values.min(axis=1)
+        }
+    
+    def row(self, game: int, day: int) -> CombinedData:
+        """@brief Build the record of one game and day
+        @param game Row of the game
+        @param day Index of the day in the batch
+        @return Combined data point
+        @retval CombinedData Record with Steam, Reddit and comment values
+        """
+        def value(column: str) -> int:
+            return int(self.values(column)[game, day]) if column in self.column_names else 0
+        
+        code = int(self._comments[game, day])
+        return CombinedData(
+            date=str(self.dates()[day]),
+            steam_subscribers=value("Steam Subscribers"),
+            reddit_mentions=value("Reddit Mentions"),
+            comment=self.labels[code - 1] if code else ""
+        )
+    
+    def game_frame(self, game: int) -> pd.DataFrame:
+        """@brief Get the data of one game as a DataFrame
+        @details Value columns are views of the batch arrays
+        @param game Row of the game
+        @return DataFrame with Date, value and Comment columns
+        @retval pd.DataFrame Combined data of the game
+        """
+        import pandas as pd
+        
+        columns = {"Date": self.dates()}
+        for index, name in enumerate(self.column_names):
+            columns[name] = self._values[index, game]
+        columns["Comment"] = np.array([""] + self.labels, dtype=object)[self._comments[game]]
+        return pd.DataFrame(columns, copy=False)
+    
+    def _grow(self, capacity: int):
+        """@brief Enlarge the game axis, keeping existing rows
+        @param capacity New number of allocated games
+        """
+        capacity = max(capacity, 16)
+        values = np.zeros((len(self.column_names), capacity, self.length), dtype=np.int64)
+        values[:, :len(self.games)] = self._values[:, :len(self.games)]
+        comments = np.zeros((capacity, self.length), dtype=np.int8)
+        comments[:len(self.games)] = self._comments[:len(self.games)]
+        self._values = values
+        self._comments = comments
\ No newline at end of file
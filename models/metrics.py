@@ -0,0 +1,189 @@
+"""Run instrumentation: stage timings and counters"""
+import os
+import json
+import time
+import threading
+from typing import Dict, Any, Tuple
+
+## @brief Prefix of exported Prometheus metric names
+METRIC_PREFIX = "game_tracker"
+
+class _NullStage:
+    """@brief No-op context manager returned while metrics are disabled"""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+## @brief Shared no-op stage
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    """@brief Context manager measuring the wall time of one stage"""
+    
+    __slots__ = ("metrics", "name", "started")
+    
+    def __init__(self, metrics: "Metrics", name: str):
+        """@brief Initialize the stage timer
+        @param metrics Owning metrics registry
+        @param name Stage name
+        """
+        self.metrics = metrics
+        self.name = name
+        self.started = 0.0
+    
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        self.metrics.observe_stage(self.name, time.perf_counter() - self.started)
+        return False
+
+class Metrics:
+    """@brief Registry of stage timings and labelled counters
+    @details Stages record their count and total wall time; counters are keyed
+             by name and labels (for example api_calls with source="Steam").
+             While disabled, stage() returns a shared no-op context manager
+             and incr() returns immediately, so instrumentation can stay in
+             hot paths.
+    """
+    
+    def __init__(self, enabled: bool = False):
+        """@brief Initialize the registry
+        @param enabled Record metrics
+        """
+        ## @brief Record metrics
+        self.enabled = enabled
+        
+        ## @brief Stage name -> {"count": int, "seconds": float}
+        self.stages: Dict[str, Dict[str, float]] = {}
+        
+        ## @brief (name, labels) -> value
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        
+        ## @brief Time the registry was created or reset
+        self.started_at = time.time()
+        
+        self._lock = threading.Lock()
+    
+    def enable(self, enabled: bool = True):
+        """@brief Switch recording on or off
+        @param enabled Record metrics
+        """
+        self.enabled = enabled
+    
+    def reset(self):
+        """@brief Drop all recorded values"""
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+            self.started_at = time.time()
+    
+    def stage(self, name: str):
+        """@brief Time a pipeline stage
+        @param name Stage name (fetch, statistics, combine, ...)
+        @return Context manager recording the wall time of its block
+        @retval _Stage Stage timer (no-op while disabled)
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+    
+    def observe_stage(self, name: str, seconds: float):
+        """@brief Record one execution of a stage
+        @param name Stage name
+        @param seconds Wall time in seconds
+        """
+        with self._lock:
+            stage = self.stages.setdefault(name, {"count": 0, "seconds": 0.0})
+            stage["count"] += 1
+            stage["seconds"] += seconds
+    
+    def incr(self, name: str, value: float = 1, **labels: str):
+        """@brief Increase a counter
+        @param name Counter name (api_calls, bytes, errors, retries, cache_hits, ...)
+        @param value Amount to add
+        @param labels Label values such as source="Steam"
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """@brief Export all values as a JSON-serializable dictionary
+        @return Stages and counters of the run
+        @retval Dict[str, Any] Structured metrics
+        """
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration_s": time.time() - self.started_at,
+                "stages": {name: dict(values) for name, values in self.stages.items()},
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ]
+            }
+    
+    def to_prometheus(self) -> str:
+        """@brief Format all values in the Prometheus text exposition format
+        @return Metrics text
+        @retval str Text for the node_exporter textfile collector
+        """
+        with self._lock:
+            lines = [
+                f"# HELP {METRIC_PREFIX}_stage_seconds_total Wall time spent per pipeline stage",
+                f"# TYPE {METRIC_PREFIX}_stage_seconds_total counter"
+            ]
+            for name, values in sorted(self.stages.items()):
+                lines.append(f'{METRIC_PREFIX}_stage_seconds_total{{stage="{name}"}} {values["seconds"]:.6f}')
+            lines += [
+                f"# HELP {METRIC_PREFIX}_stage_runs_total Number of executions per pipeline stage",
+                f"# TYPE {METRIC_PREFIX}_stage_runs_total counter"
+            ]
+            for name, values in sorted(self.stages.items()):
+                lines.append(f'{METRIC_PREFIX}_stage_runs_total{{stage="{name}"}} {values["count"]}')
+            
+            declared = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"{METRIC_PREFIX}_{name}_total"
+                if metric not in declared:
+                    lines.append(f"# TYPE {metric} counter")
+                    declared.add(metric)
+                label_text = ",".join(f'{key}="{val}"' for key, val in labels)
+                lines.append(f"{metric}{{{label_text}}} {value:g}" if label_text else f"{metric} {value:g}")
+            lines.append(f"{METRIC_PREFIX}_last_run_timestamp_seconds {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+    
+    def write_json(self, filename: str):
+        """@brief Write the metrics as JSON
+        @param filename Output filename
+        """
+        _write_atomic(filename, json.dumps(self.to_dict(), indent=2))
+    
+    def write_prometheus(self, filename: str):
+        """@brief Write the metrics as a Prometheus text file
+        @param filename Output filename (usually *.prom in the textfile collector directory)
+        """
+        _write_atomic(filename, self.to_prometheus())
+
+def _write_atomic(filename: str, text: str):
+    """@brief Replace a file in one step so readers never see partial content
+    @param filename Output filename
+    @param text File content
+    """
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_name = filename + ".tmp"
+    with open(tmp_name, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_name, filename)
+
+## @brief Process-wide metrics registry (disabled until enabled by the caller)
+metrics = Metrics()
\ No newline at end of file
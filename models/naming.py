@@ -0,0 +1,11 @@
+"""Name helpers shared by every layer"""
+import re
+
+def game_slug(game_name: str) -> str:
+    """@brief Convert a game name into a file system friendly identifier
+    @param game_name Name of the game
+    @return Lower-case slug with non-alphanumeric runs replaced by dashes
+    @retval str Slug, e.g. "counter-strike-2"
+    """
+    slug = re.sub(r"[^a-z0-9]+", "-", game_name.lower()).strip("-")
+    return slug or "game"
\ No newline at end of file
@@ -0,0 +1,342 @@
+""" Precomputed aggregates over daily series """
+from collections import deque
+from typing import Dict, Any, List
+import numpy as np
+
+## @brief Supported rollup resolutions
+RESOLUTIONS = ("daily", "weekly", "monthly")
+
+def _sparse_table(values: np.ndarray, combine) -> List[np.ndarray]:
+    """@brief Build a sparse table for idempotent range queries (min, max)
+    @details Level k holds combine() over every run of 2**k values, so any
+             range is covered by two overlapping runs of one level
+    @param values Input values
+    @param combine Element-wise combine function (np.minimum or np.maximum)
+    @return Table levels, level 0 being the values themselves
+    @retval List[np.ndarray] Sparse table
+    """
+    table = [values]
+    width = 1
+    while 2 * width <= len(values):
+        previous = table[-1]
+        table.append(combine(previous[:-width], previous[width:]))
+        width *= 2
+    return table
+
+def _update_sparse_table(table: List[np.ndarray], values: np.ndarray, first: int, combine) -> List[np.ndarray]:
+    """@brief Bring a sparse table up to date after values changed from one index on
+    @details Only the runs that reach the first changed index are recomputed,
+             so changing or appending the last values costs O(log n) combines
+    @param table Sparse table of the previous values
+    @param values New values, equal to the previous ones before first
+    @param first Index of the first changed or appended value
+    @param combine Element-wise combine function (np.minimum or np.maximum)
+    @return Table levels of the new values
+    @retval List[np.ndarray] Sparse table
+    """
+    updated = [values]
+    width = 1
+    while 2 * width <= len(values):
+        previous = updated[-1]
+        kept = table[len(updated)] if len(updated) < len(table) else previous[:0]
+        lo = min(max(first - 2 * width + 1, 0), len(kept))
+        updated.append(np.concatenate((kept[:lo], combine(previous[lo:-width], previous[lo + width:]))))
+        width *= 2
+    return updated
+
+class RollupLevel:
+    """@brief Aggregates of a series at one resolution
+    @details Buckets are calendar days, ISO weeks (Monday to Sunday) or
+             calendar months; the first and last bucket may be partial,
+             see counts.
+    """
+    
+    __slots__ = ("resolution", "starts", "counts", "totals", "minima", "maxima")
+    
+    def __init__(self, resolution: str, starts: np.ndarray, counts: np.ndarray, totals: np.ndarray,
+                 minima: np.ndarray, maxima: np.ndarray):
+        """@brief Initialize the level
+        @param resolution Resolution name ("daily", "weekly" or "monthly")
+        @param starts Day ordinal of the first covered day of every bucket
+        @param counts Number of covered days per bucket
+        @param totals Sum per bucket
+        @param minima Minimum per bucket
+        @param maxima Maximum per bucket
+        """
+        ## @brief Resolution name
+        self.resolution = resolution
+        
+        ## @brief Day ordinal of the first covered day of every bucket
+        self.starts = starts
+        
+        ## @brief Number of covered days per bucket
+        self.counts = counts
+        
+        ## @brief Sum per bucket
+        self.totals = totals
+        
+        ## @brief Minimum per bucket
+        self.minima = minima
+        
+        ## @brief Maximum per bucket
+        self.maxima = maxima
+    
+    def __len__(self) -> int:
+        """@brief Number of buckets
+        @return Bucket count
+        @retval int Number of buckets
+        """
+        return len(self.starts)
+    
+    @property
+    def averages(self) -> np.ndarray:
+        """@brief Average daily value per bucket
+        @return Averages over the covered days
+        @retval np.ndarray float64 averages
+        """
+        return self.totals / self.counts
+    
+    def join(self, kept: int, tail: "RollupLevel") -> "RollupLevel":
+        """@brief Replace the buckets from one index on
+        @param kept Number of leading buckets to keep
+        @param tail Buckets following the kept ones
+        @return Combined level
+        @retval RollupLevel Rollup level
+        """
+        return RollupLevel(
+            self.resolution,
+            np.concatenate((self.starts[:kept], tail.starts)),
+            np.concatenate((self.counts[:kept], tail.counts)),
+            np.concatenate((self.totals[:kept], tail.totals)),
+            np.concatenate((self.minima[:kept], tail.minima)),
+            np.concatenate((self.maxima[:kept], tail.maxima))
+        )
+
+class SeriesRollup:
+    """@brief Range aggregates of a daily series in constant time
+    @details A prefix-sum array answers range sums and sparse tables answer
+             range minima and maxima with two lookups each, so statistics of
+             any window cost the same whatever its length. Weekly and monthly
+             levels are computed on first use. The rollup is meant to live as
+             long as its source: update() only recomputes what follows the
+             first changed day, so a refreshed or newly closed day does not
+             rebuild the aggregates of the whole history.
+    """
+    
+    def __init__(self, start_day: int, values: np.ndarray):
+        """@brief Precompute the aggregates
+        @param start_day Day ordinal of the first value
+        @param values One value per day
+        """
+        ## @brief Day ordinal of the first value
+        self.start_day = int(start_day)
+        
+        ## @brief Values per day
+        self.values = np.asarray(values, dtype=np.int64)
+        
+        self._prefix = np.concatenate(([0], np.cumsum(self.values, dtype=np.int64)))
+        self._minima = _sparse_table(self.values, np.minimum)
+        self._maxima = _sparse_table(self.values, np.maximum)
+        self._levels = {}
+    
+    @property
+    def end_day(self) -> int:
+        """@brief Day ordinal following the last value
+        @return Exclusive end of the covered range
+        @retval int Day ordinal
+        """
+        return self.start_day + len(self.values)
+    
+    def update(self, start_day: int, values: np.ndarray) -> int:
+        """@brief Bring the aggregates up to date with a newer version of the series
+        @details Days before the first changed one keep their aggregates and
+                 days after the new values keep their previous values. A
+                 series starting before the rollup or after its end replaces
+                 it entirely.
+        @param start_day Day ordinal of the first value
+        @param values One value per day
+        @return Day ordinal of the first changed day (end_day if nothing changed)
+        @retval int Day ordinal
+        """
+        values = np.asarray(values, dtype=np.int64)
+        offset = int(start_day) - self.start_day
+        if offset < 0 or offset > len(self.values):
+            self.__init__(start_day, values)
+            return self.start_day
+        
+        end = offset + len(values)
+        overlap = min(len(self.values), end) - offset
+        changed = np.flatnonzero(self.values[offset:offset + overlap] != values[:overlap])
+        first = offset + (int(changed[0]) if len(changed) else overlap)
+        if first >= end:
+            return self.end_day
+        
+        self.values = np.concatenate((self.values[:first], values[first - offset:], self.values[end:]))
+        self._prefix = np.concatenate((self._prefix[:first + 1],
+                                       self._prefix[first] + np.cumsum(self.values[first:], dtype=np.int64)))
+        self._minima = _update_sparse_table(self._minima, self.values, first, np.minimum)
+        self._maxima = _update_sparse_table(self._maxima, self.values, first, np.maximum)
+        for resolution, level in self._levels.items():
+            kept = max(int(np.searchsorted(level.starts, self.start_day + first, side="right")) - 1, 0)
+            lo = int(level.starts[kept]) - self.start_day if len(level) else 0
+            self._levels[resolution] = level.join(kept, self._build_level(resolution, lo))
+        return self.start_day + first
+    
+    def statistics(self, start_day: int, length: int) -> Dict[str, Any]:
+        """@brief Get statistics of a day range in O(1)
+        @details Days outside the series count as zero, like DailySeries.window()
+        @param start_day Day ordinal of the first day
+        @param length Number of days
+        @return Dictionary with total, average_daily, max_daily and min_daily
+        @retval Dict[str, Any] Statistics of the range
+        """
+        if length <= 0:
+            return {"total": 0, "average_daily": 0, "max_daily": 0, "min_daily": 0}
+        
+        lo = min(max(start_day - self.start_day, 0), len(self.values))
+        hi = min(max(start_day + length - self.start_day, 0), len(self.values))
+        if lo >= hi:
+            return {"total": 0, "average_daily": 0.0, "max_daily": 0, "min_daily": 0}
+        
+        total = int(self._prefix[hi] - self._prefix[lo])
+        minimum = self._range_query(self._minima, lo, hi, min)
+        maximum = self._range_query(self._maxima, lo, hi, max)
+        if hi - lo < length:
+            # Padded days are zeros
+            minimum = min(minimum, 0)
+            maximum = max(maximum, 0)
+        return {
+            "total": total,
+            "average_daily": total / length,
+            "max_daily": maximum,
+            "min_daily": minimum
+        }
+    
+    def level(self, resolution: str) -> RollupLevel:
+        """@brief Get the aggregates at one resolution
+        @param resolution "daily", "weekly" or "monthly"
+        @return Buckets of the whole series
+        @retval RollupLevel Rollup level
+        @exception ValueError If the resolution is unknown
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution '{resolution}', expected one of {RESOLUTIONS}")
+        if resolution not in self._levels:
+            self._levels[resolution] = self._build_level(resolution)
+        return self._levels[resolution]
+    
+    @staticmethod
+    def _range_query(table: List[np.ndarray], lo: int, hi: int, combine) -> int:
+        """@brief Answer a min/max query on [lo, hi) with two table lookups
+        @param table Sparse table
+        @param lo First index
+        @param hi Index after the last one
+        @param combine Scalar combine function (min or max)
+        @return Aggregate of the range
+        @retval int Range minimum or maximum
+        """
+        k = (hi - lo).bit_length() - 1
+        row = table[k]
+        return int(combine(row[lo], row[hi - (1 << k)]))
+    
+    def _build_level(self, resolution: str, lo: int = 0) -> RollupLevel:
+        """@brief Aggregate the series into buckets
+        @param resolution "daily", "weekly" or "monthly"
+        @param lo Index of the first aggregated value, must start a bucket
+        @return Buckets of the series from lo on
+        @retval RollupLevel Rollup level
+        """
+        values = self.values[lo:]
+        days = np.arange(self.start_day + lo, self.end_day, dtype=np.int64)
+        if resolution == "daily" or len(days) == 0:
+            ones = np.ones(len(days), dtype=np.int64)
+            return RollupLevel(resolution, days, ones, values, values, values)
+        
+        if resolution == "weekly":
+            # Day 0 (1970-01-01) is a Thursday, shift so that weeks start on Monday
+            bucket_ids = (days + 3) // 7
+        else:
+            bucket_ids = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        
+        starts = np.flatnonzero(np.diff(bucket_ids)) + 1
+        starts = np.concatenate(([0], starts))
+        counts = np.diff(np.append(starts, len(days)))
+        return RollupLevel(
+            resolution,
+            days[starts],
+            counts,
+            np.add.reduceat(values, starts),
+            np.minimum.reduceat(values, starts),
+            np.maximum.reduceat(values, starts)
+        )
+
+class SlidingWindow:
+    """@brief Statistics of the last length values, updated as values arrive
+    @details Keeps a running sum and monotonic deques of candidate minima and
+             maxima, so push() is amortized O(1) and statistics() is O(1).
+    """
+    
+    def __init__(self, length: int):
+        """@brief Initialize an empty window
+        @param length Number of most recent values covered
+        """
+        ## @brief Number of most recent values covered
+        self.length = length
+        
+        self._values = deque()
+        self._minima = deque()
+        self._maxima = deque()
+        self._total = 0
+        self._index = -1
+    
+    def __len__(self) -> int:
+        """@brief Number of values currently in the window
+        @return Covered value count (at most length)
+        @retval int Number of values
+        """
+        return len(self._values)
+    
+    def push(self, value: int):
+        """@brief Add the value of a new day and drop the oldest one if the window is full
+        @param value New value
+        """
+        value = int(value)
+        self._index += 1
+        self._values.append(value)
+        self._total += value
+        if len(self._values) > self.length:
+            self._total -= self._values.popleft()
+        
+        expired = self._index - self.length
+        while self._minima and self._minima[-1][1] >= value:
+            self._minima.pop()
+        self._minima.append((self._index, value))
+        if self._minima[0][0] <= expired:
+            self._minima.popleft()
+        
+        while self._maxima and self._maxima[-1][1] <= value:
+            self._maxima.pop()
+        self._maxima.append((self._index, value))
+        if self._maxima[0][0] <= expired:
+            self._maxima.popleft()
+    
+    def extend(self, values):
+        """@brief Add several values in order
+        @param values New values, oldest first
+        """
+        for value in values:
+            self.push(value)
+    
+    def statistics(self) -> Dict[str, Any]:
+        """@brief Get statistics of the current window
+        @return Dictionary with total, average_daily, max_daily and min_daily
+        @retval Dict[str, Any] Window statistics
+        """
+        if not self._values:
+            return {"total": 0, "average_daily": 0, "max_daily": 0, "min_daily": 0}
+        return {
+            "total": self._total,
+            "average_daily": self._total / len(self._values),
+            "max_daily": self._maxima[0][1],
+            "min_daily": self._minima[0][1]
+        }
\ No newline at end of file
@@ -0,0 +1,218 @@
+""" Columnar daily time-series storage """
+from __future__ import annotations
+import numpy as np
+from array import array
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Any, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+## @brief Number of seconds in a UTC day
+SECONDS_PER_DAY = 86400
+
+## @brief First day of the Unix epoch
+EPOCH_DATE = date(1970, 1, 1)
+
+def epoch_day(day: date) -> int:
+    """@brief Convert a date into a day ordinal counted from the Unix epoch
+    @param day Date to convert
+    @return Number of days since 1970-01-01
+    @retval int Day ordinal
+    """
+    return (day - EPOCH_DATE).days
+
+def day_to_date(day: int) -> date:
+    """@brief Convert a day ordinal back into a date
+    @param day Number of days since 1970-01-01
+    @return Calendar date
+    @retval date Date of the ordinal
+    """
+    return EPOCH_DATE + timedelta(days=int(day))
+
+def bucket_by_day(timestamps: Sequence[float], first_day: int, days: int) -> np.ndarray:
+    """@brief Count Unix timestamps per UTC day in one vectorized pass
+    @param timestamps Unix timestamps (any buffer such as array('d') or ndarray)
+    @param first_day Day ordinal of the first bucket
+    @param days Number of buckets
+    @return Counts per day, timestamps outside the range are dropped
+    @retval np.ndarray int64 array of length days
+    """
+    values = np.frombuffer(timestamps, dtype=np.float64) if isinstance(timestamps, array) \
+        else np.asarray(timestamps, dtype=np.float64)
+    if values.size == 0:
+        return np.zeros(days, dtype=np.int64)
+    offsets = np.floor_divide(values, SECONDS_PER_DAY).astype(np.int64) - first_day
+    offsets = offsets[(offsets >= 0) & (offsets < days)]
+    return np.bincount(offsets, minlength=days).astype(np.int64, copy=False)
+
+@lru_cache(maxsize=256)
+def date_strings(start_day: int, length: int) -> np.ndarray:
+    """@brief Get YYYY-MM-DD labels for a range of day ordinals
+    @details Labels are built in one vectorized pass and cached, the returned array is read-only
+    @param start_day Ordinal of the first day
+    @param length Number of days
+    @return Array of date strings
+    @retval np.ndarray Read-only array of 'YYYY-MM-DD' strings
+    """
+    labels = np.arange(start_day, start_day + length).astype('datetime64[D]').astype(str)
+    labels.flags.writeable = False
+    return labels
+
+class DailySeries:
+    """@brief Contiguous integer series indexed by day ordinal
+    @details Stores one int64 value per UTC day starting at start_day. Day
+             ordinals are counted from the Unix epoch, so aligning two series
+             is a matter of slicing with an offset.
+    """
+    
+    __slots__ = ("start_day", "values")
+    
+    def __init__(self, start_day: int, values: np.ndarray):
+        """@brief Initialize the series
+        @param start_day Day ordinal of the first value
+        @param values One value per day
+        """
+        ## @brief Day ordinal of the first value
+        self.start_day = int(start_day)
+        
+        ## @brief Values per day
+        self.values = np.ascontiguousarray(values, dtype=np.int64)
+    
+    @classmethod
+    def zeros(cls, start_day: int, length: int) -> "DailySeries":
+        """@brief Create a series filled with zeros
+        @param start_day Day ordinal of the first value
+        @param length Number of days
+        @return New series
+        @retval DailySeries Zero series
+        """
+        return cls(start_day, np.zeros(length, dtype=np.int64))
+    
+    @classmethod
+    def constant(cls, start_day: int, length: int, value: int) -> "DailySeries":
+        """@brief Create a series with the same value for every day
+        @param start_day Day ordinal of the first value
+        @param length Number of days
+        @param value Value of every day
+        @return New series
+        @retval DailySeries Constant series
+        """
+        return cls(start_day, np.full(length, value, dtype=np.int64))
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, int]) -> "DailySeries":
+        """@brief Build a series from a mapping of YYYY-MM-DD strings to values
+        @details Days missing from the mapping inside its range are set to zero
+        @param data Values keyed by date string
+        @return New series (empty if data is empty)
+        @retval DailySeries Series covering the range of the mapping
+        """
+        if not data:
+            return cls.zeros(0, 0)
+        days = np.array(list(data.keys()), dtype='datetime64[D]').astype(np.int64)
+        start = int(days.min())
+        values = np.zeros(int(days.max()) - start + 1, dtype=np.int64)
+        values[days - start] = np.fromiter(data.values(), dtype=np.int64, count=len(data))
+        return cls(start, values)
+    
+    def __len__(self) -> int:
+        """@brief Number of days in the series
+        @return Length of the series
+        @retval int Number of days
+        """
+        return len(self.values)
+    
+    @property
+    def end_day(self) -> int:
+        """@brief Day ordinal after the last value
+        @return Exclusive end ordinal
+        @retval int Day ordinal
+        """
+        return self.start_day + len(self.values)
+    
+    @property
+    def start_date(self) -> date:
+        """@brief Date of the first value
+        @return First date
+        @retval date Calendar date
+        """
+        return day_to_date(self.start_day)
+    
+    def dates(self) -> np.ndarray:
+        """@brief Get date labels of the series
+        @return Array of 'YYYY-MM-DD' strings
+        @retval np.ndarray Cached read-only labels
+        """
+        return date_strings(self.start_day, len(self.values))
+    
+    def window(self, start_day: int, length: int) -> "DailySeries":
+        """@brief Get the values of a day range
+        @details Returns a view sharing memory with this series when the range
+                 lies inside it, otherwise a zero-padded copy
+        @param start_day Day ordinal of the first requested day
+        @param length Number of requested days
+        @return Series covering exactly the requested range
+        @retval DailySeries Windowed series
+        """
+        offset = start_day - self.start_day
+        if offset >= 0 and offset + length <= len(self.values):
+            return DailySeries(start_day, self.values[offset:offset + length])
+        
+        result = np.zeros(length, dtype=np.int64)
+        src_start = max(offset, 0)
+        src_end = min(offset + length, len(self.values))
+        if src_start < src_end:
+            result[src_start - offset:src_end - offset] = self.values[src_start:src_end]
+        return DailySeries(start_day, result)
+    
+    def window_statistics(self, start_day: int, length: int) -> Dict[str, Any]:
+        """@brief Compute summary statistics of a day range
+        @details Days outside the series count as zero, like window()
+        @param start_day Day ordinal of the first day
+        @param length Number of days
+        @return Dictionary with total, average_daily, max_daily and min_daily
+        @retval Dict[str, Any] Statistics of the range
+        """
+        if length <= 0:
+            return {"total": 0, "average_daily": 0, "max_daily": 0, "min_daily": 0}
+        values = self.window(start_day, length).values
+        total = int(values.sum())
+        return {
+            "total": total,
+            "average_daily": total / length,
+            "max_daily": int(values.max()),
+            "min_daily": int(values.min())
+        }
+    
+    def to_dict(self) -> Dict[str, int]:
+        """@brief Convert the series into a mapping of date strings to values
+        @return Values keyed by YYYY-MM-DD date
+        @retval Dict[str, int] Daily values
+        """
+        return dict(zip(self.dates().tolist(), self.values.tolist()))
+    
+    def to_frame(self, column: str) -> pd.DataFrame:
+        """@brief Wrap the series into a DataFrame without copying the values
+        @param column Name of the value column
+        @return DataFrame with Date and value columns
+        @retval pd.DataFrame Formatted data
+        """
+        import pandas as pd
+        
+        return pd.DataFrame({"Date": self.dates(), column: self.values}, copy=False)
+    
+    def statistics(self) -> Dict[str, Any]:
+        """@brief Compute summary statistics
+        @return Dictionary with total, average_daily, max_daily and min_daily
+        @retval Dict[str, Any] Statistics of the series
+        """
+        if len(self.values) == 0:
+            return {"total": 0, "average_daily": 0, "max_daily": 0, "min_daily": 0}
+        return {
+            "total": int(self.values.sum()),
+            "average_daily": float(self.values.mean()),
+            "max_daily": int(self.values.max()),
+            "min_daily": int(self.values.min())
+        }
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""Shared test setup"""
+import os
+import sys
+
+## @brief Repository root (parent of the tests directory)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+class FakePost:
+    """@brief Minimal submission object"""
+    
+    def __init__(self, post_id: str, created_utc: float, title: str = "", subreddit: str = "gaming",
+                 score: int = 1, num_comments: int = 0):
+        """@brief Initialize the post
+        @param post_id Base36 post id
+        @param created_utc Creation time as Unix timestamp
+        @param title Post title
+        @param subreddit Subreddit name
+        @param score Post score
+        @param num_comments Number of comments
+        """
+        self.id = post_id
+        self.created_utc = created_utc
+        self.title = title
+        self.subreddit = subreddit
+        self.score = score
+        self.num_comments = num_comments
+
+class FakeListingClient:
+    """@brief PRAW stand-in serving fixed post lists, cut at the requested limit like PRAW"""
+    
+    def __init__(self, posts, listings=None):
+        """@brief Initialize the client
+        @param posts Posts returned by new() and by default by search(), newest first
+        @param listings Posts per (sort, time_filter) for search() (optional)
+        """
+        self.posts = posts
+        self.listings = listings or {}
+        self.requests = []
+    
+    def subreddit(self, name: str):
+        """@brief Get a subreddit
+        @param name Subreddit name
+        @return This client acting as the subreddit
+        @retval FakeListingClient Subreddit stand-in
+        """
+        return self
+    
+    def new(self, limit: int = 1000):
+        """@brief List the newest posts
+        @param limit Maximum number of results
+        @return Iterator over at most limit posts
+        @retval iterator Posts
+        """
+        self.requests.append(("new", None))
+        return iter(self.posts[:limit])
+    
+    def search(self, query: str, sort: str = "new", time_filter: str = "all", limit: int = 1000):
+        """@brief Search posts
+        @param query Search query (ignored)
+        @param sort Sort order
+        @param time_filter Time filter
+        @param limit Maximum number of results
+        @return Iterator over at most limit posts
+        @retval iterator Posts
+        """
+        self.requests.append((sort, time_filter))
+        return iter(self.listings.get((sort, time_filter), self.posts if sort == "new" else [])[:limit])
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""Tests for the rule-based annotation engine"""
+import numpy as np
+import pandas as pd
+from core.annotations import AnnotationEngine, AnnotationRule, threshold_rule
+
+def mentions_frame(values) -> pd.DataFrame:
+    """@brief Build a frame with one Reddit Mentions value per day"""
+    return pd.DataFrame({"Date": [f"2024-10-{day + 1:02d}" for day in range(len(values))],
+                         "Reddit Mentions": values, "Steam Subscribers": [100] * len(values)})
+
+def test_default_rules_label_peaks_in_priority_order():
+    """@brief Maximum beats high activity, minimum beats no mentions"""
+    comments = AnnotationEngine().evaluate(mentions_frame([0, 2, 2, 9, 5, 2]))
+    assert comments.tolist() == ["Minimum", "", "", "Maximum", "High activity", ""]
+
+def test_no_mentions_when_the_minimum_is_not_zero():
+    """@brief Rows only get the first matching label"""
+    comments = AnnotationEngine().evaluate(mentions_frame([3, 3, 4]))
+    assert comments.tolist() == ["Minimum", "Minimum", "Maximum"]
+
+def test_all_zero_column_has_no_maximum():
+    """@brief A column without any mention is labelled as minimum, never as maximum"""
+    assert AnnotationEngine().evaluate(mentions_frame([0, 0])).tolist() == ["Minimum", "Minimum"]
+
+def test_rules_on_other_columns_and_missing_columns():
+    """@brief Rules read their own column and rules on missing columns never match"""
+    engine = AnnotationEngine([threshold_rule("Large", 100, column="Steam Subscribers"),
+                               threshold_rule("Unknown", 0, column="Twitch Viewers")])
+    assert engine.evaluate(mentions_frame([1, 2])).tolist() == ["Large", "Large"]
+    assert AnnotationEngine([threshold_rule("Unknown", 0, column="Twitch Viewers")]) \
+        .evaluate(mentions_frame([1])).tolist() == [""]
+
+def test_add_rule_sets_the_priority():
+    """@brief Inserted rules win over later rules, appended rules only fill unlabelled rows"""
+    engine = AnnotationEngine()
+    engine.add_rule(threshold_rule("Viral", 9), position=0)
+    engine.add_rule(AnnotationRule("Quiet", lambda values, stats: values < stats["mean"]))
+    assert engine.labels == ["Viral", "Maximum", "High activity", "Minimum", "No mentions", "Quiet"]
+    assert engine.evaluate(mentions_frame([1, 2, 9, 4])).tolist() == ["Minimum", "Quiet", "Viral", ""]
+
+def test_codes_match_the_labels():
+    """@brief Codes refer to labels, code 0 means no comment"""
+    engine = AnnotationEngine()
+    codes = engine.evaluate_codes({"Reddit Mentions": np.array([0, 2, 2, 9])}, 4)
+    assert codes.dtype == np.int8
+    assert codes.tolist() == [3, 0, 0, 1]
+    assert engine.evaluate_codes({}, 3).tolist() == [0, 0, 0]
+
+def test_annotate_returns_a_copy():
+    """@brief The input frame is left unchanged"""
+    df = mentions_frame([1, 5])
+    annotated = AnnotationEngine(output_column="Note").annotate(df)
+    assert "Note" not in df.columns
+    assert annotated["Note"].tolist() == ["Minimum", "Maximum"]
+    assert annotated["Reddit Mentions"].tolist() == [1, 5]
+
+def test_empty_frame_gets_no_comments():
+    """@brief An empty frame is annotated without errors"""
+    assert AnnotationEngine().evaluate(mentions_frame([])).tolist() == []
\ No newline at end of file
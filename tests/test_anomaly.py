@@ -0,0 +1,57 @@
+"""Tests for the streaming anomaly monitor"""
+import numpy as np
+import pytest
+from core.anomaly import AnomalyMonitor, StreamingDetector
+from models.time_series import DailySeries
+
+def spiky_series(start_day: int = 20000, length: int = 40, spike_at: int = 30) -> DailySeries:
+    """@brief Build a steady series with one large spike"""
+    values = np.full(length, 10, dtype=np.int64)
+    values[::2] = 12
+    values[spike_at] = 200
+    return DailySeries(start_day, values)
+
+def test_refeeding_scores_only_new_days():
+    """@brief Feeding the same history again reports nothing new"""
+    monitor = AnomalyMonitor()
+    series = spiky_series()
+    first = monitor.observe_series("game|Reddit Mentions", series)
+    assert first and all(event.kind == "spike" for event in first)
+    assert monitor.observe_series("game|Reddit Mentions", series) == []
+
+def test_events_are_kept_across_runs():
+    """@brief Events of already scored days stay available"""
+    monitor = AnomalyMonitor()
+    series = spiky_series()
+    first = monitor.observe_series("game|Reddit Mentions", series)
+    monitor.observe_series("game|Reddit Mentions", series)
+    assert monitor.events(["game|Reddit Mentions"]) == first
+    assert monitor.events(["game|Reddit Mentions"], start_day=series.start_day + 31) == []
+    assert monitor.events(["other|Reddit Mentions"]) == []
+
+def test_event_history_is_bounded():
+    """@brief Events older than history_days are forgotten"""
+    monitor = AnomalyMonitor(history_days=5)
+    monitor.observe_series("game|Reddit Mentions", spiky_series(length=40, spike_at=30))
+    assert monitor.events(["game|Reddit Mentions"]) == []
+
+def test_posts_match_daily_feed():
+    """@brief Counting posts one by one gives the same events as feeding days"""
+    series = spiky_series()
+    by_day = AnomalyMonitor().observe_series("k", series)
+    monitor = AnomalyMonitor()
+    by_post = []
+    for offset, count in enumerate(series.values.tolist()):
+        for _ in range(count):
+            by_post += monitor.add_post("k", (series.start_day + offset) * 86400 + 60)
+    by_post += monitor.flush(series.end_day)
+    assert by_post == by_day
+
+def test_detectors_must_implement_update_and_allocate():
+    """@brief The detector base class cannot be used without its state handling"""
+    class Incomplete(StreamingDetector):
+        def update(self, rows, days, values):
+            return values, values
+    
+    with pytest.raises(TypeError):
+        Incomplete()
\ No newline at end of file
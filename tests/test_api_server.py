@@ -0,0 +1,100 @@
+"""Tests for the local JSON API"""
+import json
+import http.client
+import urllib.error
+import urllib.request
+import numpy as np
+import pytest
+from core.api_server import ApiServer, ResultStore
+from models.data_models import AnomalyEvent, GameResult
+
+def make_result(days: int = 5) -> GameResult:
+    """@brief Build a small published result"""
+    comments = np.array([""] * days, dtype=object)
+    comments[-1] = "Maximum"
+    return GameResult("Counter-Strike 2", 20000, {"Reddit Mentions": np.arange(days, dtype=np.int64)}, comments,
+                      {}, [AnomalyEvent("Counter-Strike 2|Reddit Mentions", "2024-10-05", 9, 1.0, 4.0, "ewma")])
+
+@pytest.fixture
+def server():
+    """@brief Run a server on a free port"""
+    store = ResultStore()
+    api = ApiServer(store, port=0)
+    api.start()
+    yield store, f"http://127.0.0.1:{api.port}"
+    api.stop()
+
+def get(url: str, headers: dict = None):
+    """@brief Send a GET request and return status, headers and body"""
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers or {})) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+def test_publish_assigns_increasing_versions():
+    """@brief Every publish gets a new version and replaces the game's result"""
+    store = ResultStore()
+    assert store.publish(make_result()) == 1
+    assert store.publish(make_result()) == 2
+    version, results = store.snapshot()
+    assert version == 2 and list(results) == ["counter-strike-2"] and results["counter-strike-2"].version == 2
+
+def test_etag_and_not_modified(server):
+    """@brief A matching If-None-Match gets 304 until a new result is published"""
+    store, base = server
+    store.publish(make_result())
+    status, headers, body = get(base + "/games/counter-strike-2/series")
+    assert status == 200
+    assert json.loads(body)["columns"]["Reddit Mentions"] == [0, 1, 2, 3, 4]
+    etag = headers["ETag"]
+    assert get(base + "/games/counter-strike-2/series", {"If-None-Match": etag})[0] == 304
+    
+    store.publish(make_result(6))
+    status, headers, _ = get(base + "/games/counter-strike-2/series", {"If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag
+
+def test_annotations_and_errors(server):
+    """@brief Annotations list comments and anomalies; unknown paths are 404"""
+    store, base = server
+    store.publish(make_result())
+    document = json.loads(get(base + "/games/counter-strike-2/annotations")[2])
+    assert [item["comment"] for item in document["comments"]] == ["Maximum"]
+    assert len(document["anomalies"]) == 1
+    assert get(base + "/games/unknown")[0] == 404
+    assert get(base + "/games/counter-strike-2/unknown")[0] == 404
+
+def test_if_none_match_lists_weak_tags_and_wildcard():
+    """@brief Each listed tag is compared exactly, weak tags match, substrings do not"""
+    assert ApiServer._etag_matches('"a-1", W/"games-2"', '"games-2"')
+    assert ApiServer._etag_matches("*", '"games-2"')
+    assert not ApiServer._etag_matches('"games-23"', '"games-2"')
+    assert not ApiServer._etag_matches('"x", "games-2-gz"', '"games-2"')
+    assert not ApiServer._etag_matches(None, '"games-2"')
+
+def test_gzip_body_has_its_own_etag(server):
+    """@brief Compressed and identity bodies of one result carry different validators"""
+    store, base = server
+    store.publish(make_result(400))
+    _, plain, _ = get(base + "/games/counter-strike-2")
+    _, packed, _ = get(base + "/games/counter-strike-2", {"Accept-Encoding": "gzip"})
+    assert packed["Content-Encoding"] == "gzip"
+    assert packed["ETag"] != plain["ETag"]
+    assert get(base + "/games/counter-strike-2", {"If-None-Match": packed["ETag"]})[0] == 200
+
+def test_rejected_request_body_does_not_break_keep_alive(server):
+    """@brief The body of a 405 request is read past, the next request on the connection works"""
+    store, base = server
+    store.publish(make_result())
+    connection = http.client.HTTPConnection(base[len("http://"):], timeout=5)
+    try:
+        connection.request("POST", "/games", body=b"x" * 100)
+        response = connection.getresponse()
+        response.read()
+        assert response.status == 405
+        connection.request("GET", "/health")
+        response = connection.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read())["games"] == 1
+    finally:
+        connection.close()
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""Tests for the parallel backfill planning and manifest"""
+import pytest
+from core.backfill import BackfillManifest, plan_units, render_game, run_backfill
+
+def test_units_cover_every_game_and_day_once():
+    """@brief Day ranges are split into chunks per game without gaps or overlaps"""
+    units = plan_units([("CS2", "730"), ("Dota 2", "570")], 1000, 1250, 100)
+    assert [(unit.game, unit.start_day, unit.length) for unit in units] == [
+        ("CS2", 1000, 100), ("CS2", 1100, 100), ("CS2", 1200, 50),
+        ("Dota 2", 1000, 100), ("Dota 2", 1100, 100), ("Dota 2", 1200, 50),
+    ]
+    assert units[0].key == "cs2/1000-1100"
+    assert len({unit.key for unit in units}) == len(units)
+
+def test_manifest_resumes_finished_units(tmp_path):
+    """@brief A reloaded manifest skips units whose result file still exists"""
+    path = str(tmp_path / "manifest.json")
+    first, second = plan_units([("CS2", "730")], 0, 20, 10)
+    result = tmp_path / "first.npz"
+    result.write_bytes(b"done")
+    manifest = BackfillManifest(path)
+    manifest.add_unit(first.key, str(result))
+    manifest.add_unit(second.key, str(tmp_path / "missing.npz"))
+    manifest.add_game("CS2", "0-20")
+    
+    resumed = BackfillManifest(path)
+    assert resumed.done(first)
+    assert not resumed.done(second)
+    assert resumed.games == {"cs2": "0-20"}
+
+def test_unreadable_manifest_starts_over(tmp_path):
+    """@brief A corrupt manifest is ignored instead of failing the backfill"""
+    path = tmp_path / "manifest.json"
+    path.write_text("{not json")
+    manifest = BackfillManifest(str(path))
+    assert manifest.units == {} and manifest.games == {}
+    assert not manifest.done(plan_units([("CS2", "730")], 0, 10, 10)[0])
+
+def test_render_without_units_fails_cleanly(tmp_path):
+    """@brief A game without unit results raises a clear error instead of an IndexError"""
+    with pytest.raises(ValueError):
+        render_game("CS2", [], str(tmp_path), False, 100)
+    assert run_backfill([("CS2", "730")], 10, 10, str(tmp_path / "out"), str(tmp_path / "work"), None, None) == (0, [])
+
+def test_failed_unit_is_reported_and_not_rendered(tmp_path):
+    """@brief A game whose unit fails is returned as failed, the other games complete"""
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    # The unit results of "Broken" would go into a directory that cannot be created
+    (work_dir / "broken").write_text("not a directory")
+    completed, failed = run_backfill([("Broken", ""), ("Fine", "")], 0, 10, str(tmp_path / "out"), str(work_dir),
+                                     None, None, workers=1, plot=False)
+    assert completed == 1
+    assert failed == ["Broken"]
+    assert (tmp_path / "out" / "fine" / "history.csv").exists()
+    assert not (tmp_path / "out" / "broken").exists()
\ No newline at end of file
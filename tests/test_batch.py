@@ -0,0 +1,84 @@
+"""Tests for the multi-game batch"""
+import csv
+import numpy as np
+from core.reporter import Reporter
+from models.data_models import CombinedBatch
+from models.time_series import date_strings
+import main
+
+COLUMNS = ["Steam Subscribers", "Reddit Mentions"]
+
+def filled_batch(games: int, length: int = 3, capacity: int = 2) -> CombinedBatch:
+    """@brief Build a batch where game i has i + day mentions and a Maximum on its last day"""
+    batch = CombinedBatch(20000, length, COLUMNS, ["Maximum"], capacity=capacity)
+    for game in range(games):
+        comments = np.zeros(length, dtype=np.int8)
+        comments[-1] = 1
+        batch.add(f"Game {game}", {"Reddit Mentions": np.arange(length) + game,
+                                   "Steam Subscribers": np.full(length, 100 * game)}, comments)
+    return batch
+
+def test_batch_grows_and_keeps_rows():
+    """@brief Adding more games than allocated keeps every earlier row"""
+    batch = filled_batch(5, capacity=2)
+    assert len(batch) == 5
+    assert batch.games == [f"Game {game}" for game in range(5)]
+    assert batch.values("Reddit Mentions").tolist() == [[game, game + 1, game + 2] for game in range(5)]
+    assert batch.comment_codes()[:, -1].tolist() == [1] * 5
+
+def test_missing_columns_stay_zero():
+    """@brief A game without a column gets zeros for it"""
+    batch = CombinedBatch(20000, 2, COLUMNS)
+    row = batch.add("Game", {"Reddit Mentions": np.array([3, 4])})
+    assert batch.values("Steam Subscribers")[row].tolist() == [0, 0]
+    assert batch.row(row, 1).comment == ""
+
+def test_statistics_are_per_game():
+    """@brief Statistics hold one value per game"""
+    statistics = filled_batch(3).statistics("Reddit Mentions")
+    assert statistics["total"].tolist() == [3, 6, 9]
+    assert statistics["average_daily"].tolist() == [1.0, 2.0, 3.0]
+    assert statistics["max_daily"].tolist() == [2, 3, 4]
+    assert statistics["min_daily"].tolist() == [0, 1, 2]
+
+def test_statistics_of_an_empty_day_range():
+    """@brief A batch without days reports zeros instead of failing"""
+    batch = CombinedBatch(20000, 0, COLUMNS)
+    batch.add("Game", {})
+    statistics = batch.statistics("Reddit Mentions")
+    assert statistics["total"].tolist() == [0]
+    assert statistics["average_daily"].tolist() == [0.0]
+
+def test_rows_and_frames_match_the_arrays():
+    """@brief Records and DataFrames of a game are built from the batch arrays"""
+    batch = filled_batch(2)
+    record = batch.row(1, 2)
+    assert (record.date, record.steam_subscribers, record.reddit_mentions, record.comment) == \
+        (date_strings(20002, 1)[0], 100, 3, "Maximum")
+    frame = batch.game_frame(1)
+    assert frame.columns.tolist() == ["Date"] + COLUMNS + ["Comment"]
+    assert frame["Reddit Mentions"].tolist() == [1, 2, 3]
+    assert frame["Comment"].tolist() == ["", "", "Maximum"]
+
+def test_batch_csv_is_the_same_for_every_block_size(tmp_path):
+    """@brief The long-format CSV does not depend on the block size and quotes game names"""
+    batch = filled_batch(5)
+    batch.games[2] = 'Game, "Two"'
+    outputs = []
+    for block_size in (1, 2, 100):
+        filename = tmp_path / f"combined_{block_size}.csv"
+        Reporter.save_batch_csv(batch, str(filename), block_size=block_size)
+        outputs.append(filename.read_bytes())
+    assert outputs[0] == outputs[1] == outputs[2]
+    
+    with open(tmp_path / "combined_1.csv", newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Game", "Date"] + COLUMNS + ["Comment"]
+    assert len(rows) == 1 + 5 * 3
+    assert rows[1 + 2 * 3 + 2] == ['Game, "Two"', date_strings(20002, 1)[0], "200", "4", "Maximum"]
+
+def test_games_file_skips_comments_and_blank_lines(tmp_path):
+    """@brief A games file yields (name, app id) pairs with an empty id when it is not given"""
+    filename = tmp_path / "games.csv"
+    filename.write_text("# name,app id\nCounter-Strike 2, 730\n\nDota 2\n", encoding="utf-8")
+    assert main.load_games_file(str(filename)) == [("Counter-Strike 2", "730"), ("Dota 2", "")]
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""Tests for the offline API stand-ins and the pipeline benchmark"""
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+import pytest
+from conftest import ROOT_DIR
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "benchmarks"))
+
+from fakes import FakeSteamSpyServer, FakeReddit
+import bench_pipeline
+
+def get_json(url: str) -> dict:
+    """@brief Fetch and decode a JSON document"""
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+def test_steamspy_server_answers_appdetails():
+    """@brief The stand-in serves SteamSpy app details and counts every request"""
+    with FakeSteamSpyServer(owners={"730": 5000}) as server:
+        details = get_json(server.api_url + "?request=appdetails&appid=730")
+        assert details == {"appid": 730, "name": "Game 730", "owners": "5,000 .. 10,000", "ccu": 5}
+        assert get_json(server.api_url + "?request=appdetails&appid=2")["owners"].startswith("1,002,000 ..")
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(server.api_url + "?request=top100in2weeks", timeout=5)
+        assert error.value.code == 404
+        error.value.close()
+        assert server.request_count == 3
+
+def test_fake_reddit_generates_pages_newest_first():
+    """@brief Results are cut at the limit, ordered newest first and counted per started page"""
+    reddit = FakeReddit(posts_per_day=100, history_days=10, page_size=100, seed=3)
+    posts = list(reddit.subreddit("gaming").search("Game", limit=250))
+    assert len(posts) == 250
+    assert reddit.pages == 3
+    assert all(newer.created_utc > older.created_utc for newer, older in zip(posts, posts[1:]))
+    assert posts[0].title == "Post about Game"
+    assert posts[0].subreddit == "gaming"
+    assert len(list(reddit.subreddit("gaming").new(limit=None))) == 1000
+
+def test_fake_reddit_is_reproducible():
+    """@brief The same seed generates the same posts relative to the client's current time"""
+    def generated(seed: int) -> list:
+        reddit = FakeReddit(seed=seed)
+        return [(round(reddit.now - post.created_utc, 6), post.score) for post in reddit.generate("Game", 50, "all")]
+    assert generated(1) == generated(1)
+    assert generated(1) != generated(2)
+
+def test_pipeline_benchmark_writes_one_record_per_configuration(tmp_path):
+    """@brief A small run writes machine-readable results for every combination of days and games"""
+    output = tmp_path / "results.json"
+    assert bench_pipeline.main(["--days", "3,5", "--games", "1,2", "--posts-per-day", "10", "--no-plot",
+                                "--output", str(output)]) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["benchmark"] == "pipeline"
+    assert [(record["days"], record["games"]) for record in report["results"]] == [(3, 1), (3, 2), (5, 1), (5, 2)]
+    for record in report["results"]:
+        assert record["rows"] == record["days"] * record["games"]
+        assert record["steam_requests"] == record["games"]
+        assert set(record["stages_s"]) == set(bench_pipeline.STAGES)
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""Tests for the slotted record types"""
+from datetime import datetime
+import numpy as np
+import pytest
+from models.data_models import DataSourceStats, CombinedData, CatalogEntry, AnomalyEvent, GameResult
+
+WHEN = datetime(2024, 10, 5, 12, 0)
+
+def game_result(last: int = 2) -> GameResult:
+    """@brief Build a result holding arrays, dictionaries and nested records"""
+    return GameResult("Game", 20000, {"Reddit Mentions": np.array([1, last], dtype=np.int64)},
+                      np.array(["", "Maximum"], dtype=object),
+                      {"Reddit": DataSourceStats(3, 1.5, 2, 1, "Reddit", WHEN)},
+                      [AnomalyEvent("Game|Reddit Mentions", "2024-10-05", 9, 1.0, 4.0, "ewma")], 1, 10.0)
+
+## @brief Factories of every record type: (build an instance, build a different instance)
+RECORDS = [
+    (lambda: DataSourceStats(3, 1.5, 2, 1, "Reddit", WHEN), lambda: DataSourceStats(4, 1.5, 2, 1, "Reddit", WHEN)),
+    (lambda: CombinedData("2024-10-05", 7, 5, "Maximum"), lambda: CombinedData("2024-10-05", 7, 5)),
+    (lambda: CatalogEntry(730, "Counter-Strike 2", 1000), lambda: CatalogEntry(570, "Dota 2", 1000)),
+    (lambda: AnomalyEvent("k", "2024-10-05", 9, 1.0, 4.0, "ewma"),
+     lambda: AnomalyEvent("k", "2024-10-05", 9, 1.0, 4.0, "ewma", "drop")),
+    (game_result, lambda: game_result(3))
+]
+
+@pytest.mark.parametrize("build, build_other", RECORDS)
+def test_records_compare_by_fields(build, build_other):
+    """@brief Records with equal fields are equal, any differing field makes them unequal"""
+    assert build() == build()
+    assert build() != build_other()
+    assert build() != object()
+
+@pytest.mark.parametrize("build, build_other", RECORDS)
+def test_records_use_slots(build, build_other):
+    """@brief Records have no instance dictionary and are not hashable"""
+    record = build()
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.unknown_field = 1
+    with pytest.raises(TypeError):
+        hash(record)
+
+@pytest.mark.parametrize("build, build_other", RECORDS)
+def test_records_repr_lists_every_field(build, build_other):
+    """@brief The representation names the class and every declared field"""
+    record = build()
+    text = repr(record)
+    assert text.startswith(type(record).__name__ + "(")
+    for name in type(record).__slots__:
+        assert f"{name}=" in text
\ No newline at end of file
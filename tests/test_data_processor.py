@@ -0,0 +1,151 @@
+"""Tests for the data processor"""
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+from core.data_processor import DataProcessor
+from data_sources.base_data_source import BaseDataSource
+from models.data_models import CombinedBatch
+from conftest import ROOT_DIR
+
+## @brief Script fetching from a source that never returns, then exiting
+HUNG_SOURCE_SCRIPT = """
+import sys, threading
+sys.path.insert(0, sys.argv[1])
+from core.data_processor import DataProcessor
+from data_sources.base_data_source import BaseDataSource
+
+class HungSource(BaseDataSource):
+    def fetch_data(self, **kwargs):
+        threading.Event().wait(120)
+    def get_statistics(self):
+        return {}
+    def format_data(self):
+        return None
+
+processor = DataProcessor(concurrent=True, default_timeout=0.1)
+processor.add_data_source(HungSource("hung"))
+print(processor.fetch_all_data(), processor.fetch_status["hung"])
+"""
+
+class GatedSource(BaseDataSource):
+    """@brief Source whose fetch blocks until its gate is opened"""
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.gate = threading.Event()
+        self.calls = 0
+    
+    def fetch_data(self, **kwargs):
+        self.calls += 1
+        self.gate.wait(5)
+        return {"calls": self.calls}
+    
+    def get_statistics(self):
+        return {}
+    
+    def format_data(self):
+        return None
+
+def test_late_source_is_skipped_until_its_fetch_finishes():
+    """@brief A source that missed its deadline is not fetched again while still running"""
+    processor = DataProcessor(concurrent=True, default_timeout=0.05)
+    slow = GatedSource("slow")
+    fast = GatedSource("fast")
+    fast.gate.set()
+    processor.add_data_source(slow)
+    processor.add_data_source(fast)
+    
+    assert processor.fetch_all_data() == {"fast": {"calls": 1}}
+    assert processor.fetch_status["slow"] == DataProcessor.STATUS_TIMEOUT
+    assert processor.is_busy(slow)
+    
+    assert processor.fetch_all_data() == {"fast": {"calls": 2}}
+    assert processor.fetch_status["slow"] == DataProcessor.STATUS_BUSY
+    assert processor.get_active_sources() == [fast]
+    assert slow.calls == 1
+    
+    slow.gate.set()
+    processor._pending[slow].result(timeout=5)
+    assert processor.fetch_all_data() == {"fast": {"calls": 3}, "slow": {"calls": 2}}
+    assert not processor.is_busy(slow)
+
+def test_hung_source_does_not_delay_interpreter_exit():
+    """@brief A fetch stuck past its deadline does not keep the process alive at exit"""
+    started = time.monotonic()
+    completed = subprocess.run([sys.executable, "-c", HUNG_SOURCE_SCRIPT, ROOT_DIR], capture_output=True, text=True,
+                               timeout=60)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().endswith("{} timeout")
+    assert time.monotonic() - started < 30
+
+def test_wait_pending_reports_sources_still_running():
+    """@brief Waiting returns the sources whose late fetch did not finish"""
+    processor = DataProcessor(concurrent=True, default_timeout=0.05)
+    slow = GatedSource("slow")
+    processor.add_data_source(slow)
+    processor.fetch_all_data()
+    
+    assert processor.wait_pending([slow], 0.05) == [slow]
+    slow.gate.set()
+    assert processor.wait_pending([slow], 5) == []
+    assert processor.fetch_all_data() == {"slow": {"calls": 2}}
+class FrameSource(BaseDataSource):
+    """@brief Generic source that only provides a DataFrame"""
+    
+    def __init__(self, name: str, frame, days: int = 3):
+        super().__init__(name, days)
+        self.frame = frame
+    
+    def fetch_data(self, **kwargs):
+        return {}
+    
+    def get_statistics(self):
+        return {}
+    
+    def format_data(self):
+        return self.frame
+
+def last_dates(days: int) -> list:
+    """@brief Date strings of the last days up to today (UTC)"""
+    import pandas as pd
+    return [str(date) for date in pd.date_range(end=pd.Timestamp.now(tz="UTC").normalize(), periods=days).date]
+
+def test_generic_columns_keep_their_dtype():
+    """@brief Float columns of generic sources are not truncated to integers"""
+    import pandas as pd
+    processor = DataProcessor()
+    dates = last_dates(3)
+    processor.add_data_source(FrameSource("ratings", pd.DataFrame({"Date": dates, "Rating": [0.5, 1.5, 2.25]})))
+    processor.add_data_source(FrameSource("counts", pd.DataFrame({"Date": dates[1:], "Count": [3, 4]})))
+    
+    _, length, columns = processor.combine_columns()
+    assert length == 3
+    assert columns["Rating"].dtype == np.float64
+    assert columns["Rating"].tolist() == [0.5, 1.5, 2.25]
+    assert columns["Count"].tolist() == [0, 3, 4]
+
+def test_batch_comments_match_the_game_comments():
+    """@brief A batch longer than the analysis period stores the comments of the per-game data"""
+    import pandas as pd
+    processor = DataProcessor()
+    dates = last_dates(3)
+    processor.add_data_source(FrameSource("steam", pd.DataFrame({"Date": dates, "Steam Subscribers": [7, 7, 7]})))
+    processor.add_data_source(FrameSource("reddit", pd.DataFrame({"Date": dates, "Reddit Mentions": [5, 1, 2]})))
+    combined_df = processor.add_comments(processor.combine_data())
+    
+    batch = CombinedBatch.for_last_days(5, ["Steam Subscribers", "Reddit Mentions"], processor.annotation_engine.labels)
+    row = processor.add_to_batch(batch, "Game", combined_df)
+    frame = batch.game_frame(row)
+    assert frame["Comment"].tolist() == ["", ""] + combined_df["Comment"].tolist()
+    assert frame["Reddit Mentions"].tolist() == [0, 0, 5, 1, 2]
+
+def test_comment_codes_follow_the_first_rule_of_a_label():
+    """@brief Comments are encoded per distinct text, repeated labels keep the first code"""
+    from core.annotations import AnnotationEngine, threshold_rule
+    engine = AnnotationEngine([threshold_rule("High", 5), threshold_rule("Low", 1), threshold_rule("High", 2)])
+    codes = engine.encode(np.array(["High", "", "Low", "Other", "High"], dtype=object))
+    assert codes.dtype == np.int8
+    assert codes.tolist() == [1, 0, 2, 0, 1]
+    assert engine.encode(np.array([], dtype=object)).tolist() == []
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""Tests for the export stage"""
+import csv
+import pandas as pd
+import pytest
+from core.exporters import ArrowExporter, CsvExporter, ParquetExporter, TextReportExporter, create_exporters
+
+def combined_frame(dates, mentions) -> pd.DataFrame:
+    """@brief Build combined data with a constant Steam column"""
+    return pd.DataFrame({"Date": dates, "Steam Subscribers": [100] * len(dates),
+                         "Reddit Mentions": mentions, "Comment": [""] * len(dates)})
+
+def read_dataset(root) -> list:
+    """@brief Read a Parquet dataset as sorted (game, date, mentions) rows"""
+    import pyarrow.parquet as pq
+    df = pq.read_table(str(root)).to_pandas()
+    return sorted(zip(df["Game"].astype(str), df["Date"].astype(str), df["Reddit Mentions"].tolist()))
+
+def test_csv_exporter_writes_every_row(tmp_path):
+    """@brief The CSV holds all rows regardless of the block size"""
+    filename = tmp_path / "data.csv"
+    df = combined_frame([f"2024-10-{day:02d}" for day in range(1, 8)], list(range(7)))
+    CsvExporter(str(filename), block_size=3).export(df, "Game", 7)
+    with open(filename, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["Date", "Steam Subscribers", "Reddit Mentions", "Comment"]
+    assert [row[2] for row in rows[1:]] == [str(day) for day in range(7)]
+
+def test_text_report_does_not_write_a_data_copy(tmp_path, monkeypatch):
+    """@brief The text report only writes its own file"""
+    monkeypatch.chdir(tmp_path)
+    TextReportExporter("output.csv").export(combined_frame(["2024-10-01", "2024-10-02"], [3, 5]), "Game", 2)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["output.csv"]
+    report = (tmp_path / "output.csv").read_text(encoding="utf-8-sig")
+    assert report.startswith("GAME POPULARITY ANALYSIS")
+    assert "Total mentions: 8" in report
+
+def test_parquet_runs_replace_covered_partitions(tmp_path):
+    """@brief A later run refreshes the days it covers, keeps older days and other games"""
+    pytest.importorskip("pyarrow")
+    root = tmp_path / "dataset"
+    exporter = ParquetExporter(str(root))
+    exporter.export(combined_frame(["2024-10-01", "2024-10-02", "2024-10-03"], [1, 2, 3]), "Alpha", 3)
+    exporter.export(combined_frame(["2024-10-02"], [7]), "Beta", 1)
+    exporter.export(combined_frame(["2024-10-02", "2024-10-03", "2024-10-04"], [20, 30, 40]), "Alpha", 3)
+    assert read_dataset(root) == [
+        ("Alpha", "2024-10-01", 1), ("Alpha", "2024-10-02", 20), ("Alpha", "2024-10-03", 30),
+        ("Alpha", "2024-10-04", 40), ("Beta", "2024-10-02", 7)
+    ]
+    assert (root / "Game=Alpha" / "Date=2024-10-04").is_dir()
+
+def test_arrow_file_holds_the_game_column(tmp_path):
+    """@brief The Arrow file is the combined data with the game name appended"""
+    pytest.importorskip("pyarrow")
+    import pyarrow.feather as feather
+    filename = tmp_path / "data.arrow"
+    df = combined_frame(["2024-10-01", "2024-10-02"], [3, 5])
+    ArrowExporter(str(filename), compression="lz4").export(df, "Game", 2)
+    table = feather.read_table(str(filename))
+    assert table.column_names == list(df.columns) + ["Game"]
+    assert table.column("Game").to_pylist() == ["Game", "Game"]
+    assert table.column("Reddit Mentions").to_pylist() == [3, 5]
+
+def test_create_exporters_in_requested_order():
+    """@brief Exporters follow the requested formats and unknown formats are rejected"""
+    outputs = {"report": "output.csv", "data": "data.csv", "parquet": "dataset", "arrow": "data.arrow"}
+    exporters = create_exporters(["csv", "parquet", "text", "arrow"], outputs, compression="snappy")
+    assert [type(exporter) for exporter in exporters] == [CsvExporter, ParquetExporter, TextReportExporter,
+                                                          ArrowExporter]
+    assert exporters[1].root == "dataset"
+    assert exporters[1].compression == "snappy"
+    assert exporters[3].filename == "data.arrow"
+    with pytest.raises(ValueError):
+        create_exporters(["xml"], outputs)
\ No newline at end of file
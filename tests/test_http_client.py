@@ -0,0 +1,139 @@
+"""Tests for the shared HTTP client and its rate limiter"""
+import threading
+import pytest
+import requests
+from data_sources.http_client import HttpClient, TokenBucket
+
+class FakeClock:
+    """@brief Manual clock whose sleep advances the time"""
+    
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class FakeResponse:
+    """@brief Response with a fixed status and optional Retry-After header"""
+    
+    def __init__(self, status_code: int, retry_after: str = None):
+        self.status_code = status_code
+        self.content = b""
+        self.headers = {"Retry-After": retry_after} if retry_after is not None else {}
+
+class FakeSession:
+    """@brief Session serving queued responses or raising queued exceptions"""
+    
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+    
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """@brief Record retry delays instead of sleeping"""
+    delays = []
+    monkeypatch.setattr("data_sources.http_client.time.sleep", delays.append)
+    return delays
+
+def test_bucket_allows_a_burst_then_paces_callers():
+    """@brief A full bucket serves capacity tokens at once, later tokens wait 1/rate seconds each"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+
+def test_bucket_refills_up_to_its_capacity():
+    """@brief Idle time refills tokens but never beyond the burst size"""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1.0, capacity=2, clock=clock, sleep=clock.sleep)
+    bucket.acquire(2)
+    clock.now += 60
+    assert bucket.acquire(2) == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+
+def test_bucket_serves_concurrent_callers_at_the_rate():
+    """@brief Reserved tokens make concurrent callers wait one interval after another"""
+    clock = FakeClock()
+    waits = []
+    lock = threading.Lock()
+    bucket = TokenBucket(rate=10.0, capacity=1, clock=clock, sleep=lambda seconds: None)
+    
+    def take():
+        wait = bucket.acquire()
+        with lock:
+            waits.append(wait)
+    
+    threads = [threading.Thread(target=take) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(waits) == [pytest.approx(0.1 * i) for i in range(5)]
+
+def test_retryable_statuses_are_retried(sleeps):
+    """@brief 429 and 5xx responses are retried until a final response arrives"""
+    session = FakeSession([FakeResponse(429), FakeResponse(503), FakeResponse(200)])
+    client = HttpClient(session, retries=3, backoff=0.5, seed=1)
+    assert client.get("http://api.test/").status_code == 200
+    assert session.calls == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.5 and 0 <= sleeps[1] <= 1.0
+
+def test_last_retryable_response_is_returned(sleeps):
+    """@brief Once retries are exhausted the last response is returned, other errors are never retried"""
+    client = HttpClient(FakeSession([FakeResponse(500), FakeResponse(502)]), retries=1)
+    assert client.get("http://api.test/").status_code == 502
+    
+    session = FakeSession([FakeResponse(404)])
+    assert HttpClient(session, retries=3).get("http://api.test/").status_code == 404
+    assert session.calls == 1
+
+def test_retry_after_sets_the_minimum_delay(sleeps):
+    """@brief A Retry-After in seconds is honoured, dates are ignored"""
+    session = FakeSession([FakeResponse(429, "7"), FakeResponse(503, "Wed, 21 Oct 2015 07:28:00 GMT"),
+                           FakeResponse(200)])
+    HttpClient(session, retries=2, backoff=0.1, seed=0).get("http://api.test/")
+    assert sleeps[0] == 7.0
+    assert sleeps[1] <= 0.2
+
+def test_connection_errors_are_raised_after_the_last_retry(sleeps):
+    """@brief Connection errors and timeouts are retried, the last one is raised"""
+    session = FakeSession([requests.ConnectionError("reset"), requests.Timeout("slow"), FakeResponse(200)])
+    assert HttpClient(session, retries=2).get("http://api.test/").status_code == 200
+    
+    session = FakeSession([requests.ConnectionError("reset"), requests.ConnectionError("refused")])
+    with pytest.raises(requests.ConnectionError, match="refused"):
+        HttpClient(session, retries=1).get("http://api.test/")
+    assert session.calls == 2
+
+def test_backoff_is_bounded_and_seeded():
+    """@brief Delays grow exponentially up to max_backoff and repeat for the same seed"""
+    client = HttpClient(backoff=0.5, max_backoff=4.0, seed=42)
+    delays = [client._backoff_delay(attempt) for attempt in range(8)]
+    assert all(0 <= delay <= min(4.0, 0.5 * 2 ** attempt) for attempt, delay in enumerate(delays))
+    same_seed = HttpClient(backoff=0.5, max_backoff=4.0, seed=42)
+    assert [same_seed._backoff_delay(attempt) for attempt in range(8)] == delays
+
+def test_requests_share_the_named_rate_limit(sleeps):
+    """@brief Requests naming a rate limit take tokens from its bucket, others are unlimited"""
+    client = HttpClient(FakeSession([FakeResponse(200)] * 3), rate_limits={"steamspy": 1.0})
+    clock = FakeClock()
+    client.limiters["steamspy"] = TokenBucket(1.0, clock=clock, sleep=clock.sleep)
+    client.get("http://api.test/", limit="steamspy")
+    client.get("http://api.test/", limit="steamspy")
+    client.get("http://api.test/", limit="other")
+    assert clock.sleeps == [pytest.approx(1.0)]
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""Tests for the deferred imports of the entry point"""
+import json
+import subprocess
+import sys
+from conftest import ROOT_DIR
+
+## @brief Modules only loaded by the stage that needs them
+HEAVY_MODULES = ["pandas", "matplotlib", "praw", "requests", "pyarrow"]
+
+## @brief Analysis without a plot in a fresh interpreter, prints the heavy modules it loaded
+ANALYSIS_SCRIPT = """
+import json, os, sys
+import numpy as np
+import main
+from core.data_processor import DataProcessor
+from data_sources.base_data_source import BaseDataSource
+from models.time_series import DailySeries
+
+class CountSource(BaseDataSource):
+    def __init__(self, name, column):
+        super().__init__(name, 5)
+        self.column = column
+    def fetch_data(self, **kwargs):
+        self.series = DailySeries(self.window_start_day(), np.arange(self.days))
+        return {}
+    def get_statistics(self):
+        return dict(self.series.statistics(), data_source=self.name)
+    def format_data(self):
+        return self.format_series(self.column)
+
+processor = DataProcessor()
+processor.add_data_source(CountSource("Steam", "Steam Subscribers"))
+processor.add_data_source(CountSource("Reddit", "Reddit Mentions"))
+outputs = main.game_outputs(sys.argv[1], "Game")
+os.makedirs(os.path.dirname(outputs["report"]), exist_ok=True)
+completed = main.run_analysis(processor, "Game", outputs, plot=False)
+print(json.dumps({"completed": completed, "report": os.path.exists(outputs["report"]), "loaded": [m for m in %r if m in sys.modules]}))
+""" % HEAVY_MODULES
+
+def run_python(code: str, *args: str) -> str:
+    """@brief Run code in a fresh interpreter from the repository root and return its last output line"""
+    result = subprocess.run([sys.executable, "-c", code, *args], cwd=ROOT_DIR, capture_output=True, text=True,
+                            timeout=60, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+def test_importing_main_loads_no_heavy_module():
+    """@brief Starting the application imports none of the heavy dependencies"""
+    loaded = run_python(f"import sys, main; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    assert loaded == "[]"
+
+def test_analysis_without_plot_never_imports_matplotlib(tmp_path):
+    """@brief Reports load pandas on demand, matplotlib stays unloaded when no plot is requested"""
+    result = json.loads(run_python(ANALYSIS_SCRIPT, str(tmp_path)))
+    assert result["completed"] is True
+    assert result["report"] is True
+    assert "pandas" in result["loaded"]
+    assert "matplotlib" not in result["loaded"]
+    assert "praw" not in result["loaded"]
\ No newline at end of file
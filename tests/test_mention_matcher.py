@@ -0,0 +1,35 @@
+"""Tests for the multi-game title matcher"""
+from data_sources.mention_matcher import MentionMatcher
+
+def make_matcher() -> MentionMatcher:
+    """@brief Create a matcher with overlapping names and aliases"""
+    matcher = MentionMatcher()
+    matcher.add_game("Counter-Strike 2", ["CS2"])
+    matcher.add_game("Dota 2")
+    matcher.add_game("Dota")
+    return matcher
+
+def test_matches_names_and_aliases_as_whole_words():
+    """@brief Names match after normalization and only on word boundaries"""
+    matcher = make_matcher()
+    assert matcher.match("New counter strike 2 update!") == [0]
+    assert matcher.match("cs2 vs CS2: ranked") == [0]
+    assert matcher.match("cs20 is not a game") == []
+    assert matcher.match("Dota 2 and Dota") == [1, 2]
+    assert matcher.match("dota 2") == [1, 2]
+
+def test_match_many_lists_every_title_and_game_hit():
+    """@brief Hits of many titles are returned as parallel arrays"""
+    matcher = make_matcher()
+    posts, games = matcher.match_many(["CS2 patch", "nothing here", "DOTA 2 with CS2"])
+    assert list(zip(posts.tolist(), games.tolist())) == [(0, 0), (2, 0), (2, 1), (2, 2)]
+
+def test_games_added_later_are_matched():
+    """@brief The automaton is rebuilt after a game or alias is added"""
+    matcher = make_matcher()
+    assert matcher.match("Deadlock beta") == []
+    assert matcher.add_game("Deadlock") == 3
+    assert matcher.add_game("Counter-Strike 2", ["Counter Strike Two"]) == 0
+    assert matcher.match("Deadlock beta") == [3]
+    assert matcher.match("counter strike two") == [0]
+    assert matcher.game_number("Dota") == 2
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""Tests for the metrics registry and its instrumentation"""
+from data_sources.http_client import HttpClient
+from models.metrics import Metrics, metrics
+
+class FakeResponse:
+    """@brief Response with a fixed status and body"""
+    
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+class FakeSession:
+    """@brief Session serving queued responses"""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+    
+    def get(self, url, params=None, timeout=None):
+        return self.responses.pop(0)
+
+def test_disabled_registry_records_nothing():
+    """@brief Counters and stages are no-ops until the registry is enabled"""
+    registry = Metrics()
+    registry.incr("api_calls", source="Steam")
+    with registry.stage("fetch"):
+        pass
+    assert registry.to_dict()["counters"] == []
+    assert registry.stages == {}
+
+def test_http_client_counts_bytes_of_every_attempt():
+    """@brief Bytes of retried and final responses are counted per source"""
+    client = HttpClient(FakeSession([FakeResponse(503, b"busy"), FakeResponse(200, b"{}" * 10)]), backoff=0.0)
+    metrics.reset()
+    metrics.enable()
+    try:
+        assert client.get("http://steamspy.test/api.php", source="Steam").status_code == 200
+        counters = {(c["name"], c["labels"]["source"]): c["value"] for c in metrics.to_dict()["counters"]}
+    finally:
+        metrics.enable(False)
+        metrics.reset()
+    assert counters == {("bytes", "Steam"): 24, ("retries", "Steam"): 1}
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Tests for the columnar post archive"""
+import threading
+import numpy as np
+from data_sources.post_archive import PostArchive, POST_COLUMNS
+
+def append_posts(archive: PostArchive, game: str, ids, days):
+    """@brief Archive posts created at noon of the given days"""
+    count = len(ids)
+    return archive.append(game, np.asarray(ids, dtype=np.int64), np.asarray(days) * 86400.0 + 43200,
+                          ["gaming"] * count, np.ones(count, dtype=np.int64), np.zeros(count, dtype=np.int64))
+
+def test_counts_posts_per_day_once(tmp_path):
+    """@brief Posts are counted per game and day, duplicates once"""
+    archive = PostArchive(str(tmp_path))
+    append_posts(archive, "CS2", [1, 2, 3], [100, 100, 101])
+    append_posts(archive, "CS2", [3, 4], [101, 103])
+    append_posts(archive, "Dota 2", [5], [100])
+    
+    assert len(archive) == 6
+    assert archive.counts("CS2", 100, 4).values.tolist() == [2, 1, 0, 1]
+    assert archive.counts("Dota 2", 100, 4).values.tolist() == [1, 0, 0, 0]
+    assert archive.counts("Unknown", 100, 4).values.tolist() == [0, 0, 0, 0]
+    assert PostArchive(str(tmp_path)).names("game") == ["CS2", "Dota 2"]
+
+def test_torn_append_is_ignored_and_overwritten(tmp_path):
+    """@brief Rows written to only some columns are invisible and replaced by the next append"""
+    archive = PostArchive(str(tmp_path))
+    append_posts(archive, "CS2", [1, 2], [100, 101])
+    
+    # Simulate a process stopping after the first columns of an append
+    for name in list(POST_COLUMNS)[:2]:
+        with open(tmp_path / f"{name}.bin", "ab") as f:
+            f.write(np.zeros(3, dtype=POST_COLUMNS[name]).tobytes())
+    reopened = PostArchive(str(tmp_path))
+    assert len(reopened) == 2
+    assert reopened.counts("CS2", 100, 2).values.tolist() == [1, 1]
+    
+    append_posts(reopened, "CS2", [7], [101])
+    assert len(reopened) == 3
+    assert reopened.column("id").tolist() == [1, 2, 7]
+    for name, dtype in POST_COLUMNS.items():
+        assert (tmp_path / f"{name}.bin").stat().st_size == 3 * dtype.itemsize
+    assert reopened.counts("CS2", 100, 2).values.tolist() == [1, 2]
+
+def test_archives_opened_by_several_processes_share_names(tmp_path):
+    """@brief A name added through another instance is picked up before new codes are assigned"""
+    first = PostArchive(str(tmp_path))
+    second = PostArchive(str(tmp_path))
+    append_posts(first, "CS2", [1], [100])
+    append_posts(second, "Dota 2", [2], [100])
+    append_posts(first, "Dota 2", [3], [101])
+    
+    assert first.names("game") == second.names("game") == ["CS2", "Dota 2"]
+    assert second.counts("CS2", 100, 2).values.tolist() == [1, 0]
+    assert first.counts("Dota 2", 100, 2).values.tolist() == [1, 1]
+
+def test_concurrent_appends_keep_whole_rows(tmp_path):
+    """@brief Appends through separate instances never interleave inside a row block"""
+    def worker(number: int):
+        archive = PostArchive(str(tmp_path))
+        for block in range(20):
+            ids = [number * 1000 + block * 10 + i for i in range(5)]
+            append_posts(archive, f"Game {number % 2}", ids, [100 + block % 3] * 5)
+    
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    archive = PostArchive(str(tmp_path))
+    assert len(archive) == 400
+    assert len(np.unique(archive.column("id"))) == 400
+    assert sorted(archive.names("game")) == ["Game 0", "Game 1"]
+    assert sum(archive.counts(game, 100, 3).values.sum() for game in ("Game 0", "Game 1")) == 400
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""Tests for the shared Reddit feed"""
+import time
+from conftest import FakePost, FakeListingClient
+from core.anomaly import AnomalyMonitor
+from data_sources.reddit_feed import RedditFeed
+from models.time_series import day_to_date
+
+def make_feed(posts, limit=1000):
+    """@brief Create a feed tracking two games over a fake listing"""
+    client = FakeListingClient(posts)
+    feed = RedditFeed(lambda: client, ["gaming"], days=30, min_interval=0, limit=limit)
+    feed.add_game("Counter-Strike 2", ["CS2"])
+    feed.add_game("Dota 2")
+    return feed, client
+
+def test_counts_hits_per_game():
+    """@brief Hits are bucketed per game and day"""
+    now = time.time()
+    posts = [FakePost(f"a{i}", now - i, "CS2 update" if i % 2 else "Dota 2 patch") for i in range(10)]
+    feed, _ = make_feed(posts)
+    assert feed.poll(now) == 10
+    today = int(now // 86400)
+    assert feed.series("Counter-Strike 2", today, 1).values.tolist() == [5]
+    assert feed.series("Dota 2", today, 1).values.tolist() == [5]
+
+def test_second_poll_stops_at_previous_mark():
+    """@brief A poll reads only posts newer than the previous poll"""
+    now = time.time()
+    posts = [FakePost(f"a{i}", now - 100 - i, "CS2") for i in range(5)]
+    feed, client = make_feed(posts)
+    feed.poll(now)
+    client.posts = [FakePost("b1", now - 10, "CS2")] + posts
+    assert feed.poll(now + 1) == 1
+    assert int(feed.series("Counter-Strike 2", int(now // 86400), 1).values.sum()) == 6
+
+def test_listing_cut_at_limit_warns(capsys):
+    """@brief A listing cut off at the limit before the mark prints a warning"""
+    now = time.time()
+    feed, client = make_feed([FakePost("old", now - 5000, "CS2")])
+    feed.poll(now)
+    capsys.readouterr()
+    client.posts = [FakePost(f"n{i}", now - i, "CS2") for i in range(1500)]
+    assert feed.poll(now + 1) == 1000
+    assert "posts may be missing" in capsys.readouterr().out
+
+def test_listing_ending_before_limit_does_not_warn(capsys):
+    """@brief A listing that ends by itself is complete"""
+    now = time.time()
+    feed, client = make_feed([FakePost("old", now - 5000, "CS2")])
+    feed.poll(now)
+    client.posts = [FakePost(f"n{i}", now - i, "CS2") for i in range(999)]
+    feed.poll(now + 1)
+    assert "posts may be missing" not in capsys.readouterr().out
+
+def test_hits_are_scored_by_the_monitor_once_the_day_is_over():
+    """@brief Feed hits reach the anomaly monitor in creation order and closed days are scored"""
+    now = time.time()
+    today = int(now // 86400)
+    counts = [10, 12] * 10 + [200]
+    posts = []
+    for back, count in enumerate(reversed(counts), start=1):
+        day_start = (today - back) * 86400
+        posts += [FakePost(f"d{back}p{i}", day_start + 3600 + i, "CS2") for i in range(count)]
+    posts.sort(key=lambda post: post.created_utc, reverse=True)
+    feed, _ = make_feed(posts)
+    feed.monitor = AnomalyMonitor()
+    feed.poll(now)
+    
+    events = feed.monitor.events(["Counter-Strike 2|Reddit Mentions"])
+    assert events and {event.date for event in events} == {str(day_to_date(today - 1))}
+    assert all(event.kind == "spike" and event.value == 200 for event in events)
\ No newline at end of file
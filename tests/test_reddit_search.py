@@ -0,0 +1,88 @@
+"""Tests for the sharded Reddit search"""
+import numpy as np
+from conftest import FakePost, FakeListingClient
+from data_sources.reddit_search import ShardedSearch, SearchShard, TIME_FILTERS, WIDEN_SORTS
+
+class SubredditClient:
+    """@brief PRAW stand-in serving different listings per subreddit"""
+    
+    def __init__(self, clients):
+        self.clients = clients
+    
+    def subreddit(self, name: str):
+        return self.clients.get(name, FakeListingClient([]))
+
+def posts_since(newest_utc: float, count: int, prefix: str = "") -> list:
+    """@brief Build posts one second apart, newest first"""
+    return [FakePost(prefix + np.base_repr(1000 + i, 36).lower(), newest_utc - i) for i in range(count)]
+
+def read(posts, stop_utc: float = 0.0, skip_ids: frozenset = frozenset()) -> SearchShard:
+    """@brief Read one listing of the given posts"""
+    search = ShardedSearch(lambda: FakeListingClient(posts), workers=1)
+    shard = SearchShard("all")
+    search._read(shard, "title:Game", stop_utc, skip_ids)
+    return shard
+
+def test_full_listing_is_capped_without_an_extra_page():
+    """@brief Reading up to the limit counts only the pages Reddit serves"""
+    shard = read(posts_since(10000.0, 1500))
+    assert len(shard.ids) == 1000
+    assert shard.pages == 10
+    assert shard.capped
+
+def test_short_or_stopped_listings_are_complete():
+    """@brief Exhausted listings and listings reaching the stop time are not capped"""
+    shard = read(posts_since(10000.0, 1000), stop_utc=9500.0)
+    assert len(shard.ids) == 501
+    assert shard.pages == 6
+    assert not shard.capped
+    
+    shard = read(posts_since(10000.0, 250))
+    assert shard.pages == 3
+    assert not shard.capped
+
+def test_merge_counts_each_post_once_and_moves_the_mark():
+    """@brief Posts found by several listings are merged and the newest ones become the mark"""
+    first = read(posts_since(10000.0, 5))
+    second = read(posts_since(10000.0, 3) + [FakePost("zz", 10000.0)])
+    result = ShardedSearch._merge([first, second], 9000.0, ["old"])
+    
+    assert len(result.ids) == 6
+    assert len(np.unique(result.ids)) == 6
+    assert sorted(result.timestamps.tolist(), reverse=True)[:2] == [10000.0, 10000.0]
+    assert result.newest_utc == 10000.0
+    assert sorted(result.newest_ids) == sorted([np.base_repr(1000, 36).lower(), "zz"])
+    assert result.complete
+
+def test_merge_without_new_posts_keeps_the_mark():
+    """@brief An empty search keeps the previous high-water mark"""
+    result = ShardedSearch._merge([read([])], 9000.0, ["old"])
+    assert len(result.ids) == 0
+    assert result.newest_utc == 9000.0
+    assert result.newest_ids == ["old"]
+
+def test_merge_of_no_listings_is_empty():
+    """@brief Merging nothing keeps the mark instead of failing on an empty concatenation"""
+    result = ShardedSearch._merge([], 9000.0, ["old"])
+    assert len(result.ids) == 0
+    assert result.newest_utc == 9000.0
+    assert result.complete
+
+def test_capped_all_is_split_by_subreddit():
+    """@brief A capped r/all search reads the subreddits of its results on their own"""
+    posts = [FakePost("f", 100.0, subreddit="b"), FakePost("e", 99.0, subreddit="a"),
+             FakePost("d", 98.0, subreddit="a"), FakePost("c", 97.0, subreddit="b"),
+             FakePost("b", 96.0, subreddit="a")]
+    capped = {(sort, name): posts for name, _ in TIME_FILTERS for sort in WIDEN_SORTS}
+    client = SubredditClient({
+        "all": FakeListingClient(posts, capped),
+        "a": FakeListingClient([post for post in posts if post.subreddit == "a"]),
+        "b": FakeListingClient([post for post in posts if post.subreddit == "b"])
+    })
+    search = ShardedSearch(lambda: client, workers=1, limit=3)
+    
+    result = search.search("title:Game", 0.0)
+    assert len(result.ids) == 5
+    assert sorted(shard.subreddit for shard in result.shards if shard.sort == "new") == ["a", "all", "b"]
+    assert not result.complete
+    assert result.complete_since == 98.0
\ No newline at end of file
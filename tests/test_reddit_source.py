@@ -0,0 +1,119 @@
+"""Tests for the Reddit data source"""
+import time
+from conftest import FakePost, FakeListingClient
+from data_sources.reddit_search import ShardedSearch, TIME_FILTERS, WIDEN_SORTS
+from data_sources.reddit_source import RedditDataSource, ArchivedRedditSource
+from data_sources.reddit_state import RedditStateStore
+from data_sources.response_cache import ResponseCache
+from models.metrics import metrics
+from models.time_series import SECONDS_PER_DAY
+
+def make_source(posts, cache, state_store) -> RedditDataSource:
+    """@brief Create a source searching fixed posts"""
+    source = RedditDataSource(days=3, game_name="Game")
+    source.set_credentials("id", "secret", "agent")
+    source.set_search(ShardedSearch(lambda: FakeListingClient(posts), workers=1))
+    source.set_cache(cache)
+    source.set_state_store(state_store)
+    return source
+
+def test_cache_hit_still_searches_today_past_the_mark(tmp_path):
+    """@brief Cached closed days are combined with today's new posts and the state advances"""
+    today_start = time.time() // SECONDS_PER_DAY * SECONDS_PER_DAY
+    old_posts = [FakePost("b", today_start + 1), FakePost("a", today_start - 100)]
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    state_store = RedditStateStore(str(tmp_path / "state"))
+    
+    first = make_source(old_posts, cache, state_store).fetch_data()
+    assert first["total"] == 2
+    assert cache.hits.get("Reddit", 0) == 0
+    
+    # The state is gone but the cache still holds the closed days
+    state_store = RedditStateStore(str(tmp_path / "other_state"))
+    second = make_source([FakePost("c", today_start + 2)] + old_posts, cache, state_store).fetch_data()
+    assert cache.hits["Reddit"] == 1
+    assert second["total"] == 3
+    assert state_store.load("title:Game")["newest_ids"] == ["c"]
+    
+    third = make_source([FakePost("c", today_start + 2)] + old_posts, cache, state_store).fetch_data()
+    assert third["total"] == 3
+    cache.close()
+
+def test_raised_days_search_back_past_the_stored_state(tmp_path):
+    """@brief A state covering fewer days than the window does not stop the search at its mark"""
+    today_start = time.time() // SECONDS_PER_DAY * SECONDS_PER_DAY
+    posts = [FakePost("b", today_start + 1), FakePost("a", today_start - 5 * SECONDS_PER_DAY)]
+    state_store = RedditStateStore(str(tmp_path / "state"))
+    
+    assert make_source(posts, None, state_store).fetch_data()["total"] == 1
+    source = make_source(posts, None, state_store)
+    source.days = 6
+    assert source.fetch_data()["total"] == 2
+    assert make_source(posts, None, state_store).fetch_data()["total"] == 1
+
+def test_capped_search_keeps_the_previous_mark(tmp_path):
+    """@brief The mark only advances once a search reached every post of the window"""
+    today_start = time.time() // SECONDS_PER_DAY * SECONDS_PER_DAY
+    posts = [FakePost("c", today_start + 3), FakePost("b", today_start + 2), FakePost("a", today_start + 1)]
+    state_store = RedditStateStore(str(tmp_path / "state"))
+    
+    assert make_source(posts[2:], None, state_store).fetch_data()["total"] == 1
+    capped = make_source(posts, None, state_store)
+    listings = {(sort, name): posts for name, _ in TIME_FILTERS for sort in WIDEN_SORTS}
+    capped.set_search(ShardedSearch(lambda: FakeListingClient(posts, listings), workers=1, limit=1))
+    incomplete = capped.fetch_data()["incomplete_days"]
+    assert len(incomplete) == 4
+    assert incomplete[-1] == time.strftime("%Y-%m-%d", time.gmtime(today_start))
+    assert state_store.load("title:Game")["newest_ids"] == ["a"]
+    
+    complete = make_source(posts, None, state_store).fetch_data()
+    assert complete["total"] == 3
+    assert complete["incomplete_days"] == []
+    assert state_store.load("title:Game")["newest_ids"] == ["c"]
+
+class BrokenArchive:
+    """@brief Archive whose reads fail"""
+    
+    def counts(self, *args, **kwargs):
+        raise OSError("truncated column file")
+
+def test_archived_source_without_readable_archive_returns_no_data():
+    """@brief A missing or unreadable archive yields an empty result instead of an exception"""
+    assert ArchivedRedditSource(game_name="Game").fetch_data()["total"] == 0
+    source = ArchivedRedditSource(game_name="Game", archive=BrokenArchive())
+    assert source.fetch_data() == {"mentions": {}, "daily_data": {}, "total": 0}
+    assert not source.has_data()
+
+class CountingListingClient(FakeListingClient):
+    """@brief Listing client recording how many posts were read"""
+    
+    def search(self, query: str, sort: str = "new", time_filter: str = "all", limit: int = 1000):
+        self.read = 0
+        for post in super().search(query, sort, time_filter, limit):
+            self.read += 1
+            yield post
+
+def test_search_stops_paging_at_the_window_start():
+    """@brief Posts older than the window end the search and are not counted per day"""
+    now = time.time()
+    window_start = (now // SECONDS_PER_DAY - 3) * SECONDS_PER_DAY
+    posts = [FakePost(f"p{i}", now - i * 600) for i in range(1000)]
+    in_window = sum(post.created_utc >= window_start for post in posts)
+    client = CountingListingClient(posts)
+    source = RedditDataSource(days=3, game_name="Game")
+    source.set_credentials("id", "secret", "agent")
+    source.set_search(ShardedSearch(lambda: client, workers=1))
+    metrics.reset()
+    metrics.enable(True)
+    try:
+        result = source.fetch_data()
+        api_calls = sum(counter["value"] for counter in metrics.to_dict()["counters"]
+                        if counter["name"] == "api_calls")
+    finally:
+        metrics.enable(False)
+        metrics.reset()
+    assert result["total"] == in_window
+    assert sum(result["daily_data"].values()) == in_window
+    assert client.read == in_window + 1
+    assert api_calls == in_window // 100 + 1
+    assert result["incomplete_days"] == []
\ No newline at end of file
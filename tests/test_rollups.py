@@ -0,0 +1,101 @@
+"""Tests for the rollups and the sliding window"""
+import numpy as np
+import pytest
+from data_sources.base_data_source import BaseDataSource
+from models.rollups import SeriesRollup, SlidingWindow
+from models.time_series import DailySeries, epoch_day
+from datetime import date
+
+class ClockSource(BaseDataSource):
+    """@brief Source whose current day is set by the test"""
+    
+    def __init__(self, days: int, today: int):
+        super().__init__("clock", days)
+        self.today = today
+    
+    def window_start_day(self):
+        return self.today - self.days + 1
+    
+    def fetch_data(self, **kwargs):
+        return {}
+    
+    def get_statistics(self):
+        return {}
+    
+    def format_data(self):
+        return None
+
+def test_weekly_buckets_start_on_monday():
+    """@brief Weekly buckets split between Sunday and Monday, partial edges are counted"""
+    start = epoch_day(date(2024, 1, 5))  # Friday
+    rollup = SeriesRollup(start, np.arange(1, 11, dtype=np.int64))
+    weekly = rollup.level("weekly")
+    
+    assert weekly.starts.tolist() == [start, epoch_day(date(2024, 1, 8))]
+    assert weekly.counts.tolist() == [3, 7]
+    assert weekly.totals.tolist() == [6, 49]
+    assert weekly.minima.tolist() == [1, 4]
+    assert weekly.maxima.tolist() == [3, 10]
+
+def test_monthly_buckets_follow_calendar_months():
+    """@brief Monthly buckets split at month ends, including a leap February"""
+    start = epoch_day(date(2024, 1, 30))
+    rollup = SeriesRollup(start, np.ones(33, dtype=np.int64))
+    monthly = rollup.level("monthly")
+    
+    assert monthly.starts.tolist() == [start, epoch_day(date(2024, 2, 1)), epoch_day(date(2024, 3, 1))]
+    assert monthly.counts.tolist() == [2, 29, 2]
+    assert monthly.averages.tolist() == [1.0, 1.0, 1.0]
+    with pytest.raises(ValueError):
+        rollup.level("yearly")
+
+def test_update_matches_a_rebuilt_rollup():
+    """@brief Changing and appending days keeps every aggregate equal to a fresh build"""
+    rng = np.random.default_rng(7)
+    values = rng.integers(0, 50, 100)
+    rollup = SeriesRollup(20000, values[:60])
+    rollup.level("weekly")
+    rollup.level("monthly")
+    
+    changed = values[50:100].copy()
+    changed[5] = 99
+    assert rollup.update(20050, changed) == 20055
+    assert rollup.update(20050, changed) == rollup.end_day
+    
+    expected = np.concatenate((values[:50], changed))
+    fresh = SeriesRollup(20000, expected)
+    for start, length in [(20000, 100), (20040, 17), (20054, 1), (20090, 30), (19990, 20)]:
+        assert rollup.statistics(start, length) == fresh.statistics(start, length)
+        assert rollup.statistics(start, length) == DailySeries(20000, expected).window_statistics(start, length)
+    for resolution in ("weekly", "monthly"):
+        for field in ("starts", "counts", "totals", "minima", "maxima"):
+            assert getattr(rollup.level(resolution), field).tolist() == \
+                getattr(fresh.level(resolution), field).tolist()
+
+def test_sliding_window_drops_values_as_it_slides():
+    """@brief Total, minimum and maximum follow the last length values"""
+    window = SlidingWindow(3)
+    window.extend([5, 1, 4])
+    assert window.statistics() == {"total": 10, "average_daily": 10 / 3, "max_daily": 5, "min_daily": 1}
+    window.extend([2, 3])
+    assert len(window) == 3
+    assert window.statistics() == {"total": 9, "average_daily": 3.0, "max_daily": 4, "min_daily": 2}
+
+def test_source_window_slides_past_several_days():
+    """@brief Statistics stay exact while days close between fetches"""
+    rng = np.random.default_rng(3)
+    history = rng.integers(0, 100, 80)
+    source = ClockSource(days=7, today=20030)
+    for today in [20030, 20031, 20032, 20036, 20037, 20050, 20051]:
+        source.today = today
+        start = today - source.days + 1
+        source.series = DailySeries(start, history[start - 20000:today + 1 - 20000].copy())
+        expected = DailySeries(20000, history).window_statistics(start, source.days)
+        assert source.window_statistics() == expected
+        assert source.window_statistics(3) == DailySeries(20000, history).window_statistics(today - 2, 3)
+    
+    source.series = DailySeries(20045, history[45:52] + 1)
+    assert source.window_statistics() == DailySeries(20045, history[45:52] + 1).window_statistics(20045, 7)
+    # The rollup restarted at the gap between day 20037 and day 20044
+    assert source.rollup("daily").starts[0] == 20044
+    assert source.rollup("daily").totals.tolist() == (history[44:52] + np.array([0] + [1] * 7)).tolist()
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Tests for the local Steam application catalog"""
+import pytest
+from data_sources.steam_catalog import SteamCatalog, normalize_name
+from data_sources.steam_snapshots import SteamSnapshotStore
+from models.data_models import CatalogEntry
+
+## @brief SteamSpy "all" listing split into pages
+PAGES = [
+    {
+        "730": {"appid": 730, "name": "Counter-Strike 2", "owners": "50,000,000 .. 100,000,000", "ccu": 900000},
+        "570": {"appid": 570, "name": "Dota 2", "owners": "100,000,000 .. 200,000,000", "ccu": 600000},
+        "10": {"appid": 10, "name": "Counter-Strike", "owners": "10,000,000 .. 20,000,000", "ccu": 10000}
+    },
+    {
+        "240": {"appid": 240, "name": "Counter-Strike: Source", "owners": "5,000,000 .. 10,000,000", "ccu": 9000},
+        "999": {"appid": 999, "name": "Dota 2", "owners": "0 .. 20,000", "ccu": 0},
+        "998": {"appid": 998, "name": "", "owners": "0 .. 20,000"},
+        "1172470": {"appid": 1172470, "name": "Apex Legends™", "owners": "", "ccu": 100}
+    },
+    {}
+]
+
+class FakeResponse:
+    """@brief Response holding a decoded JSON page"""
+    
+    def __init__(self, page):
+        self.page = page
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return self.page
+
+class PagedClient:
+    """@brief HTTP client serving listing pages by number"""
+    
+    def __init__(self, pages):
+        self.pages = pages
+        self.requested = []
+    
+    def get(self, url, params=None, limit=None, timeout=None, source="http"):
+        self.requested.append(params["page"])
+        return FakeResponse(self.pages[params["page"]] if params["page"] < len(self.pages) else {})
+
+@pytest.fixture
+def catalog(tmp_path):
+    """@brief Catalog holding the whole listing"""
+    catalog = SteamCatalog(str(tmp_path / "catalog.sqlite"), client=PagedClient(PAGES))
+    catalog.refresh()
+    yield catalog
+    catalog.close()
+
+def test_names_are_normalized():
+    """@brief Case, accents, trademark signs and punctuation do not change the key"""
+    assert normalize_name("Counter-Strike™ 2") == normalize_name("counter  strike 2") == "counter strike 2"
+    assert normalize_name("Pokémon: Legends") == "pokemon legends"
+
+def test_exact_lookup_prefers_the_most_owned_app(catalog):
+    """@brief Exact lookups ignore formatting and pick the most owned duplicate"""
+    assert len(catalog) == 6
+    assert catalog.lookup("counter strike 2") == CatalogEntry(730, "Counter-Strike 2", 50000000)
+    assert catalog.lookup("DOTA 2").app_id == 570
+    assert catalog.lookup("apex legends").owners == 0
+    assert catalog.lookup("Half-Life") is None
+
+def test_prefix_lookup_is_ordered_by_owners(catalog):
+    """@brief Prefix matches are most owned first and cut at the limit"""
+    assert [entry.app_id for entry in catalog.prefix("counter")] == [730, 10, 240]
+    assert [entry.app_id for entry in catalog.prefix("Counter-Strike", limit=2)] == [730, 10]
+    assert catalog.prefix("zelda") == []
+
+def test_fuzzy_lookup_ranks_similar_names(catalog):
+    """@brief Misspelled names find the closest applications, unrelated names find nothing"""
+    matches = catalog.fuzzy("Conter Strike 2", limit=2)
+    assert [entry.app_id for entry, _ in matches] == [730, 10]
+    assert matches[0][1] > matches[1][1] >= 0.6
+    assert catalog.fuzzy("qqqq") == []
+    assert catalog.resolve("Counter Strik 2") == "730"
+    assert catalog.resolve("Apex Legends") == "1172470"
+    assert catalog.resolve("Portal") is None
+
+def test_refresh_continues_where_it_stopped(tmp_path):
+    """@brief Limited refreshes resume at the next page and a complete pass is not repeated"""
+    client = PagedClient(PAGES)
+    catalog = SteamCatalog(str(tmp_path / "catalog.sqlite"), client=client)
+    assert catalog.refresh(max_pages=1) == 3
+    assert catalog.lookup("Counter-Strike: Source") is None
+    
+    assert catalog.refresh(max_pages=5) == 3
+    assert client.requested == [0, 1, 2]
+    assert catalog.lookup("Counter-Strike: Source").app_id == 240
+    assert catalog.refresh(max_age=3600) == 0
+    assert client.requested == [0, 1, 2]
+    catalog.close()
+    
+    reopened = SteamCatalog(str(tmp_path / "catalog.sqlite"), client=client)
+    assert len(reopened) == 6
+    reopened.close()
+
+def test_refresh_records_owner_snapshots(tmp_path):
+    """@brief Every listed app with owner data gets a snapshot of the day"""
+    store = SteamSnapshotStore(str(tmp_path / "snapshots"))
+    catalog = SteamCatalog(str(tmp_path / "catalog.sqlite"), client=PagedClient(PAGES), snapshot_store=store)
+    catalog.refresh()
+    catalog.close()
+    assert len(store) == 5
+    assert store.history(730, 0, 10 ** 6)["ccu"].tolist() == [900000]
\ No newline at end of file
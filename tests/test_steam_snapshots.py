@@ -0,0 +1,78 @@
+"""Tests for the Steam snapshot store"""
+import time
+import numpy as np
+from data_sources.response_cache import ResponseCache
+from data_sources.steam_snapshots import SteamSnapshotStore, SNAPSHOT_DTYPE
+from data_sources.steam_source import SteamDataSource
+
+def owners(records: np.ndarray) -> list:
+    """@brief Get (day, owners_lo) pairs of snapshot records"""
+    return list(zip(records["day"].tolist(), records["owners_lo"].tolist()))
+
+def test_log_records_replace_compacted_ones(tmp_path):
+    """@brief A later snapshot of the same app and day wins before and after compaction"""
+    store = SteamSnapshotStore(str(tmp_path))
+    for day in range(100, 105):
+        store.append(730, day, day * 10, day * 20)
+    store.append(570, 101, 1, 2)
+    store.compact()
+    store.append(730, 102, 7, 8)
+    
+    assert owners(store.history(730, 101, 104)) == [(101, 1010), (102, 7), (103, 1030)]
+    assert owners(store.history(570, 0, 1000)) == [(101, 1)]
+    store.compact()
+    assert owners(store.history(730, 101, 104)) == [(101, 1010), (102, 7), (103, 1030)]
+    assert len(store) == 6
+    assert len(SteamSnapshotStore(str(tmp_path))) == 6
+
+def test_append_compacts_at_the_threshold(tmp_path):
+    """@brief A large enough log is merged into the main file"""
+    store = SteamSnapshotStore(str(tmp_path))
+    store.COMPACT_THRESHOLD = 4
+    records = np.array([(730, day, day, day, 0) for day in range(4)], dtype=SNAPSHOT_DTYPE)
+    store.append_many(records)
+    assert (tmp_path / "snapshots.log").stat().st_size == 0
+    assert (tmp_path / "snapshots.bin").stat().st_size == 4 * SNAPSHOT_DTYPE.itemsize
+
+def test_last_before_looks_in_main_file_and_log(tmp_path):
+    """@brief The latest earlier snapshot is found wherever it is stored, never one of another app"""
+    store = SteamSnapshotStore(str(tmp_path))
+    store.append(570, 50, 5, 6)
+    store.append(730, 100, 1, 2)
+    store.compact()
+    assert owners(store.last_before(730, 120)) == [(100, 1)]
+    store.append(730, 110, 3, 4)
+    assert owners(store.last_before(730, 120)) == [(110, 3)]
+    assert owners(store.last_before(730, 110)) == [(100, 1)]
+    assert len(store.last_before(730, 100)) == 0
+    assert len(store.last_before(440, 1000)) == 0
+
+def test_partial_log_record_is_ignored_and_overwritten(tmp_path):
+    """@brief A record torn by an interrupted write is not read and does not shift later records"""
+    store = SteamSnapshotStore(str(tmp_path))
+    store.append(730, 100, 1, 2)
+    with open(tmp_path / "snapshots.log", "ab") as f:
+        f.write(b"\x01" * (SNAPSHOT_DTYPE.itemsize // 2))
+    reopened = SteamSnapshotStore(str(tmp_path))
+    assert owners(reopened.history(730, 0, 1000)) == [(100, 1)]
+    reopened.append(730, 101, 3, 4)
+    assert owners(reopened.history(730, 0, 1000)) == [(100, 1), (101, 3)]
+
+def test_cache_hits_do_not_repeat_todays_snapshot(tmp_path):
+    """@brief A cached response is recorded once per day, a changed one again"""
+    today = time.strftime("%Y-%m-%d", time.gmtime())
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    store = SteamSnapshotStore(str(tmp_path / "snapshots"))
+    source = SteamDataSource(days=3)
+    source.set_cache(cache)
+    source.set_snapshot_store(store)
+    
+    cache.put("Steam", "730", today, {"owners": "1,000 .. 2,000", "ccu": 5})
+    assert source.fetch_data()["subscribers"] == 1000
+    assert source.fetch_data()["subscribers"] == 1000
+    assert (tmp_path / "snapshots" / "snapshots.log").stat().st_size == SNAPSHOT_DTYPE.itemsize
+    
+    cache.put("Steam", "730", today, {"owners": "3,000 .. 4,000", "ccu": 5})
+    assert source.fetch_data()["subscribers"] == 3000
+    assert owners(store.history(730, 0, 100000)) == [(int(time.time() // 86400), 3000)]
+    cache.close()
\ No newline at end of file
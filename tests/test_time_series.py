@@ -0,0 +1,116 @@
+"""Tests for the columnar daily series"""
+import numpy as np
+from array import array
+from data_sources.base_data_source import BaseDataSource
+from models.time_series import DailySeries, SECONDS_PER_DAY, bucket_by_day, date_strings
+
+class FixedSource(BaseDataSource):
+    """@brief Source whose analysis period starts on a fixed day"""
+    
+    def __init__(self, days: int, start_day: int):
+        super().__init__("fixed", days)
+        self.start_day = start_day
+    
+    def window_start_day(self):
+        return self.start_day
+    
+    def fetch_data(self, **kwargs):
+        return {}
+    
+    def get_statistics(self):
+        return self.series.statistics()
+    
+    def format_data(self):
+        return self.format_series("Value")
+
+def test_window_statistics_pads_missing_days_with_zeros():
+    """@brief Days outside the series count as zero"""
+    series = DailySeries(20000, np.array([4, 2, 6], dtype=np.int64))
+    assert series.window_statistics(20000, 3) == {"total": 12, "average_daily": 4.0, "max_daily": 6, "min_daily": 2}
+    assert series.window_statistics(20001, 4) == {"total": 8, "average_daily": 2.0, "max_daily": 6, "min_daily": 0}
+    assert series.window_statistics(19990, 5)["total"] == 0
+
+def test_bucket_by_day_counts_per_utc_day():
+    """@brief Timestamps are counted on their UTC day, the last second of a day stays on it"""
+    first = 20000 * SECONDS_PER_DAY
+    timestamps = [first, first + SECONDS_PER_DAY - 0.5, first + SECONDS_PER_DAY, first + 2 * SECONDS_PER_DAY + 7]
+    counts = bucket_by_day(timestamps, 20000, 3)
+    assert counts.dtype == np.int64
+    assert counts.tolist() == [2, 1, 1]
+
+def test_bucket_by_day_drops_timestamps_outside_the_range():
+    """@brief Timestamps before the first day or after the last day are not counted"""
+    first = 20000 * SECONDS_PER_DAY
+    timestamps = array('d', [first - 1, first + 10, first + 3 * SECONDS_PER_DAY, first + 5 * SECONDS_PER_DAY])
+    assert bucket_by_day(timestamps, 20000, 3).tolist() == [1, 0, 0]
+
+def test_bucket_by_day_accepts_compact_buffers_and_empty_input():
+    """@brief array('d'), ndarray and lists give the same counts, no timestamps give zeros"""
+    timestamps = [20001 * SECONDS_PER_DAY + i * 3600.0 for i in range(30)]
+    expected = [0, 24, 6]
+    assert bucket_by_day(array('d', timestamps), 20000, 3).tolist() == expected
+    assert bucket_by_day(np.array(timestamps), 20000, 3).tolist() == expected
+    assert bucket_by_day(timestamps, 20000, 3).tolist() == expected
+    assert bucket_by_day(array('d'), 20000, 4).tolist() == [0, 0, 0, 0]
+
+def test_window_inside_the_series_is_a_view():
+    """@brief Windows inside the series share memory, windows crossing its edges are zero-padded copies"""
+    series = DailySeries(20000, np.arange(1, 6))
+    inside = series.window(20001, 3)
+    assert inside.start_day == 20001
+    assert inside.values.tolist() == [2, 3, 4]
+    assert np.shares_memory(inside.values, series.values)
+    
+    outside = series.window(19998, 4)
+    assert outside.values.tolist() == [0, 0, 1, 2]
+    assert not np.shares_memory(outside.values, series.values)
+    assert series.window(20010, 2).values.tolist() == [0, 0]
+
+def test_dict_round_trip_fills_gaps_with_zeros():
+    """@brief Missing days inside the mapping become zero, the range follows the mapping"""
+    series = DailySeries.from_dict({"2024-10-07": 3, "2024-10-05": 1})
+    assert series.start_date.isoformat() == "2024-10-05"
+    assert series.values.tolist() == [1, 0, 3]
+    assert series.end_day == series.start_day + 3
+    assert series.to_dict() == {"2024-10-05": 1, "2024-10-06": 0, "2024-10-07": 3}
+    assert len(DailySeries.from_dict({})) == 0
+
+def test_constructors_and_statistics():
+    """@brief Zero and constant series hold int64 values, statistics of an empty series are zero"""
+    assert DailySeries.zeros(20000, 3).values.tolist() == [0, 0, 0]
+    constant = DailySeries.constant(20000, 4, 7)
+    assert constant.values.dtype == np.int64
+    assert constant.statistics() == {"total": 28, "average_daily": 7.0, "max_daily": 7, "min_daily": 7}
+    assert DailySeries.zeros(20000, 0).statistics()["total"] == 0
+
+def test_date_labels_are_cached_and_read_only():
+    """@brief Labels of the same range are built once and cannot be changed"""
+    labels = DailySeries(20000, np.zeros(2)).dates()
+    assert labels.tolist() == ["2024-10-04", "2024-10-05"]
+    assert labels is date_strings(20000, 2)
+    assert not labels.flags.writeable
+
+def test_frame_wraps_the_values():
+    """@brief The DataFrame holds the series values under the given column"""
+    frame = DailySeries(20000, np.array([4, 5])).to_frame("Value")
+    assert frame.columns.tolist() == ["Date", "Value"]
+    assert frame["Date"].tolist() == ["2024-10-04", "2024-10-05"]
+    assert frame["Value"].tolist() == [4, 5]
+
+def test_source_stores_dictionaries_as_series():
+    """@brief The data dictionary is a view of the series and the formatted period is padded"""
+    source = FixedSource(days=3, start_day=20000)
+    assert not source.has_data()
+    assert source.data == {}
+    assert source.format_data().empty
+    
+    source.data = {"2024-10-05": 2, "2024-10-06": 5}
+    assert isinstance(source.series, DailySeries)
+    assert source.series.start_day == 20001
+    assert source.data == {"2024-10-05": 2, "2024-10-06": 5}
+    assert source.get_common_dates() == ["2024-10-04", "2024-10-05", "2024-10-06"]
+    assert source.format_data()["Value"].tolist() == [0, 2, 5]
+    assert source.get_statistics()["total"] == 7
+    
+    source.data = {}
+    assert source.series is None
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""Tests for the plot renderer"""
+import numpy as np
+import pandas as pd
+import pytest
+from core.visualizer import Visualizer
+
+def history(days: int) -> pd.DataFrame:
+    """@brief Build combined data with one mention spike per 10 days"""
+    mentions = np.zeros(days, dtype=np.int64)
+    mentions[5::10] = np.arange(1, len(mentions[5::10]) + 1)
+    return pd.DataFrame({"Date": pd.date_range("2020-01-01", periods=days).strftime("%Y-%m-%d"),
+                         "Steam Subscribers": np.arange(days, dtype=np.int64) + 1000,
+                         "Reddit Mentions": mentions, "Comment": [""] * days})
+
+@pytest.fixture(autouse=True)
+def release_figure():
+    """@brief Drop the shared figure after every test"""
+    yield
+    Visualizer.close()
+
+def test_decimation_keeps_spikes_and_latest_values():
+    """@brief Buckets hold their first date, the last Steam value and the largest mention count"""
+    df = history(100)
+    dates = pd.to_datetime(df["Date"]).to_numpy()
+    columns = {"Steam Subscribers": df["Steam Subscribers"].to_numpy(),
+               "Reddit Mentions": df["Reddit Mentions"].to_numpy()}
+    decimated_dates, decimated = Visualizer._decimate(dates, columns, 10)
+    assert len(decimated_dates) == 10
+    assert decimated_dates[1] == dates[10]
+    assert decimated["Steam Subscribers"].tolist() == [1009 + 10 * bucket for bucket in range(10)]
+    assert decimated["Reddit Mentions"].tolist() == list(range(1, 11))
+
+def test_decimation_never_exceeds_max_points():
+    """@brief Histories that do not divide evenly still give at most max_points buckets"""
+    dates = np.arange(1001)
+    decimated_dates, decimated = Visualizer._decimate(dates, {"Reddit Mentions": dates}, 7)
+    assert len(decimated_dates) == len(decimated["Reddit Mentions"]) == 7
+    assert decimated["Reddit Mentions"][-1] == 1000
+
+def test_fast_plot_reuses_one_cleared_figure(tmp_path):
+    """@brief Fast renders write the file, share one figure and leave no artists behind"""
+    df = history(3000)
+    original = df.copy()
+    Visualizer.create_plot(df, "Game", str(tmp_path / "first.png"), fast=True, max_points=200)
+    figure = Visualizer._figure
+    Visualizer.create_plot(df, "Game", str(tmp_path / "second.png"), fast=True, max_points=200)
+    assert Visualizer._figure is figure
+    assert figure.axes == []
+    assert (tmp_path / "first.png").stat().st_size > 0
+    assert (tmp_path / "second.png").stat().st_size > 0
+    pd.testing.assert_frame_equal(df, original)
+
+def test_full_plot_does_not_touch_the_shared_figure(tmp_path):
+    """@brief Full-quality renders use their own figure"""
+    Visualizer.create_plot(history(20), "Game", str(tmp_path / "plot.png"), dpi=50)
+    assert Visualizer._figure is None
+    assert (tmp_path / "plot.png").stat().st_size > 0
+
+def test_plot_without_dates_writes_nothing(tmp_path):
+    """@brief Data without a Date column is not plotted"""
+    Visualizer.create_plot(pd.DataFrame(), "Game", str(tmp_path / "plot.png"), fast=True)
+    assert not (tmp_path / "plot.png").exists()
\ No newline at end of file